@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+
+import konfigurasi
+from demografi import KOLOM_GRAFIK_DEMOGRAFI, LABEL_KOSONG, normalisasi_demografi, urutkan_distribusi
+from instrumentasi import diukur
+from kubus import DIMENSI_KUBUS, KubusDemografi, kode_dimensi
+from penilaian import BATAS_KATEGORI, KOLOM_NILAI, LABEL_KATEGORI, AgregatPenilaian, ringkasan_dari_agregat
+
+
+# Mesin agregasi DuckDB (DASHBOARD_MESIN_AGREGASI=duckdb): kode kategori demografi dan
+# nilai per responden didaftarkan ke DuckDB tanpa membuat DataFrame antara, lalu semua
+# agregasi (rata-rata, distribusi kategori, distribusi demografi, sel kubus) dijalankan
+# sebagai query SQL multi-thread dengan filter di klausa WHERE. Hasilnya identik dengan
+# jalur pandas karena nilai tetap dijumlahkan sebagai bilangan bulat per seratus
+
+# Kode kategori untuk nilai demografi kosong
+KODE_KOSONG = -1
+
+# Fungsi untuk mengubah satu kolom nilai df_hasil menjadi nilai per seratus int16 (nilai
+# paling besar 100,00 = 10000). Nilai float32 sudah dibulatkan 2 desimal, jadi pembulatan
+# ke bilangan bulat terdekat memberi nilai persisnya; nilai kosong menjadi NULL
+def nilai_sen(nilai):
+    nilai = np.asarray(nilai, dtype=np.float32)
+    kosong = np.isnan(nilai)
+    with np.errstate(invalid='ignore'):
+        sen = np.rint(nilai * np.float32(100)).astype(np.int16)
+    if kosong.any():
+        sen[kosong] = 0
+        return pd.arrays.IntegerArray(sen, kosong)
+    return sen
+
+# Syarat kategori NKI (kategori naik jika nilai > batas, seperti kategorikan); NKI kosong
+# tidak masuk kategori mana pun
+def _syarat_kategori():
+    batas = [None] + [round(b * 100) for b in BATAS_KATEGORI] + [None]
+    syarat = []
+    for bawah, atas in zip(batas[:-1], batas[1:]):
+        bagian = ['"NKI" IS NOT NULL']
+        if bawah is not None:
+            bagian.append(f'"NKI" > {bawah}')
+        if atas is not None:
+            bagian.append(f'"NKI" <= {atas}')
+        syarat.append(" AND ".join(bagian))
+    return syarat
+
+# Kolom agregat yang sama untuk ringkasan dan sel kubus: jumlah responden, jumlah nilai
+# per seratus setiap kolom KOLOM_NILAI dan jumlah responden per kategori NKI
+KOLOM_AGREGAT = ", ".join(
+    ["COUNT(*) AS jumlah"]
+    + [f'CAST(SUM("{kolom}") AS BIGINT) AS "sen {kolom}"' for kolom in KOLOM_NILAI]
+    + [f'COUNT(*) FILTER (WHERE {syarat}) AS "{kategori}"'
+       for kategori, syarat in zip(LABEL_KATEGORI, _syarat_kategori())]
+)
+
+
+class RelasiPenilaian:
+    """Data responden yang sudah dinilai sebagai relasi DuckDB untuk agregasi SQL.
+
+    Kolom demografi (dinormalisasi seperti saat ingest) didaftarkan sebagai kode kategori
+    dan kolom nilai df_hasil sebagai nilai per seratus int16, dihitung sekali saat relasi
+    dibuat sehingga setiap query hanya menjumlahkan bilangan bulat; label kategori
+    disimpan di Python. Ringkasan untuk filter demografi apa pun dihitung dengan satu
+    query yang memindai kolom yang dibutuhkan dengan semua thread DuckDB, tanpa menyalin
+    baris yang cocok. Dipakai dengan blok with agar koneksi ditutup.
+    """
+
+    def __init__(self, data, df_hasil, jumlah_thread=None):
+        import duckdb
+
+        data = normalisasi_demografi(data[[kolom for kolom in DIMENSI_KUBUS if kolom in data.columns]])
+        self.dimensi = list(data.columns)
+        # Filter dan GROUP BY memakai kode kategori (KODE_KOSONG untuk nilai kosong), lebih
+        # cepat daripada membandingkan teks
+        self.label = {}
+        kolom = {}
+        for nama in self.dimensi:
+            kategori = data[nama].astype('category')
+            kolom[nama] = kategori.cat.codes.to_numpy()
+            self.label[nama] = [str(x) for x in kategori.cat.categories]
+        kolom.update({nama: nilai_sen(df_hasil[nama]) for nama in KOLOM_NILAI})
+        self._koneksi = duckdb.connect(config={'threads': jumlah_thread or konfigurasi.JUMLAH_THREAD_DUCKDB})
+        # DataFrame dipindai DuckDB langsung dari array NumPy-nya
+        self._koneksi.register('penilaian', pd.DataFrame(kolom, copy=False))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, jenis_error, error, traceback):
+        self.tutup()
+        return False
+
+    def tutup(self):
+        self._koneksi.close()
+
+    # Klausa WHERE dan parameternya untuk filter {dimensi: daftar label} seperti
+    # KubusDemografi.masker. LABEL_KOSONG memilih baris yang nilainya kosong
+    def _where(self, filter_dimensi):
+        syarat, parameter = [], []
+        for kolom, pilihan in (filter_dimensi or {}).items():
+            if not pilihan or kolom not in self.dimensi:
+                continue
+            pilihan = {str(x) for x in pilihan}
+            kode = [i for i, label in enumerate(self.label[kolom]) if label in pilihan]
+            bagian = []
+            if kode:
+                bagian.append(f'"{kolom}" IN ({", ".join("?" * len(kode))})')
+                parameter += kode
+            if LABEL_KOSONG in pilihan:
+                bagian.append(f'"{kolom}" = {KODE_KOSONG}')
+            syarat.append(f"({' OR '.join(bagian) or 'FALSE'})")
+        return (f" WHERE {' AND '.join(syarat)}" if syarat else ""), parameter
+
+    # Akumulator penilaian untuk responden yang cocok dengan filter
+    @diukur
+    def agregat(self, filter_dimensi=None):
+        where, parameter = self._where(filter_dimensi)
+        baris = self._koneksi.execute(f"SELECT {KOLOM_AGREGAT} FROM penilaian{where}", parameter).fetchone()
+        agregat = AgregatPenilaian()
+        agregat.jumlah_responden = int(baris[0])
+        if agregat.jumlah_responden:
+            agregat.jumlah_sen += np.array(baris[1:1 + len(KOLOM_NILAI)], dtype=np.int64)
+        for kategori, jumlah in zip(LABEL_KATEGORI, baris[1 + len(KOLOM_NILAI):]):
+            agregat.distribusi_kategori[kategori] = int(jumlah)
+        return agregat
+
+    # Distribusi demografi (seperti hitung_distribusi_demografi) untuk responden yang
+    # cocok, semua kolom dalam satu pemindaian (GROUPING SETS)
+    @diukur
+    def distribusi_demografi(self, filter_dimensi=None):
+        kolom_grafik = [kolom for kolom in KOLOM_GRAFIK_DEMOGRAFI if kolom in self.dimensi]
+        if not kolom_grafik:
+            return {}
+        where, parameter = self._where(filter_dimensi)
+        daftar_kolom = ", ".join(f'"{kolom}"' for kolom in kolom_grafik)
+        hasil = self._koneksi.execute(
+            f"SELECT {daftar_kolom}, COUNT(*) FROM penilaian{where} GROUP BY GROUPING SETS "
+            f"({', '.join(f'({kolom})' for kolom in daftar_kolom.split(', '))})", parameter).fetchall()
+
+        # Kode kategori tidak pernah NULL, jadi kolom yang terisi adalah kolom kelompok baris itu
+        jumlah = {kolom: {} for kolom in kolom_grafik}
+        for *daftar_kode, n in hasil:
+            for kolom, kode in zip(kolom_grafik, daftar_kode):
+                if kode is not None and kode != KODE_KOSONG:
+                    jumlah[kolom][self.label[kolom][kode]] = n
+        return {kolom: urutkan_distribusi(pd.Series(jumlah[kolom], dtype='int64')) for kolom in kolom_grafik}
+
+    # Ringkasan penilaian (format rangkum_penilaian, tanpa nilai per responden) untuk filter
+    def ringkasan(self, filter_dimensi=None):
+        return ringkasan_dari_agregat(self.agregat(filter_dimensi), self.distribusi_demografi(filter_dimensi))
+
+    # Fungsi untuk membangun KubusDemografi (sama seperti bangun_kubus) dengan GROUP BY
+    # semua dimensi; hanya sel hasil query yang diolah di Python
+    @diukur
+    def kubus(self):
+        dimensi = ", ".join(f'"{kolom}"' for kolom in self.dimensi)
+        sql = f"SELECT {dimensi + ', ' if dimensi else ''}{KOLOM_AGREGAT} FROM penilaian"
+        sel = self._koneksi.execute(sql + (f" GROUP BY {dimensi}" if dimensi else "")).df()
+        # Kode kategori diganti labelnya lalu dikodekan ulang seperti bangun_kubus (urut abjad)
+        label = {}
+        kode_sel = np.empty((len(sel), len(self.dimensi)), dtype=np.int32)
+        for d, kolom in enumerate(self.dimensi):
+            sel[kolom] = pd.Categorical.from_codes(sel[kolom].to_numpy(), categories=self.label[kolom])
+            kode_sel[:, d], label[kolom] = kode_dimensi(sel, kolom)
+        return KubusDemografi(self.dimensi, label, kode_sel,
+                              sel['jumlah'].to_numpy(dtype=np.int64),
+                              sel[[f"sen {kolom}" for kolom in KOLOM_NILAI]].to_numpy(dtype=np.int64),
+                              sel[LABEL_KATEGORI].to_numpy(dtype=np.int64))
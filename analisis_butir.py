@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+from instrumentasi import diukur
+from penilaian import BUKU_ATURAN, KODE_PERTANYAAN, ambil_kolom_jawaban
+
+
+# Analisis butir (per pertanyaan) dari matriks skor item int8 hasil penilaian. Semua
+# statistik berasal dari jumlah skor dan matriks Gram (X^T X, 43 x 43) yang dihitung
+# sekali per bagian baris, sehingga tidak ada DataFrame per responden yang dibuat
+
+# Label frekuensi untuk jawaban terisi yang tidak ada di opsi buku aturan dan jawaban kosong
+LABEL_TIDAK_DIKENAL = "(tidak dikenal)"
+LABEL_JAWABAN_KOSONG = "(kosong)"
+
+# Banyaknya baris yang diubah ke float64 sekaligus saat menghitung matriks Gram
+BARIS_PER_BAGIAN = 65536
+
+# Skor tertinggi setiap pertanyaan, urut sesuai KODE_PERTANYAAN
+SKOR_MAKS_ITEM = np.array([skor[:-1].max() for skor in BUKU_ATURAN.skor], dtype=np.int64)
+
+# Fungsi untuk menghitung frekuensi jawaban setiap pertanyaan. Hasilnya list (urut
+# KODE_PERTANYAAN) berisi array jumlah responden per opsi buku aturan, diikuti jumlah
+# jawaban tidak dikenal dan jumlah jawaban kosong
+@diukur
+def hitung_frekuensi_opsi(df):
+    frekuensi = []
+    for i, kolom in enumerate(ambil_kolom_jawaban(df)):
+        indeks_opsi = BUKU_ATURAN.indeks_opsi[i]
+        tidak_dikenal, kosong = len(BUKU_ATURAN.opsi[i]), len(BUKU_ATURAN.opsi[i]) + 1
+        if isinstance(kolom.dtype, pd.CategoricalDtype):
+            # Hitung per kategori dulu (kode -1 = kosong), lalu kelompokkan kategori ke opsinya
+            jumlah_kategori = np.bincount(kolom.cat.codes.to_numpy() + 1, minlength=len(kolom.cat.categories) + 1)
+            opsi_kategori = [kosong] + [indeks_opsi.get(k, tidak_dikenal) for k in kolom.cat.categories]
+            jumlah = np.bincount(opsi_kategori, weights=jumlah_kategori, minlength=kosong + 1)
+        else:
+            kode = kolom.map(indeks_opsi).fillna(tidak_dikenal).to_numpy(dtype=np.intp)
+            kode[kolom.isna().to_numpy()] = kosong
+            jumlah = np.bincount(kode, minlength=kosong + 1)
+        frekuensi.append(jumlah.astype(np.int64))
+    return frekuensi
+
+# Fungsi untuk menghitung jumlah skor per pertanyaan dan matriks Gram (jumlah perkalian
+# skor setiap pasangan pertanyaan). Nilainya bilangan bulat di bawah 2^53 sehingga
+# penjumlahan float64 per bagian tetap persis
+def _momen(skor_item):
+    jumlah = np.zeros(skor_item.shape[1], dtype=np.float64)
+    gram = np.zeros((skor_item.shape[1], skor_item.shape[1]), dtype=np.float64)
+    for awal in range(0, len(skor_item), BARIS_PER_BAGIAN):
+        x = skor_item[awal:awal + BARIS_PER_BAGIAN].astype(np.float64)
+        jumlah += x.sum(axis=0)
+        gram += x.T @ x
+    return jumlah, gram
+
+# Fungsi untuk menghitung korelasi setiap pertanyaan dengan total kelompoknya tanpa
+# pertanyaan itu sendiri (corrected item-total). kelompok adalah matriks 0/1 (pertanyaan x
+# kelompok) dan anggota berisi indeks kelompok setiap pertanyaan
+def _korelasi_item_sisa(kovarians, kelompok, anggota):
+    var_item = np.diag(kovarians)
+    kov_kelompok = (kovarians @ kelompok)[np.arange(len(anggota)), anggota]
+    var_kelompok = np.einsum('ij,ik,kj->j', kelompok, kovarians, kelompok)[anggota]
+    kov_sisa = kov_kelompok - var_item
+    var_sisa = var_kelompok - 2 * kov_kelompok + var_item
+    with np.errstate(invalid='ignore', divide='ignore'):
+        korelasi = kov_sisa / np.sqrt(var_item * var_sisa)
+    # Pertanyaan atau sisa kelompok yang skornya tidak bervariasi tidak punya korelasi
+    korelasi[(var_item <= 1e-12) | (var_sisa <= 1e-12)] = np.nan
+    return korelasi
+
+# Fungsi untuk membuat tabel analisis butir: satu baris per pertanyaan berisi rata-rata
+# skor, capaian terhadap skor tertinggi, korelasi item-total dan item-indikator, serta
+# persentase jawaban tidak dikenal dan kosong (jika frekuensi opsi diberikan)
+@diukur
+def analisis_butir(skor_item, frekuensi=None):
+    n = len(skor_item)
+    jumlah, gram = _momen(skor_item)
+    rata_rata = jumlah / n if n else np.full(len(KODE_PERTANYAAN), np.nan)
+    if n:
+        kovarians = (gram - np.outer(jumlah, jumlah) / n) / n
+        indeks_indikator = np.array([BUKU_ATURAN.indikator.index(ind) for ind in BUKU_ATURAN.indikator_pertanyaan])
+        satu_indikator = (indeks_indikator[:, None] == np.arange(len(BUKU_ATURAN.indikator))).astype(np.float64)
+        korelasi_total = _korelasi_item_sisa(kovarians, np.ones((len(KODE_PERTANYAAN), 1)),
+                                             np.zeros(len(KODE_PERTANYAAN), dtype=np.intp))
+        korelasi_indikator = _korelasi_item_sisa(kovarians, satu_indikator, indeks_indikator)
+    else:
+        korelasi_total = korelasi_indikator = np.full(len(KODE_PERTANYAAN), np.nan)
+
+    tabel = pd.DataFrame({
+        "Kode": KODE_PERTANYAAN,
+        "Indikator": BUKU_ATURAN.indikator_pertanyaan,
+        "Rata-Rata Skor": rata_rata,
+        "Skor Maks": SKOR_MAKS_ITEM,
+        "Capaian (%)": rata_rata / SKOR_MAKS_ITEM * 100,
+        "Korelasi Item-Total": korelasi_total,
+        "Korelasi Item-Indikator": korelasi_indikator,
+    })
+    if frekuensi is not None:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tabel["Tidak Dikenal (%)"] = [f[-2] / f.sum() * 100 for f in frekuensi]
+            tabel["Kosong (%)"] = [f[-1] / f.sum() * 100 for f in frekuensi]
+    return tabel
+
+# Fungsi untuk membuat tabel distribusi opsi jawaban satu pertanyaan (indeks ke-i
+# KODE_PERTANYAAN) dari hasil hitung_frekuensi_opsi
+def tabel_distribusi_opsi(frekuensi, i):
+    jumlah = frekuensi[i]
+    total = jumlah.sum()
+    return pd.DataFrame({
+        "Jawaban": BUKU_ATURAN.opsi[i] + [LABEL_TIDAK_DIKENAL, LABEL_JAWABAN_KOSONG],
+        "Skor": BUKU_ATURAN.skor[i][:-1].tolist() + [0, 0],
+        "Jumlah": jumlah,
+        "Persentase (%)": jumlah / total * 100 if total else np.full(len(jumlah), np.nan),
+    })
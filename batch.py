@@ -0,0 +1,184 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+import konfigurasi
+from demografi import gabung_distribusi, hitung_distribusi_demografi
+from ingest import baca_survei
+from instrumentasi import catat, diukur
+from penilaian import (KODE_PERTANYAAN, AgregatPenilaian, hitung_semua_responden, hitung_skor_item, kategorikan,
+                       ringkasan_dari_agregat)
+
+
+# Nama kolom asal file pada data gabungan
+KOLOM_SUMBER = 'FILE SUMBER'
+
+
+class HasilFile:
+    """Hasil ingest dan penilaian satu file pada unggahan banyak file."""
+
+    def __init__(self, nama_file, df=None, df_hasil=None, distribusi_demografi=None, error=None, waktu=0.0,
+                 skor_item=None):
+        self.nama_file = nama_file
+        self.df = df
+        self.df_hasil = df_hasil
+        self.skor_item = skor_item
+        self.distribusi_demografi = distribusi_demografi or {}
+        self.error = error
+        self.waktu = waktu
+
+    @property
+    def berhasil(self):
+        return self.error is None
+
+# Fungsi untuk membaca, memeriksa skema dan menilai satu file (dijalankan di proses worker).
+# isi_file berupa bytes isi file atau path file di disk
+def proses_satu_file(nama_file, isi_file):
+    mulai = time.perf_counter()
+    try:
+        df = baca_survei(BytesIO(isi_file) if isinstance(isi_file, bytes) else isi_file, nama_file)
+        skor_item = hitung_skor_item(df)
+        df_hasil = hitung_semua_responden(df, skor_item)
+        distribusi = hitung_distribusi_demografi(df)
+    except Exception as e:
+        return HasilFile(nama_file, error=f"{type(e).__name__}: {e}", waktu=time.perf_counter() - mulai)
+    return HasilFile(nama_file, df, df_hasil, distribusi, waktu=time.perf_counter() - mulai, skor_item=skor_item)
+
+# Fungsi untuk memproses banyak file sekaligus di process pool. progres (opsional) dipanggil
+# setiap satu file selesai dengan argumen (HasilFile, jumlah selesai, jumlah file).
+# Hasilnya list HasilFile sesuai urutan daftar_file
+@diukur
+def proses_banyak_file(daftar_file, jumlah_worker=None, progres=None):
+    jumlah_worker = konfigurasi.JUMLAH_WORKER_INGEST if jumlah_worker is None else jumlah_worker
+    jumlah_worker = max(1, min(jumlah_worker, len(daftar_file)))
+    hasil = [None] * len(daftar_file)
+
+    def selesai(i, hasil_file):
+        hasil[i] = hasil_file
+        catat('proses_satu_file', hasil_file.waktu, keterangan=hasil_file.nama_file if hasil_file.berhasil
+              else f"{hasil_file.nama_file} gagal", baris=len(hasil_file.df) if hasil_file.berhasil else None)
+        if progres is not None:
+            progres(hasil_file, sum(h is not None for h in hasil), len(daftar_file))
+
+    if jumlah_worker == 1:
+        for i, (nama_file, isi_file) in enumerate(daftar_file):
+            selesai(i, proses_satu_file(nama_file, isi_file))
+        return hasil
+
+    # spawn dipakai karena server Streamlit berjalan dengan banyak thread
+    try:
+        with ProcessPoolExecutor(max_workers=jumlah_worker,
+                                 mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {pool.submit(proses_satu_file, nama_file, isi_file): i
+                       for i, (nama_file, isi_file) in enumerate(daftar_file)}
+            for future in as_completed(futures):
+                selesai(futures[future], future.result())
+    except BrokenProcessPool:
+        # Worker mati (misalnya kehabisan memori), file yang belum selesai diproses di sini
+        for i, (nama_file, isi_file) in enumerate(daftar_file):
+            if hasil[i] is None:
+                selesai(i, proses_satu_file(nama_file, isi_file))
+    return hasil
+
+# Fungsi untuk menggabungkan data beberapa file menjadi satu DataFrame dengan kolom asal file.
+# Kolom kategori disamakan kategorinya agar hasil gabungan tetap bertipe category
+def gabung_data(daftar_hasil):
+    daftar_hasil = [h for h in daftar_hasil if h.berhasil]
+    if not daftar_hasil:
+        return pd.DataFrame()
+    kolom_id = daftar_hasil[0].df.columns[0]
+    bagian = []
+    for h in daftar_hasil:
+        df = h.df.rename(columns={h.df.columns[0]: kolom_id})
+        df[KOLOM_SUMBER] = h.nama_file
+        bagian.append(df)
+
+    semua_kolom = list(dict.fromkeys(k for df in bagian for k in df.columns))
+    for kolom in semua_kolom:
+        ada = [df[kolom] for df in bagian if kolom in df.columns]
+        if kolom != KOLOM_SUMBER and not all(isinstance(k.dtype, pd.CategoricalDtype) for k in ada):
+            continue
+        kategori = pd.Index(pd.unique(np.concatenate([np.asarray(
+            k.cat.categories if isinstance(k.dtype, pd.CategoricalDtype) else k.unique(), dtype=object) for k in ada])))
+        for i, df in enumerate(bagian):
+            if kolom in df.columns:
+                bagian[i][kolom] = pd.Categorical(df[kolom], categories=kategori)
+            else:
+                bagian[i][kolom] = pd.Categorical([None] * len(df), categories=kategori)
+    return pd.concat([df[semua_kolom] for df in bagian], ignore_index=True)
+
+# Fungsi untuk menggabungkan matriks skor per pertanyaan beberapa file sesuai urutan
+# data gabungan, tetap disimpan per kolom seperti hasil hitung_skor_item
+def gabung_skor_item(daftar_hasil):
+    skor_item = np.empty((sum(len(h.skor_item) for h in daftar_hasil), len(KODE_PERTANYAAN)),
+                         dtype=np.int8, order='F')
+    awal = 0
+    for h in daftar_hasil:
+        skor_item[awal:awal + len(h.skor_item)] = h.skor_item
+        awal += len(h.skor_item)
+    return skor_item
+
+# Fungsi untuk menyamakan tipe kolom ID (kolom pertama, biasanya Timestamp) antar file.
+# File CSV membaca Timestamp sebagai teks sedangkan Excel/Parquet sebagai datetime,
+# jika tipenya berbeda semua ID diubah menjadi teks
+def samakan_kolom_id(daftar_hasil):
+    if len({str(h.df.dtypes.iloc[0]) for h in daftar_hasil}) <= 1:
+        return
+    for h in daftar_hasil:
+        id_teks = h.df.iloc[:, 0].astype(str).where(h.df.iloc[:, 0].notna(), None)
+        h.df = h.df.copy(deep=False)
+        h.df.isetitem(0, id_teks)
+        h.df_hasil = h.df_hasil.assign(Responden_ID=id_teks.to_numpy())
+
+# Fungsi untuk membuat tabel rata-rata per file
+def tabel_per_file(daftar_hasil):
+    baris = []
+    for h in daftar_hasil:
+        if not h.berhasil:
+            continue
+        rata_rata = AgregatPenilaian().tambah(h.df_hasil).rata_rata()
+        baris.append({
+            "File": h.nama_file,
+            "Jumlah Responden": len(h.df_hasil),
+            "NKKST": rata_rata['NKKST'],
+            "NKKSS": rata_rata['NKKSS'],
+            "NKI": rata_rata['NKI'],
+        })
+    tabel = pd.DataFrame(baris, columns=["File", "Jumlah Responden", "NKKST", "NKKSS", "NKI"])
+    tabel["Kategori NKI"] = kategorikan(tabel["NKI"])[0].astype(object)
+    return tabel
+
+# Fungsi untuk menyusun data dan hasil penilaian gabungan dari beberapa file tanpa menilai ulang.
+# Hasilnya (data gabungan, ringkasan seperti rangkum_penilaian ditambah tabel per file)
+def rangkum_banyak_file(daftar_hasil):
+    berhasil = [h for h in daftar_hasil if h.berhasil]
+    agregat = AgregatPenilaian()
+    distribusi_demografi = {}
+    for h in berhasil:
+        agregat.tambah(h.df_hasil)
+        distribusi_demografi = gabung_distribusi(distribusi_demografi, h.distribusi_demografi)
+
+    samakan_kolom_id(berhasil)
+    data = gabung_data(berhasil)
+    ringkasan = ringkasan_dari_agregat(agregat, distribusi_demografi)
+    if berhasil:
+        df_hasil = pd.concat([h.df_hasil for h in berhasil], ignore_index=True)
+        df_hasil[KOLOM_SUMBER] = data[KOLOM_SUMBER]
+    else:
+        df_hasil = pd.DataFrame()
+    ringkasan['df_hasil'] = df_hasil
+    ringkasan['skor_item'] = gabung_skor_item(berhasil)
+    ringkasan['skema'] = None
+    ringkasan['per_file'] = tabel_per_file(berhasil)
+    # Error dan peringatan skema per file, disimpan bersama hasil agar tetap bisa
+    # ditampilkan saat hasil gabungan diambil dari cache
+    ringkasan['gagal'] = {h.nama_file: h.error for h in daftar_hasil if not h.berhasil}
+    ringkasan['peringatan_file'] = {h.nama_file: h.df.attrs.get('skema', {}).get('peringatan', [])
+                                    for h in berhasil}
+    data.attrs.pop('skema', None)
+    return data, ringkasan
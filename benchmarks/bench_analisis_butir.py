@@ -0,0 +1,86 @@
+"""Benchmark analisis butir: statistik per pertanyaan dari matriks skor item int8.
+
+Data sintetis dinilai dengan rangkum_penilaian yang menyimpan matriks skor per pertanyaan
+(responden x 43, int8). Diukur waktu menghitung frekuensi opsi jawaban dari kode kategori
+dan tabel analisis butir (rata-rata, capaian, korelasi item-total dan item-indikator dari
+satu matriks Gram), dibandingkan dengan menghitung ulang matriks skor dari data jawaban
+dan dengan cara pandas (DataFrame skor float64, Series.corr per pertanyaan). Korelasi
+diperiksa sama dengan cara pandas. Data besar dibuat dengan mengulang 200 ribu
+responden sintetis.
+Jalankan dari root repo: python -m benchmarks.bench_analisis_butir 500000
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from analisis_butir import analisis_butir, hitung_frekuensi_opsi
+from benchmarks.data_sintetis import buat_data_sintetis
+from ingest import bentuk_data, rencana_kolom
+from penilaian import BUKU_ATURAN, KODE_PERTANYAAN, hitung_skor_item, rangkum_penilaian
+
+
+JUMLAH_DASAR = 200000
+JUMLAH_ULANG = 3
+
+
+def ukur(fungsi, ulang=JUMLAH_ULANG):
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        waktu.append(time.perf_counter() - mulai)
+    return hasil, min(waktu)
+
+# Fungsi untuk membuat data responden hasil ingest sebanyak jumlah responden
+def buat_data(jumlah):
+    df = buat_data_sintetis(min(jumlah, JUMLAH_DASAR))
+    rencana, _ = rencana_kolom(df.columns, df)
+    data = bentuk_data(df.iloc[:, sorted(rencana)], rencana)
+    del df
+    if jumlah > len(data):
+        data = data.iloc[np.arange(jumlah) % len(data)].reset_index(drop=True)
+    return data
+
+# Cara pandas: skor per pertanyaan sebagai DataFrame float64, lalu rata-rata dan korelasi
+# setiap pertanyaan dengan jumlah skor pertanyaan lain (total dan indikatornya)
+def analisis_pandas(skor_item):
+    skor = pd.DataFrame(skor_item.astype(np.float64), columns=KODE_PERTANYAAN)
+    total = skor.sum(axis=1)
+    total_indikator = skor.T.groupby(BUKU_ATURAN.indikator_pertanyaan).sum().T
+    hasil = []
+    for kode, indikator in zip(KODE_PERTANYAAN, BUKU_ATURAN.indikator_pertanyaan):
+        hasil.append((skor[kode].mean(), skor[kode].corr(total - skor[kode]),
+                      skor[kode].corr(total_indikator[indikator] - skor[kode])))
+    return pd.DataFrame(hasil, columns=["Rata-Rata Skor", "Korelasi Item-Total", "Korelasi Item-Indikator"])
+
+def main(argv):
+    jumlah = int(argv[0]) if argv else 500000
+    data = buat_data(jumlah)
+
+    hasil, waktu_nilai = ukur(lambda: rangkum_penilaian(data), 1)
+    skor_item = hasil['skor_item']
+    waktu = {
+        'hitung ulang matriks skor item': ukur(lambda: hitung_skor_item(data))[1],
+        'frekuensi opsi jawaban': ukur(lambda: hitung_frekuensi_opsi(data))[1],
+    }
+    frekuensi = hitung_frekuensi_opsi(data)
+    tabel, waktu['analisis butir (NumPy, Gram)'] = ukur(lambda: analisis_butir(skor_item, frekuensi))
+    lama, waktu['cara pandas (tanpa frekuensi)'] = ukur(lambda: analisis_pandas(skor_item), 1)
+
+    for kolom in lama.columns:
+        assert np.allclose(tabel[kolom], lama[kolom], atol=1e-9, equal_nan=True), kolom
+    assert all(f.sum() == jumlah for f in frekuensi)
+
+    print(f"{jumlah} responden x {skor_item.shape[1]} pertanyaan, matriks skor item "
+          f"{skor_item.nbytes / 2**20:.1f} MB, penilaian (termasuk matriks) {waktu_nilai:.2f} s, "
+          f"hasil sama dengan pandas")
+    print(f"{'langkah':<34} {'waktu (ms)':>11}")
+    for langkah, detik in waktu.items():
+        print(f"{langkah:<34} {detik * 1000:>11.0f}")
+    print(f"{'tampilan analisis butir (total)':<34} "
+          f"{(waktu['frekuensi opsi jawaban'] + waktu['analisis butir (NumPy, Gram)']) * 1000:>11.0f}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
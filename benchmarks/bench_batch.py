@@ -0,0 +1,55 @@
+"""Benchmark unggahan banyak file: waktu total proses_banyak_file per jumlah worker.
+
+Dengan worker > 1 setiap file dibaca dan dinilai di process pool, sehingga waktu
+total mengikuti jumlah core, bukan jumlah file. Hasil gabungan diperiksa identik
+dengan menilai data gabungan sekaligus.
+Jalankan dari root repo: python -m benchmarks.bench_batch 30 20000
+(argumen: jumlah file, jumlah responden per file)
+"""
+import os
+import sys
+import time
+from io import BytesIO
+
+import pandas as pd
+
+from batch import KOLOM_SUMBER, proses_banyak_file, rangkum_banyak_file
+from benchmarks.data_sintetis import buat_data_sintetis
+from penilaian import rangkum_penilaian
+
+
+# Fungsi untuk membuat daftar file CSV sintetis (nama, isi) seperti hasil unggahan
+def buat_file(jumlah_file, jumlah_responden):
+    daftar_file = []
+    for i in range(jumlah_file):
+        isi = BytesIO()
+        buat_data_sintetis(jumlah_responden, seed=i).to_csv(isi, index=False)
+        daftar_file.append((f"instansi_{i:02d}.csv", isi.getvalue()))
+    return daftar_file
+
+def main(argv):
+    jumlah_file = int(argv[0]) if argv else 30
+    jumlah_responden = int(argv[1]) if len(argv) > 1 else 20000
+    daftar_file = buat_file(jumlah_file, jumlah_responden)
+    jumlah_core = os.cpu_count() or 1
+
+    print(f"{jumlah_file} file x {jumlah_responden} responden, {jumlah_core} core")
+    print(f"{'worker':>7} {'waktu (s)':>10} {'speedup':>8}")
+    waktu_satu = None
+    for jumlah_worker in sorted({1, 2, 4, jumlah_core}):
+        mulai = time.perf_counter()
+        daftar_hasil = proses_banyak_file(daftar_file, jumlah_worker)
+        waktu = time.perf_counter() - mulai
+        waktu_satu = waktu_satu or waktu
+        print(f"{jumlah_worker:>7} {waktu:>10.2f} {waktu_satu / waktu:>8.2f}")
+
+    # Ringkasan gabungan harus sama dengan menilai data gabungan sekaligus
+    data, ringkasan = rangkum_banyak_file(daftar_hasil)
+    acuan = rangkum_penilaian(data)
+    pd.testing.assert_series_equal(acuan['rata_rata'], ringkasan['rata_rata'], check_exact=True)
+    pd.testing.assert_frame_equal(acuan['df_hasil'], ringkasan['df_hasil'].drop(columns=KOLOM_SUMBER),
+                                  check_exact=True)
+    assert acuan['distribusi_kategori'] == ringkasan['distribusi_kategori']
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,61 @@
+"""Benchmark demografi: normalisasi per rerun pada kolom teks vs normalisasi sekali saat ingest.
+
+Cara lama menyeragamkan jenis kelamin dengan .str pada setiap baris dan menghitung
+value_counts seluruh kolom teks setiap kali grafik dibuat. Cara baru menormalisasi
+kolom kategori sekali saat ingest (hanya daftar kategorinya yang diproses) dan
+distribusinya disimpan bersama hasil penilaian. Diukur juga render grafik batang
+demografi dengan tick setiap 2 responden (cara lama) vs tick yang dibatasi.
+Jalankan dari root repo: python -m benchmarks.bench_demografi 10000 100000
+"""
+import sys
+import time
+
+import grafik
+from benchmarks.data_sintetis import buat_data_sintetis
+from demografi import KOLOM_GRAFIK_DEMOGRAFI, hitung_distribusi_demografi, normalisasi_demografi
+from ingest import KOLOM_DEMOGRAFI_KATEGORI
+
+
+# Cara lama: normalisasi .str per baris lalu value_counts setiap kolom teks
+def distribusi_lama(df):
+    distribusi = {}
+    for kolom in KOLOM_GRAFIK_DEMOGRAFI:
+        nilai = df[kolom].astype(object)
+        if kolom == 'JENIS KELAMIN':
+            nilai = nilai.str.upper().str.strip().replace({
+                'L': 'Laki-Laki', 'LAKI2': 'Laki-Laki', 'PRIA': 'Laki-Laki',
+                'P': 'Perempuan', 'WANITA': 'Perempuan'}).fillna('Tidak Ada Data')
+        distribusi[kolom] = nilai.value_counts()
+    return distribusi
+
+def ukur(fungsi, *args):
+    mulai = time.perf_counter()
+    hasil = fungsi(*args)
+    return hasil, (time.perf_counter() - mulai) * 1000
+
+def main(argv):
+    ukuran = [int(x) for x in argv] or [10000, 100000]
+    print(f"{'baris':>8} {'lama/rerun (ms)':>16} {'normalisasi sekali (ms)':>24} "
+          f"{'distribusi (ms)':>16} {'bar lama (ms)':>14} {'bar baru (ms)':>14}")
+    for jumlah in ukuran:
+        df = buat_data_sintetis(jumlah)[['Timestamp'] + KOLOM_GRAFIK_DEMOGRAFI]
+        _, waktu_lama = ukur(distribusi_lama, df)
+
+        kategori = df.astype({kolom: 'category' for kolom in KOLOM_DEMOGRAFI_KATEGORI if kolom in df.columns})
+        data, waktu_normalisasi = ukur(normalisasi_demografi, kategori)
+        distribusi, waktu_distribusi = ukur(hitung_distribusi_demografi, data)
+
+        # Cara lama (tick setiap 2 responden) didapat dengan melepas batas jumlah tick
+        batas = grafik.MAKS_TICK_JUMLAH
+        grafik.MAKS_TICK_JUMLAH = float('inf')
+        try:
+            _, waktu_bar_lama = ukur(grafik.gambar_grafik, 'umur', distribusi['UMUR'])
+        finally:
+            grafik.MAKS_TICK_JUMLAH = batas
+        _, waktu_bar_baru = ukur(grafik.gambar_grafik, 'umur', distribusi['UMUR'])
+
+        print(f"{jumlah:>8} {waktu_lama:>16.1f} {waktu_normalisasi:>24.1f} {waktu_distribusi:>16.1f} "
+              f"{waktu_bar_lama:>14.0f} {waktu_bar_baru:>14.0f}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,160 @@
+"""Benchmark mesin agregasi: jalur pandas/NumPy vs relasi DuckDB untuk data besar.
+
+Untuk setiap ukuran data diukur agregasi yang dijalankan dashboard: ringkasan seluruh
+responden (rata-rata, distribusi kategori dan demografi, seperti rangkum_penilaian),
+ringkasan untuk filter demografi acak langsung dari data responden, dan membangun kubus
+filter. Dilaporkan waktu wall tercepat dari beberapa ulangan dan kenaikan peak RSS setiap
+langkah; ringkasan DuckDB sudah termasuk membuat relasinya. Hasil DuckDB
+diperiksa identik dengan jalur pandas. Setiap ukuran dijalankan di proses terpisah.
+Data sebesar jutaan responden dibuat dengan mengulang 200 ribu responden sintetis yang
+sudah dinilai, karena data mentah sebesar itu tidak muat di memori mesin benchmark.
+Jalankan dari root repo: python -m benchmarks.bench_duckdb 1000000 10000000 --thread 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import konfigurasi
+from agregasi_duckdb import RelasiPenilaian
+from benchmarks.bench_kubus import filter_acak, ringkasan_filter_baris
+from benchmarks.data_sintetis import buat_data_sintetis
+from demografi import PENYERAGAM_DEMOGRAFI, hitung_distribusi_demografi
+from ingest import bentuk_data, rencana_kolom
+from kubus import DIMENSI_KUBUS, bangun_kubus
+from penilaian import AgregatPenilaian, hitung_semua_responden, ringkasan_dari_agregat
+
+
+JUMLAH_DASAR = 200000
+JUMLAH_FILTER = 10
+JUMLAH_ULANG = 3
+
+
+# Fungsi untuk membaca peak RSS proses ini (MB) sejak reset_puncak terakhir
+def puncak_mb():
+    with open('/proc/self/status') as f:
+        for baris in f:
+            if baris.startswith('VmHWM:'):
+                return int(baris.split()[1]) / 1024
+    return 0.0
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for baris in f:
+            if baris.startswith('VmRSS:'):
+                return int(baris.split()[1]) / 1024
+    return 0.0
+
+def reset_puncak():
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+
+# Fungsi untuk menjalankan satu langkah beberapa kali: (hasil, waktu wall tercepat,
+# kenaikan peak RSS terbesar)
+def ukur(fungsi):
+    waktu, memori = [], []
+    for _ in range(JUMLAH_ULANG):
+        reset_puncak()
+        awal = rss_mb()
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        waktu.append(time.perf_counter() - mulai)
+        memori.append(puncak_mb() - awal)
+    return hasil, min(waktu), max(memori)
+
+# Fungsi untuk membuat data demografi dan df_hasil sebanyak jumlah responden
+def buat_data(jumlah):
+    df = buat_data_sintetis(min(jumlah, JUMLAH_DASAR))
+    rencana, _ = rencana_kolom(df.columns, df)
+    data = bentuk_data(df.iloc[:, sorted(rencana)], rencana)
+    del df
+    df_hasil = hitung_semua_responden(data)
+    data = data[[kolom for kolom in DIMENSI_KUBUS if kolom in data.columns]]
+    if jumlah > len(data):
+        indeks = np.arange(jumlah) % len(data)
+        data = data.iloc[indeks].reset_index(drop=True)
+        df_hasil = df_hasil.iloc[indeks].reset_index(drop=True)
+    return data, df_hasil
+
+def ringkasan_pandas(data, df_hasil):
+    return ringkasan_dari_agregat(AgregatPenilaian().tambah(df_hasil), hitung_distribusi_demografi(data))
+
+def ringkasan_duckdb(data, df_hasil, jumlah_thread):
+    with RelasiPenilaian(data, df_hasil, jumlah_thread) as relasi:
+        return relasi.ringkasan()
+
+def sama(a, b):
+    return ((a['agregat'].jumlah_sen == b['agregat'].jumlah_sen).all()
+            and a['distribusi_kategori'] == b['distribusi_kategori']
+            and all(a['demografi'][kolom].equals(b['demografi'][kolom]) for kolom in a['demografi']))
+
+# Fungsi yang dijalankan di proses anak: ukur semua langkah untuk satu ukuran data dan
+# cetak hasilnya sebagai satu baris JSON
+def _jalankan_anak(jumlah, jumlah_thread):
+    konfigurasi.MESIN_AGREGASI = 'pandas'
+    data, df_hasil = buat_data(jumlah)
+    hasil = {}
+    # Pemanasan: impor duckdb dan pembuatan koneksi pertama tidak ikut terukur
+    ringkasan_duckdb(data.head(1000), df_hasil.head(1000), jumlah_thread)
+
+    lama, *hasil['ringkasan pandas'] = ukur(lambda: ringkasan_pandas(data, df_hasil))
+    baru, *hasil['ringkasan duckdb'] = ukur(lambda: ringkasan_duckdb(data, df_hasil, jumlah_thread))
+    assert sama(lama, baru)
+
+    kubus, *hasil['kubus pandas'] = ukur(lambda: bangun_kubus(data, df_hasil))
+    relasi, *hasil['relasi duckdb dibuat'] = ukur(lambda: RelasiPenilaian(data, df_hasil, jumlah_thread))
+    kubus_duckdb, *hasil['kubus duckdb'] = ukur(relasi.kubus)
+    assert sama(kubus.ringkasan(), kubus_duckdb.ringkasan())
+
+    # Filter langsung dari data responden: pandas memfilter baris lalu menyalin nilai yang
+    # cocok, DuckDB memindai kolom yang dibutuhkan dengan syarat di klausa WHERE
+    kolom_filter = {kolom: PENYERAGAM_DEMOGRAFI[kolom](data[kolom]) if kolom in PENYERAGAM_DEMOGRAFI
+                    else data[kolom] for kolom in kubus.dimensi}
+    daftar_filter = [filter_acak(kubus, np.random.default_rng(i)) for i in range(JUMLAH_FILTER)]
+    lama, *hasil['filter pandas'] = ukur(lambda: [ringkasan_filter_baris(data, df_hasil, kolom_filter, f)
+                                                  for f in daftar_filter])
+    baru, *hasil['filter duckdb'] = ukur(lambda: [relasi.ringkasan(f) for f in daftar_filter])
+    assert all(sama(a, b) for a, b in zip(lama, baru))
+    relasi.tutup()
+
+    hasil['filter pandas'][0] /= JUMLAH_FILTER
+    hasil['filter duckdb'][0] /= JUMLAH_FILTER
+    print(json.dumps(hasil))
+
+# Fungsi untuk menjalankan satu ukuran data di proses baru (None jika proses gagal,
+# misalnya kehabisan memori)
+def ukur_ukuran(jumlah, jumlah_thread):
+    proses = subprocess.run([sys.executable, '-m', 'benchmarks.bench_duckdb', '--anak', str(jumlah),
+                             '--thread', str(jumlah_thread)], stdout=subprocess.PIPE, text=True)
+    if proses.returncode != 0:
+        return None
+    return json.loads(proses.stdout.splitlines()[-1])
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_duckdb")
+    parser.add_argument('ukuran', nargs='*', type=int, default=[1000000, 10000000])
+    parser.add_argument('--thread', type=int, default=konfigurasi.JUMLAH_THREAD_DUCKDB,
+                        help="jumlah thread DuckDB (default: DASHBOARD_THREAD_DUCKDB atau jumlah CPU)")
+    parser.add_argument('--anak', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.anak:
+        _jalankan_anak(args.ukuran[0], args.thread)
+        return
+
+    print(f"{os.cpu_count()} CPU, {args.thread} thread DuckDB, hasil DuckDB identik dengan pandas")
+    for jumlah in args.ukuran:
+        hasil = ukur_ukuran(jumlah, args.thread)
+        print(f"{jumlah} responden")
+        if hasil is None:
+            print("  gagal (proses berhenti, kemungkinan kehabisan memori)")
+            continue
+        print(f"  {'langkah':<22} {'waktu (ms)':>11} {'peak RSS naik (MB)':>19}")
+        for langkah, (waktu, memori) in hasil.items():
+            print(f"  {langkah:<22} {waktu * 1000:>11.0f} {memori:>19.0f}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
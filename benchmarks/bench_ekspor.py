@@ -0,0 +1,77 @@
+"""Benchmark ekspor: pandas to_excel di BytesIO (cara lama) vs ekspor.buat_ekspor.
+
+Setiap pengukuran dijalankan di proses terpisah agar peak RSS tidak tercampur.
+Kolom "naik" adalah kenaikan peak RSS selama ekspor, di luar data yang sudah dimuat
+(peak RSS direset lewat /proc/self/clear_refs sebelum ekspor).
+Jalankan dari root repo: python -m benchmarks.bench_ekspor 10000 100000 500000
+"""
+import subprocess
+import sys
+import time
+from io import BytesIO
+
+import pandas as pd
+
+from benchmarks.bench_ingest import peak_rss_mb
+from benchmarks.data_sintetis import buat_data_sintetis
+from ekspor import buat_ekspor, tabel_ekspor_responden
+from ingest import bentuk_data, rencana_kolom
+from penilaian import rangkum_penilaian
+
+
+# Cara lama: seluruh workbook disusun di memori lewat pandas + xlsxwriter
+def ekspor_lama(ringkasan, data):
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        ringkasan['tabel_teknis'].to_excel(writer, sheet_name='Hasil Penilaian', index=False)
+        tabel_ekspor_responden(data, ringkasan['df_hasil']).to_excel(writer, sheet_name='Nilai Responden', index=False)
+    return output.getvalue()
+
+# Fungsi yang dijalankan di proses anak: siapkan data, ekspor, lalu cetak waktu dan memori
+def _jalankan_anak(mode, jumlah):
+    df = buat_data_sintetis(jumlah)
+    rencana, _ = rencana_kolom(df.columns, df)
+    data = bentuk_data(df.iloc[:, sorted(rencana)], rencana)
+    del df
+    ringkasan = rangkum_penilaian(data)
+    tabel_ringkasan = [ringkasan['tabel_teknis'], ringkasan['tabel_sosial']]
+
+    # Reset peak RSS (Linux) agar yang terukur hanya puncak selama ekspor
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+    awal = peak_rss_mb()
+    mulai = time.perf_counter()
+    if mode == 'lama':
+        isi = ekspor_lama(ringkasan, data)
+    else:
+        isi = buat_ekspor(mode, tabel_ringkasan, data, ringkasan['df_hasil'])
+    waktu = time.perf_counter() - mulai
+    print(f"{waktu:.6f} {peak_rss_mb() - awal:.1f} {len(isi) / 1024 / 1024:.1f}")
+
+# Fungsi untuk menjalankan satu pengukuran di proses baru
+def ukur(mode, jumlah):
+    keluaran = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_ekspor', '--anak', mode, str(jumlah)],
+        stdout=subprocess.PIPE, text=True, check=True).stdout
+    waktu, selisih, ukuran = keluaran.split()
+    return float(waktu), float(selisih), float(ukuran)
+
+def main(argv):
+    ukuran = [int(x) for x in argv] or [10000, 100000, 500000]
+    print(f"{'baris':>8} {'jalur':<28} {'waktu (s)':>10} {'naik RSS (MB)':>14} {'file (MB)':>10}")
+    for jumlah in ukuran:
+        for label, mode in [('to_excel BytesIO (lama)', 'lama'),
+                            ('buat_ekspor xlsx', 'xlsx'),
+                            ('buat_ekspor csv', 'csv'),
+                            ('buat_ekspor parquet', 'parquet')]:
+            waktu, selisih, besar = ukur(mode, jumlah)
+            print(f"{jumlah:>8} {label:<28} {waktu:>10.2f} {selisih:>14.0f} {besar:>10.1f}")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--anak']:
+        _jalankan_anak(sys.argv[2], int(sys.argv[3]))
+    else:
+        main(sys.argv[1:])
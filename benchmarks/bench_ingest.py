@@ -0,0 +1,84 @@
+"""Benchmark ingest: pd.read_excel seluruh workbook vs ingest.baca_survei.
+
+Setiap pengukuran dijalankan di proses terpisah agar peak RSS tidak tercampur.
+Jalankan dari root repo: python -m benchmarks.bench_ingest 10000 50000
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.data_sintetis import buat_data_sintetis
+import konfigurasi
+from ingest import baca_survei
+from penilaian import hitung_semua_responden
+
+
+# Fungsi untuk membaca peak RSS proses ini (MB)
+def peak_rss_mb():
+    # VmHWM direset saat exec, berbeda dengan ru_maxrss yang mewarisi nilai proses induk
+    try:
+        with open('/proc/self/status') as f:
+            for baris in f:
+                if baris.startswith('VmHWM:'):
+                    return int(baris.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# Fungsi yang dijalankan di proses anak: baca file lalu cetak waktu dan memori
+def _jalankan_anak(mode, path):
+    if mode.startswith('baru-'):
+        konfigurasi.ENGINE_EXCEL = mode.split('-', 1)[1]
+    awal = peak_rss_mb()
+    mulai = time.perf_counter()
+    if mode == 'lama':
+        df = pd.read_excel(path)
+    else:
+        df = baca_survei(path)
+    waktu = time.perf_counter() - mulai
+    print(f"{waktu:.6f} {peak_rss_mb():.1f} {peak_rss_mb() - awal:.1f} {len(df)}")
+
+# Fungsi untuk menjalankan satu pengukuran di proses baru
+def ukur(mode, path):
+    keluaran = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_ingest', '--anak', mode, path],
+        stdout=subprocess.PIPE, text=True, check=True).stdout
+    waktu, rss, selisih, _ = keluaran.split()
+    return float(waktu), float(rss), float(selisih)
+
+def main(argv):
+    ukuran = [int(x) for x in argv] or [10000]
+    print(f"{'baris':>8} {'jalur':<22} {'waktu (s)':>10} {'peak RSS (MB)':>14} {'naik (MB)':>10}")
+    with tempfile.TemporaryDirectory() as direktori:
+        for jumlah in ukuran:
+            df = buat_data_sintetis(jumlah)
+            path = {ext: os.path.join(direktori, f"survei_{jumlah}.{ext}")
+                    for ext in ('xlsx', 'csv', 'parquet')}
+            df.to_excel(path['xlsx'], index=False, engine='xlsxwriter')
+            df.to_csv(path['csv'], index=False)
+            df.to_parquet(path['parquet'], index=False)
+
+            # Pastikan data hasil ingest menghasilkan nilai yang sama dengan jalur lama
+            acuan = hitung_semua_responden(pd.read_excel(path['xlsx'])).drop(columns='Responden_ID')
+            for file in path.values():
+                hasil = hitung_semua_responden(baca_survei(file)).drop(columns='Responden_ID')
+                pd.testing.assert_frame_equal(acuan, hasil, check_exact=True)
+
+            for label, mode, file in [('read_excel (lama)', 'lama', path['xlsx']),
+                                      ('baca_survei openpyxl', 'baru-openpyxl', path['xlsx']),
+                                      ('baca_survei calamine', 'baru-calamine', path['xlsx']),
+                                      ('baca_survei csv', 'baru', path['csv']),
+                                      ('baca_survei parquet', 'baru', path['parquet'])]:
+                waktu, rss, selisih = ukur(mode, file)
+                print(f"{jumlah:>8} {label:<22} {waktu:>10.2f} {rss:>14.0f} {selisih:>10.0f}")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--anak']:
+        _jalankan_anak(sys.argv[2], sys.argv[3])
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,51 @@
+"""Benchmark overhead instrumentasi: nonaktif vs aktif.
+
+Mengukur biaya per pemanggilan fungsi yang diberi @diukur (fungsi kosong) dan
+waktu rangkum_penilaian (3 tahap tercatat per pemanggilan) untuk data kecil,
+di mana overhead paling terasa.
+Jalankan dari root repo: python -m benchmarks.bench_instrumentasi 1000
+"""
+import sys
+import time
+
+import instrumentasi
+import konfigurasi
+from benchmarks.data_sintetis import buat_data_sintetis
+from ingest import bentuk_data, rencana_kolom
+from instrumentasi import diukur
+from penilaian import rangkum_penilaian
+
+
+@diukur
+def fungsi_kosong():
+    return None
+
+# Waktu rata-rata per pemanggilan (detik), diambil yang tercepat dari beberapa ulangan
+def ukur(fungsi, jumlah):
+    terbaik = float('inf')
+    for _ in range(5):
+        mulai = time.perf_counter()
+        for _ in range(jumlah):
+            fungsi()
+        terbaik = min(terbaik, (time.perf_counter() - mulai) / jumlah)
+    return terbaik
+
+def main(argv):
+    jumlah = int(argv[0]) if argv else 1000
+    df = buat_data_sintetis(jumlah)
+    rencana, _ = rencana_kolom(df.columns, df)
+    data = bentuk_data(df.iloc[:, sorted(rencana)], rencana)
+    # Catatan tidak ditulis ke file agar yang terukur hanya pencatatan di memori
+    konfigurasi.FILE_JEJAK = konfigurasi.FILE_METRIK = None
+
+    print(f"{'mode':<10} {'@diukur kosong (us)':>20} {f'rangkum_penilaian {jumlah} baris (ms)':>36}")
+    for mode in (0, 1):
+        konfigurasi.INSTRUMENTASI = mode
+        instrumentasi.mulai_rerun()
+        waktu_kosong = ukur(fungsi_kosong, 2000)
+        waktu_rangkum = ukur(lambda: rangkum_penilaian(data), 20)
+        instrumentasi.selesai_rerun()
+        print(f"{'aktif' if mode else 'nonaktif':<10} {waktu_kosong * 1e6:>20.2f} {waktu_rangkum * 1000:>36.2f}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
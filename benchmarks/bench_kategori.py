@@ -0,0 +1,62 @@
+"""Benchmark kategori: if-chain per nilai + empat filter DataFrame vs kategorikan.
+
+Jalankan dari root repo: python -m benchmarks.bench_kategori 1000000
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from penilaian import hitung_distribusi_kategori, kategorikan
+
+
+# Cara lama: tentukan_kategori (if-chain) dipanggil per nilai
+def kategori_per_nilai(daftar_nilai):
+    hasil = []
+    for nilai in daftar_nilai:
+        if nilai > 80:
+            hasil.append("Sangat Baik")
+        elif nilai > 50:
+            hasil.append("Baik")
+        elif nilai > 25:
+            hasil.append("Kurang Baik")
+        else:
+            hasil.append("Buruk")
+    return hasil
+
+# Cara lama: empat salinan DataFrame hasil filter, lalu diambil len()
+def distribusi_dengan_filter(df_hasil):
+    return {
+        'Sangat Baik': len(df_hasil[df_hasil['NKI'] > 80]),
+        'Baik': len(df_hasil[(df_hasil['NKI'] > 50) & (df_hasil['NKI'] <= 80)]),
+        'Kurang Baik': len(df_hasil[(df_hasil['NKI'] > 25) & (df_hasil['NKI'] <= 50)]),
+        'Buruk': len(df_hasil[df_hasil['NKI'] <= 25]),
+    }
+
+def ukur(fungsi, *args):
+    mulai = time.perf_counter()
+    hasil = fungsi(*args)
+    return hasil, time.perf_counter() - mulai
+
+def main(argv):
+    ukuran = [int(x) for x in argv] or [1000000]
+    print(f"{'nilai':>9} {'lama (s)':>10} {'kategorikan (s)':>16} {'percepatan':>11}")
+    for jumlah in ukuran:
+        rng = np.random.default_rng(0)
+        # Nilai 2 desimal termasuk tepat di batas 25/50/80
+        nki = np.round(rng.uniform(0, 100, jumlah), 2)
+        nki[:3] = [25, 50, 80]
+        # Frame hasil dengan 15 kolom seperti df_hasil, agar biaya salinan filter realistis
+        df_hasil = pd.DataFrame({f'K{i}': nki for i in range(14)} | {'NKI': nki})
+
+        (kategori_lama, distribusi_lama), waktu_lama = ukur(
+            lambda: (kategori_per_nilai(nki.tolist()), distribusi_dengan_filter(df_hasil)))
+        (kategori_baru, distribusi_baru), waktu_baru = ukur(kategorikan, df_hasil['NKI'])
+
+        assert list(kategori_baru) == kategori_lama
+        assert distribusi_baru == distribusi_lama == hitung_distribusi_kategori(df_hasil)
+        print(f"{jumlah:>9} {waktu_lama:>10.3f} {waktu_baru:>16.4f} {waktu_lama / waktu_baru:>10.1f}x")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
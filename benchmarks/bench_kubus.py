@@ -0,0 +1,103 @@
+"""Benchmark filter demografi: memfilter data responden vs menjumlahkan sel kubus.
+
+Untuk sejumlah kombinasi filter acak diukur waktu menghitung ringkasan (rata-rata,
+tabel indikator, distribusi kategori) dan waktu merender gauge + pie hasil filter,
+baik render baru maupun dari cache gambar render_paralel (filter yang dipilih ulang).
+Ringkasan kubus ditambah render SVG dibandingkan dengan anggaran ANGGARAN_MS per
+interaksi filter. Ringkasan kubus diperiksa identik dengan menilai ulang responden
+yang difilter.
+Jalankan dari root repo: python -m benchmarks.bench_kubus 200000
+"""
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.data_sintetis import buat_data_sintetis
+from demografi import hitung_distribusi_demografi, normalisasi_jenis_kelamin, pita_umur
+from grafik import gambar_grafik, render_paralel, spesifikasi
+from ingest import bentuk_data, rencana_kolom
+from kubus import bangun_kubus
+from penilaian import AgregatPenilaian, hitung_semua_responden, ringkasan_dari_agregat
+
+
+JUMLAH_FILTER = 50
+
+# Anggaran waktu satu interaksi filter: ringkasan kubus + gauge dan pie SVG (ms)
+ANGGARAN_MS = 100
+
+# Cara lama: filter baris responden lalu hitung ulang ringkasan dari nilai per responden
+def ringkasan_filter_baris(data, df_hasil, kolom_filter, filter_dimensi):
+    cocok = np.ones(len(data), dtype=bool)
+    for kolom, pilihan in filter_dimensi.items():
+        cocok &= kolom_filter[kolom].isin(pilihan).to_numpy()
+    return ringkasan_dari_agregat(AgregatPenilaian().tambah(df_hasil[cocok]),
+                                  hitung_distribusi_demografi(data[cocok]))
+
+# Fungsi untuk membuat kombinasi filter acak (setiap dimensi dipakai dengan peluang 1/2)
+def filter_acak(kubus, rng):
+    filter_dimensi = {}
+    for kolom in kubus.dimensi:
+        if rng.random() < 0.5:
+            jumlah = rng.integers(1, min(3, len(kubus.label[kolom])) + 1)
+            filter_dimensi[kolom] = list(rng.choice(kubus.label[kolom], jumlah, replace=False))
+    return filter_dimensi
+
+def main(argv):
+    jumlah = int(argv[0]) if argv else 200000
+    df = buat_data_sintetis(jumlah)
+    rencana, _ = rencana_kolom(df.columns, df)
+    data = bentuk_data(df.iloc[:, sorted(rencana)], rencana)
+    df_hasil = hitung_semua_responden(data)
+
+    mulai = time.perf_counter()
+    kubus = bangun_kubus(data, df_hasil)
+    waktu_bangun = time.perf_counter() - mulai
+
+    # Nilai kolom yang sudah dinormalisasi sama seperti di kubus, agar cara lama sebanding
+    kolom_filter = {kolom: data[kolom].astype(object).fillna('Tidak Ada Data') for kolom in kubus.dimensi}
+    kolom_filter['JENIS KELAMIN'] = normalisasi_jenis_kelamin(data['JENIS KELAMIN'])
+    kolom_filter['UMUR'] = pita_umur(data['UMUR'])
+
+    rng = np.random.default_rng(0)
+    waktu = {'baris': [], 'kubus': [], 'grafik png': [], 'grafik svg': [], 'grafik svg cache': []}
+    for _ in range(JUMLAH_FILTER):
+        filter_dimensi = filter_acak(kubus, rng)
+        mulai = time.perf_counter()
+        lama = ringkasan_filter_baris(data, df_hasil, kolom_filter, filter_dimensi)
+        waktu['baris'].append(time.perf_counter() - mulai)
+        mulai = time.perf_counter()
+        baru = kubus.ringkasan(filter_dimensi)
+        waktu['kubus'].append(time.perf_counter() - mulai)
+
+        assert (lama['agregat'].jumlah_sen == baru['agregat'].jumlah_sen).all()
+        assert lama['distribusi_kategori'] == baru['distribusi_kategori']
+
+        for format_gambar in ('png', 'svg'):
+            mulai = time.perf_counter()
+            gambar_grafik('index', baru['rata_rata']['NKI'], format_gambar=format_gambar)
+            gambar_grafik('pie_kategori', baru['distribusi_kategori'], format_gambar=format_gambar)
+            waktu[f'grafik {format_gambar}'].append(time.perf_counter() - mulai)
+
+        # Jalur dashboard: render lewat render_paralel, lalu filter yang sama dipilih ulang
+        daftar_spesifikasi = [spesifikasi('index', baru['rata_rata']['NKI']),
+                              spesifikasi('pie_kategori', baru['distribusi_kategori'])]
+        render_paralel(daftar_spesifikasi, jumlah_worker=1, format_gambar="svg")
+        mulai = time.perf_counter()
+        render_paralel(daftar_spesifikasi, jumlah_worker=1, format_gambar="svg")
+        waktu['grafik svg cache'].append(time.perf_counter() - mulai)
+
+    print(f"{jumlah} responden, {len(kubus)} sel kubus, bangun kubus {waktu_bangun:.2f} s, "
+          f"{kubus.nbytes / 1024:.0f} KB")
+    print(f"{'langkah':<30} {'rata-rata (ms)':>15} {'maks (ms)':>10}")
+    for label, kunci in [('ringkasan filter baris (lama)', 'baris'), ('ringkasan kubus', 'kubus'),
+                         ('gauge + pie PNG 200 dpi', 'grafik png'), ('gauge + pie SVG', 'grafik svg'),
+                         ('gauge + pie SVG (cache)', 'grafik svg cache')]:
+        print(f"{label:<30} {np.mean(waktu[kunci]) * 1000:>15.1f} {np.max(waktu[kunci]) * 1000:>10.1f}")
+
+    interaksi = (np.array(waktu['kubus']) + np.array(waktu['grafik svg'])) * 1000
+    print(f"interaksi filter (kubus + SVG baru): rata-rata {interaksi.mean():.1f} ms, maks {interaksi.max():.1f} ms, "
+          f"{(interaksi <= ANGGARAN_MS).mean() * 100:.0f}% dalam anggaran {ANGGARAN_MS} ms")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,112 @@
+"""Laporan memori satu survei yang dimuat: representasi awal vs representasi ringkas.
+
+Representasi awal: data seperti dibaca pandas tanpa ingest (setiap sel teks, termasuk
+setiap jawaban, satu objek str Python) dan df_hasil float64. Representasi ringkas:
+data hasil baca_survei (jawaban dan demografi kategori), df_hasil float32 dan matriks
+skor per pertanyaan int8. Dilaporkan memori setiap komponen (memory_usage deep) dan
+kenaikan RSS proses anak setelah survei dimuat dan dinilai. Pembaca CSV pandas memakai
+satu objek str untuk teks yang sama, sehingga memory_usage deep data awal lebih besar
+dari memori sebenarnya; kenaikan RSS adalah angka yang sebenarnya dan yang dibandingkan
+dengan target pengurangan (TARGET_RASIO_RSS). Pada 100 ribu responden target 10x tidak
+tercapai (sekitar 3,3x): sisa memori ringkas didominasi df_hasil float32, matriks skor
+int8 dan kolom teks ID/nama yang ukurannya tetap per responden.
+Jalankan dari root repo: python -m benchmarks.bench_memori 10000 100000
+"""
+import ctypes
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.data_sintetis import tulis_data_sintetis
+from ingest import baca_survei
+from penilaian import KOLOM_NILAI, hitung_semua_responden, hitung_skor_item, nilai_persis
+
+
+# Target pengurangan kenaikan RSS representasi ringkas dibanding representasi awal
+TARGET_RASIO_RSS = 10
+
+# Fungsi untuk membaca RSS proses ini (MB) setelah memori bebas dikembalikan ke sistem
+def rss_mb():
+    gc.collect()
+    # Buffer Arrow yang sudah bebas disimpan memory pool Arrow, kembalikan juga
+    pa.default_memory_pool().release_unused()
+    try:
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+    with open('/proc/self/status') as f:
+        for baris in f:
+            if baris.startswith('VmRSS:'):
+                return int(baris.split()[1]) / 1024
+    return 0.0
+
+def _mb(jumlah_byte):
+    return jumlah_byte / 2 ** 20
+
+# Fungsi untuk memuat dan menilai survei dengan satu representasi: {komponen: objek}
+def muat(mode, path):
+    if mode == 'awal':
+        data = pd.read_csv(path, dtype=object)
+        df_hasil = hitung_semua_responden(data)
+        df_hasil[KOLOM_NILAI] = nilai_persis(df_hasil[KOLOM_NILAI])
+        return {'data responden': data, 'df_hasil': df_hasil}
+    data = baca_survei(path)
+    skor_item = hitung_skor_item(data)
+    return {'data responden': data, 'df_hasil': hitung_semua_responden(data, skor_item),
+            'matriks skor item': skor_item}
+
+def _ukuran(objek):
+    if isinstance(objek, pd.DataFrame):
+        return int(objek.memory_usage(deep=True).sum())
+    return objek.nbytes
+
+# Fungsi yang dijalankan di proses anak: cetak memori per komponen dan kenaikan RSS.
+# Survei dimuat sekali lebih dulu agar modul, thread pool dan arena alokator yang baru
+# terpakai pertama kali tidak ikut terhitung sebagai memori survei
+def _jalankan_anak(mode, path):
+    pemanasan = muat(mode, path)
+    del pemanasan
+    awal = rss_mb()
+    komponen = muat(mode, path)
+    rss_naik = rss_mb() - awal
+    print(json.dumps({'komponen': {nama: _mb(_ukuran(objek)) for nama, objek in komponen.items()},
+                      'rss_naik': rss_naik}))
+
+# Fungsi untuk menjalankan satu mode di proses baru
+def ukur(mode, path):
+    keluaran = subprocess.run([sys.executable, '-m', 'benchmarks.bench_memori', '--anak', mode, path],
+                              stdout=subprocess.PIPE, text=True, check=True).stdout
+    return json.loads(keluaran.splitlines()[-1])
+
+def main(argv):
+    ukuran = [int(x) for x in argv] or [100000]
+    with tempfile.TemporaryDirectory() as direktori:
+        for jumlah in ukuran:
+            path = tulis_data_sintetis(os.path.join(direktori, f"survei_{jumlah}.csv"), jumlah)
+            awal, ringkas = ukur('awal', path), ukur('ringkas', path)
+
+            print(f"{jumlah} responden")
+            print(f"  {'komponen':<20} {'awal (MB)':>10} {'ringkas (MB)':>13} {'rasio':>8}")
+            baris = [(nama, awal['komponen'].get(nama), ringkas['komponen'].get(nama))
+                     for nama in ringkas['komponen']]
+            baris.append(('total komponen', sum(awal['komponen'].values()), sum(ringkas['komponen'].values())))
+            baris.append(('kenaikan RSS', awal['rss_naik'], ringkas['rss_naik']))
+            for nama, lama, baru in baris:
+                teks_lama = f"{lama:>10.1f}" if lama is not None else f"{'-':>10}"
+                rasio = f"{lama / baru:>7.1f}x" if lama and baru else f"{'-':>8}"
+                print(f"  {nama:<20} {teks_lama} {baru:>13.1f} {rasio}")
+            rasio_rss = awal['rss_naik'] / ringkas['rss_naik']
+            print(f"  target pengurangan RSS {TARGET_RASIO_RSS}x: "
+                  f"{'tercapai' if rasio_rss >= TARGET_RASIO_RSS else 'TIDAK tercapai'} ({rasio_rss:.1f}x)")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--anak']:
+        _jalankan_anak(sys.argv[2], sys.argv[3])
+    else:
+        main(sys.argv[1:])
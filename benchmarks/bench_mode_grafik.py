@@ -0,0 +1,88 @@
+"""Benchmark mode grafik: CPU server per tampilan halaman pada mode server vs mode klien.
+
+Setiap tampilan halaman memakai kombinasi filter demografi acak (seperti bench_kubus),
+sehingga semua grafik halaman harus dibuat ulang tanpa cache. Mode server merender
+gambar matplotlib PNG di proses ini; mode klien hanya menyusun spesifikasi Vega-Lite
+yang dirender di browser. Dilaporkan waktu CPU server dan ukuran data yang dikirim ke
+browser per tampilan. Spesifikasi Vega-Lite diperiksa terhadap skema Vega-Lite Altair
+jika Altair terpasang.
+Jalankan dari root repo: python -m benchmarks.bench_mode_grafik 100000 20
+"""
+import json
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.bench_kubus import filter_acak
+from benchmarks.data_sintetis import buat_data_sintetis
+from grafik import render_paralel, spesifikasi_dashboard
+from grafik_vega import render_vega
+from ingest import bentuk_data, rencana_kolom
+from kubus import bangun_kubus
+from penilaian import hitung_semua_responden
+
+
+# Fungsi untuk memeriksa spesifikasi terhadap skema Vega-Lite (dilewati tanpa Altair)
+def periksa_skema(daftar_spesifikasi):
+    try:
+        from altair.utils.schemapi import validate_jsonschema
+        from altair.vegalite.v6.schema import core
+    except ImportError:
+        return False
+    skema = core.load_schema()
+    for spesifikasi in daftar_spesifikasi:
+        if spesifikasi is not None:
+            validate_jsonschema(json.loads(json.dumps(spesifikasi)), skema)
+    return True
+
+# Fungsi untuk membuat semua grafik satu halaman: (waktu CPU, ukuran data dikirim, hasil)
+def tampilan(mode, daftar_spesifikasi):
+    mulai = time.process_time()
+    if mode == 'server':
+        hasil = render_paralel(daftar_spesifikasi, jumlah_worker=1, pakai_cache=False)
+        ukuran = sum(len(gambar) for gambar in hasil if isinstance(gambar, bytes))
+    else:
+        hasil = render_vega(daftar_spesifikasi, pakai_cache=False)
+        ukuran = sum(len(json.dumps(spesifikasi)) for spesifikasi in hasil if isinstance(spesifikasi, dict))
+    waktu = time.process_time() - mulai
+    gagal = [h for h in hasil if isinstance(h, Exception)]
+    if gagal:
+        raise gagal[0]
+    return waktu, ukuran, hasil
+
+def main(argv):
+    jumlah = int(argv[0]) if argv else 100000
+    jumlah_tampilan = int(argv[1]) if len(argv) > 1 else 20
+    df = buat_data_sintetis(jumlah)
+    rencana, _ = rencana_kolom(df.columns, df)
+    data = bentuk_data(df.iloc[:, sorted(rencana)], rencana)
+    kubus = bangun_kubus(data, hitung_semua_responden(data))
+
+    rng = np.random.default_rng(0)
+    waktu = {'server': [], 'klien': []}
+    ukuran = {'server': [], 'klien': []}
+    terperiksa = False
+    for _ in range(jumlah_tampilan):
+        hasil_filter = kubus.ringkasan(filter_acak(kubus, rng))
+        if hasil_filter['jumlah_responden'] == 0:
+            continue
+        daftar_spesifikasi = list(spesifikasi_dashboard(hasil_filter).values())
+        for mode in ('server', 'klien'):
+            waktu_cpu, jumlah_byte, hasil = tampilan(mode, daftar_spesifikasi)
+            waktu[mode].append(waktu_cpu)
+            ukuran[mode].append(jumlah_byte)
+            if mode == 'klien' and not terperiksa:
+                terperiksa = periksa_skema(hasil)
+
+    print(f"{jumlah} responden, {len(waktu['server'])} tampilan halaman, "
+          f"{len(daftar_spesifikasi)} grafik per halaman, skema Vega-Lite "
+          f"{'valid' if terperiksa else 'tidak diperiksa (Altair tidak terpasang)'}")
+    print(f"{'mode':<8} {'CPU/tampilan (ms)':>18} {'maks (ms)':>10} {'dikirim/tampilan (KB)':>22}")
+    for mode in ('server', 'klien'):
+        print(f"{mode:<8} {np.mean(waktu[mode]) * 1000:>18.1f} {np.max(waktu[mode]) * 1000:>10.1f} "
+              f"{np.mean(ukuran[mode]) / 1024:>22.1f}")
+    print(f"CPU server mode klien {np.mean(waktu['server']) / np.mean(waktu['klien']):.0f}x lebih kecil")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,42 @@
+"""Benchmark penilaian: loop per baris versi awal vs mesin vektorisasi.
+
+Pembanding loop per baris adalah hitung_nilai_responden versi awal (penilaian_awal),
+yang membuat ulang tabel skor dan membaca setiap jawaban lewat df.iloc per responden.
+Jalankan dari root repo: python -m benchmarks.bench_penilaian 1000 10000 50000
+"""
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.data_sintetis import buat_data_sintetis
+from benchmarks.penilaian_awal import hitung_nilai_responden
+from penilaian import KOLOM_NILAI, hitung_semua_responden, nilai_persis
+
+
+# Fungsi penilaian lama: satu panggilan hitung_nilai_responden versi awal per baris
+def hitung_per_baris(df):
+    df_hasil = pd.DataFrame([hitung_nilai_responden(df, i) for i in range(len(df))])
+    df_hasil.insert(0, 'Responden_ID', df.iloc[:, 0])
+    return df_hasil
+
+def ukur(fungsi, df):
+    mulai = time.perf_counter()
+    hasil = fungsi(df)
+    return hasil, time.perf_counter() - mulai
+
+def main(argv):
+    ukuran = [int(x) for x in argv] or [1000, 10000, 50000]
+    print(f"{'baris':>8} {'loop (baris/s)':>16} {'vektor (baris/s)':>18} {'percepatan':>11}")
+    for jumlah in ukuran:
+        df = buat_data_sintetis(jumlah)
+        hasil_lama, waktu_lama = ukur(hitung_per_baris, df)
+        hasil_baru, waktu_baru = ukur(hitung_semua_responden, df)
+        # Nilai float32 dipulihkan ke float64 dulu sebelum dibandingkan persis
+        hasil_persis = hasil_baru.assign(**{kolom: nilai_persis(hasil_baru[kolom]) for kolom in KOLOM_NILAI})
+        pd.testing.assert_frame_equal(hasil_lama, hasil_persis, check_exact=True)
+        print(f"{jumlah:>8} {jumlah / waktu_lama:>16,.0f} {jumlah / waktu_baru:>18,.0f} "
+              f"{waktu_lama / waktu_baru:>10.1f}x")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,35 @@
+"""Benchmark latensi render seluruh grafik satu halaman dengan 1, 2, 4 dan 8 worker.
+
+Cache gambar tidak dipakai agar setiap putaran benar-benar merender ulang.
+Jalankan dari root repo: python -m benchmarks.bench_render [jumlah_putaran]
+"""
+import sys
+import time
+
+from benchmarks.data_sintetis import buat_data_sintetis
+from grafik import render_paralel, spesifikasi_dashboard
+from penilaian import rangkum_penilaian
+
+
+def main(argv):
+    putaran = int(argv[0]) if argv else 3
+    hasil = rangkum_penilaian(buat_data_sintetis(1000))
+    daftar_spesifikasi = list(spesifikasi_dashboard(hasil).values())
+
+    print(f"{len(daftar_spesifikasi)} grafik per halaman, {putaran} putaran")
+    print(f"{'worker':>6} {'latensi halaman (s)':>20}")
+    for jumlah_worker in (1, 2, 4, 8):
+        # Putaran pertama memanaskan pool (start proses dan import matplotlib)
+        render_paralel(daftar_spesifikasi, jumlah_worker=jumlah_worker, pakai_cache=False)
+        waktu = []
+        for _ in range(putaran):
+            mulai = time.perf_counter()
+            gambar = render_paralel(daftar_spesifikasi, jumlah_worker=jumlah_worker, pakai_cache=False)
+            waktu.append(time.perf_counter() - mulai)
+            gagal = [g for g in gambar if isinstance(g, Exception)]
+            if gagal:
+                raise gagal[0]
+        print(f"{jumlah_worker:>6} {min(waktu):>20.3f}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
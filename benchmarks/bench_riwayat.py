@@ -0,0 +1,98 @@
+"""Benchmark tren per gelombang: membaca dan menilai ulang file lama vs tabel agregat riwayat.
+
+Sejumlah gelombang data sintetis ditulis sebagai file survei lalu disimpan ke riwayat
+SQLite (agregat per kombinasi demografi). Tren NKI per gelombang untuk seluruh data,
+filter instansi acak dan seri per instansi dihitung dengan dua cara: membaca dan menilai
+ulang file setiap gelombang (cara tanpa riwayat) dan query tabel agregat riwayat. Rata-rata
+dari riwayat diperiksa identik dengan AgregatPenilaian atas responden yang sama.
+Jalankan dari root repo: python -m benchmarks.bench_riwayat 50000 6 csv
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+import numpy as np
+
+from benchmarks.data_sintetis import tulis_data_sintetis
+from ingest import baca_survei
+from kubus import bangun_kubus
+from penilaian import AgregatPenilaian, hitung_semua_responden
+from riwayat import RiwayatPenilaian
+
+
+JUMLAH_QUERY = 20
+
+# Cara tanpa riwayat: baca dan nilai ulang file setiap gelombang, lalu agregasi responden
+# instansi terpilih. Hasilnya {gelombang: (jumlah responden, rata-rata NKI)}
+def tren_dari_file(daftar_file, instansi=None):
+    tren = {}
+    for gelombang, path in daftar_file.items():
+        df = baca_survei(path, os.path.basename(path))
+        df_hasil = hitung_semua_responden(df)
+        if instansi:
+            df_hasil = df_hasil[df['INSTANSI'].isin(instansi).to_numpy()]
+        agregat = AgregatPenilaian().tambah(df_hasil)
+        tren[gelombang] = (agregat.jumlah_responden, agregat.rata_rata()['NKI'])
+    return tren
+
+def ukur(fungsi, ulang):
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        waktu.append(time.perf_counter() - mulai)
+    return np.array(waktu), hasil
+
+def main(argv):
+    jumlah = int(argv[0]) if argv else 50000
+    jumlah_gelombang = int(argv[1]) if len(argv) > 1 else 6
+    format_input = argv[2] if len(argv) > 2 else 'csv'
+
+    with tempfile.TemporaryDirectory() as direktori:
+        riwayat = RiwayatPenilaian(os.path.join(direktori, 'riwayat.sqlite'))
+        daftar_file = {}
+        waktu_simpan = []
+        for i in range(jumlah_gelombang):
+            gelombang = f"{2020 + i // 2}-S{i % 2 + 1}"
+            path = os.path.join(direktori, f"gelombang_{i}.{format_input}")
+            tulis_data_sintetis(path, jumlah, seed=i)
+            daftar_file[gelombang] = path
+
+            df = baca_survei(path, os.path.basename(path))
+            kubus = bangun_kubus(df, hitung_semua_responden(df))
+            mulai = time.perf_counter()
+            riwayat.simpan(gelombang, kubus, f"gelombang-{i}", os.path.basename(path),
+                           date(2020 + i // 2, 1 + 6 * (i % 2), 1))
+            waktu_simpan.append(time.perf_counter() - mulai)
+        ukuran = os.path.getsize(os.path.join(direktori, 'riwayat.sqlite'))
+
+        # Tren dari riwayat harus sama persis dengan menilai ulang file (pilihan instansi acak)
+        rng = np.random.default_rng(0)
+        semua_instansi = riwayat.label('instansi')
+        daftar_pilihan = [list(rng.choice(semua_instansi, rng.integers(1, 4), replace=False))
+                          for _ in range(JUMLAH_QUERY)]
+        waktu_file, dari_file = ukur(lambda: tren_dari_file(daftar_file, daftar_pilihan[0]), 1)
+        tren = riwayat.tren({'instansi': daftar_pilihan[0]}).set_index('gelombang')
+        for gelombang, (jumlah_responden, nki) in dari_file.items():
+            assert tren.loc[gelombang, 'jumlah_responden'] == jumlah_responden
+            assert tren.loc[gelombang, 'NKI'] == nki, gelombang
+
+        waktu = {
+            'semua responden': ukur(lambda: riwayat.tren(), JUMLAH_QUERY)[0],
+            'filter instansi': np.array([ukur(lambda: riwayat.tren({'instansi': pilihan}), 1)[0][0]
+                                         for pilihan in daftar_pilihan]),
+            'seri per instansi': ukur(lambda: riwayat.tren(per='instansi'), JUMLAH_QUERY)[0],
+        }
+
+    print(f"{jumlah_gelombang} gelombang x {jumlah} responden ({format_input}), riwayat {ukuran / 1024:.0f} KB, "
+          f"simpan rata-rata {np.mean(waktu_simpan) * 1000:.0f} ms/gelombang, tren identik dengan menilai ulang file")
+    print(f"{'tren NKI':<40} {'rata-rata (ms)':>15} {'maks (ms)':>10}")
+    print(f"{'baca + nilai ulang file (tanpa riwayat)':<40} {waktu_file.mean() * 1000:>15.1f} "
+          f"{waktu_file.max() * 1000:>10.1f}")
+    for label, detik in waktu.items():
+        print(f"{'riwayat: ' + label:<40} {detik.mean() * 1000:>15.1f} {detik.max() * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
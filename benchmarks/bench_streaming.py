@@ -0,0 +1,71 @@
+"""Benchmark penilaian per bagian (streaming) vs memuat seluruh file.
+
+Setiap pengukuran dijalankan di proses terpisah untuk membaca peak RSS.
+Jalankan dari root repo: python -m benchmarks.bench_streaming 20000 100000
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.bench_ingest import peak_rss_mb
+from benchmarks.data_sintetis import buat_data_sintetis
+from ingest import baca_survei
+from penilaian import rangkum_penilaian
+from streaming import rangkum_penilaian_bertahap
+
+
+# Fungsi yang dijalankan di proses anak: nilai file lalu cetak waktu dan memori
+def _jalankan_anak(mode, path, ukuran_chunk):
+    awal = peak_rss_mb()
+    mulai = time.perf_counter()
+    if mode == 'penuh':
+        rangkum_penilaian(baca_survei(path))
+    else:
+        rangkum_penilaian_bertahap(path, ukuran_chunk=int(ukuran_chunk))
+    print(f"{time.perf_counter() - mulai:.6f} {peak_rss_mb() - awal:.1f}")
+
+def ukur(mode, path, ukuran_chunk):
+    keluaran = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_streaming', '--anak', mode, path, str(ukuran_chunk)],
+        stdout=subprocess.PIPE, text=True, check=True).stdout
+    waktu, selisih = keluaran.split()
+    return float(waktu), float(selisih)
+
+# Fungsi untuk memastikan ringkasan streaming identik dengan ringkasan penuh
+def periksa_identik(path, ukuran_chunk):
+    penuh = rangkum_penilaian(baca_survei(path))
+    bertahap = rangkum_penilaian_bertahap(path, ukuran_chunk=ukuran_chunk)
+    pd.testing.assert_series_equal(penuh['rata_rata'], bertahap['rata_rata'], check_exact=True)
+    assert penuh['distribusi_kategori'] == bertahap['distribusi_kategori']
+    assert penuh['jumlah_responden'] == bertahap['jumlah_responden']
+    for kolom, distribusi in penuh['demografi'].items():
+        pd.testing.assert_series_equal(distribusi, bertahap['demografi'][kolom], check_exact=True)
+
+def main(argv):
+    ukuran = [int(x) for x in argv] or [20000, 100000]
+    ukuran_chunk = 10000
+    print(f"{'baris':>8} {'format':<8} {'mode':<10} {'waktu (s)':>10} {'naik RSS (MB)':>14}")
+    with tempfile.TemporaryDirectory() as direktori:
+        for jumlah in ukuran:
+            df = buat_data_sintetis(jumlah)
+            path = {'csv': os.path.join(direktori, f"survei_{jumlah}.csv"),
+                    'parquet': os.path.join(direktori, f"survei_{jumlah}.parquet")}
+            df.to_csv(path['csv'], index=False)
+            df.to_parquet(path['parquet'], index=False, row_group_size=ukuran_chunk)
+            del df
+
+            for format_file, file in path.items():
+                periksa_identik(file, ukuran_chunk)
+                for mode in ('penuh', 'bertahap'):
+                    waktu, selisih = ukur(mode, file, ukuran_chunk)
+                    print(f"{jumlah:>8} {format_file:<8} {mode:<10} {waktu:>10.2f} {selisih:>14.0f}")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--anak']:
+        _jalankan_anak(*sys.argv[2:5])
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,73 @@
+"""Benchmark tabel responden: iterrows + list of dict vs tabel Arrow per kolom.
+
+Mengukur waktu membangun tabel, waktu mengambil satu halaman (filter + urut)
+dan ukuran data yang dikirim ke browser (Arrow IPC, format yang dipakai
+st.dataframe): seluruh tabel vs satu halaman.
+
+Jalankan dari root repo: python -m benchmarks.bench_tabel 10000 100000
+"""
+import sys
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.data_sintetis import buat_data_sintetis
+from ingest import bentuk_data, rencana_kolom
+from penilaian import hitung_semua_responden, tentukan_kategori
+from tabel_responden import KOLOM_NKI, bangun_tabel_responden, halaman_tabel
+
+
+UKURAN_HALAMAN = 50
+
+# Cara lama: satu dict per responden dari data.iterrows()
+def tabel_lama(data, hasil):
+    list_responden = []
+    for i, row in data.iterrows():
+        list_responden.append({
+            "No.": i + 1,
+            "Nama Responden": row['NAMA'],
+            "Asal Instansi": row['INSTANSI'],
+            "Nilai Kesadaran Keamanan Siber Individu (NKI)": hasil['NKI'][i],
+            "Kategori NKI": tentukan_kategori(hasil['NKI'][i])
+        })
+    return pd.DataFrame(list_responden)
+
+# Ukuran data Arrow IPC dari sebuah DataFrame (KB)
+def ukuran_kirim_kb(df):
+    tabel = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, tabel.schema) as writer:
+        writer.write_table(tabel)
+    return sink.getvalue().size / 1024
+
+def ukur(fungsi):
+    mulai = time.perf_counter()
+    hasil = fungsi()
+    return hasil, time.perf_counter() - mulai
+
+def main(argv):
+    ukuran = [int(x) for x in argv] or [10000, 100000]
+    print(f"{'baris':>8} {'bangun lama (s)':>16} {'bangun arrow (s)':>17} {'halaman (ms)':>13} "
+          f"{'kirim lama (KB)':>16} {'kirim halaman (KB)':>19}")
+    for jumlah in ukuran:
+        df = buat_data_sintetis(jumlah)
+        rencana, _ = rencana_kolom(df.columns, df)
+        data = bentuk_data(df.iloc[:, sorted(rencana)], rencana)
+        df_hasil = hitung_semua_responden(data)
+
+        lama, waktu_lama = ukur(lambda: tabel_lama(data, df_hasil))
+        tabel, waktu_baru = ukur(lambda: bangun_tabel_responden(data, df_hasil))
+
+        # Isi tabel harus sama dengan cara lama
+        baru = tabel.to_pandas()
+        for kolom in lama.columns:
+            assert lama[kolom].astype(str).tolist() == baru[kolom].astype(str).tolist(), kolom
+
+        (halaman, _), waktu_halaman = ukur(lambda: halaman_tabel(
+            tabel, 3, UKURAN_HALAMAN, KOLOM_NKI, True, "dinas", ["Baik", "Kurang Baik"]))
+        print(f"{jumlah:>8} {waktu_lama:>16.3f} {waktu_baru:>17.4f} {waktu_halaman * 1000:>13.1f} "
+              f"{ukuran_kirim_kb(lama):>16,.0f} {ukuran_kirim_kb(halaman):>19,.1f}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,89 @@
+"""Benchmark tampilan dashboard: semua tab dijalankan (cara lama) vs hanya tampilan aktif.
+
+Dengan st.tabs isi kedua tab (ringkasan, kubus filter, tabel responden, semua grafik)
+dijalankan pada setiap rerun walaupun pengguna hanya melihat satu tab. Dengan navigasi
+tampilan hanya tampilan yang dipilih yang dihitung dan dirender. Untuk setiap tampilan
+diukur latensi rerun dengan cache kosong (data baru, semua hasil antara dihitung) dan
+rerun berikutnya (hasil antara diambil dari cache), dijalankan lewat AppTest Streamlit.
+Jalankan dari root repo: python -m benchmarks.bench_tampilan 100000
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.data_sintetis import buat_data_sintetis
+from grafik import ambil_cache_render
+from ingest import bentuk_data, rencana_kolom
+
+
+AKAR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JUMLAH_RERUN = 3
+BATAS_WAKTU = 600
+
+# Cara lama: isi semua tampilan dijalankan di dalam st.tabs pada setiap rerun
+SKRIP_SEMUA_TAB = f"""
+import sys
+sys.path.insert(0, {AKAR!r})
+import streamlit as st
+import app
+cache = app.ambil_cache()
+data = app.data_dasbor(cache)
+for tab, tampilan in zip(st.tabs(list(app.TAMPILAN)), app.TAMPILAN.values()):
+    with tab:
+        tampilan(cache, data)
+"""
+
+# Fungsi untuk membuat AppTest satu mode dengan data responden sudah ada di session
+def buat_app(mode, data, tampilan):
+    if mode == 'semua tab':
+        at = AppTest.from_string(SKRIP_SEMUA_TAB, default_timeout=BATAS_WAKTU)
+    else:
+        at = AppTest.from_file(os.path.join(AKAR, 'app.py'), default_timeout=BATAS_WAKTU)
+    at.session_state['df'] = data
+    at.session_state['kunci'] = 'bench-tampilan'
+    at.session_state['file_name'] = 'bench'
+    at.session_state['tampilan'] = tampilan
+    return at
+
+def ukur_run(at):
+    mulai = time.perf_counter()
+    at.run()
+    waktu = time.perf_counter() - mulai
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return waktu
+
+# Fungsi untuk mengukur satu tampilan: (latensi cache kosong, rata-rata latensi rerun)
+def ukur_tampilan(mode, data, tampilan):
+    # Kosongkan cache hasil (st.cache_resource) dan cache grafik agar semua dihitung ulang
+    st.cache_resource.clear()
+    ambil_cache_render().kosongkan()
+    at = buat_app(mode, data, tampilan)
+    dingin = ukur_run(at)
+    return dingin, np.mean([ukur_run(at) for _ in range(JUMLAH_RERUN)])
+
+def main(argv):
+    # Mengimpor app menjalankan st.set_page_config, jadi baru diimpor saat benchmark dijalankan
+    import app
+
+    jumlah = int(argv[0]) if argv else 100000
+    df = buat_data_sintetis(jumlah)
+    rencana, _ = rencana_kolom(df.columns, df)
+    data = bentuk_data(df.iloc[:, sorted(rencana)], rencana)
+
+    # Pemanasan: impor modul dan pool render pertama kali tidak ikut terukur
+    ukur_tampilan('navigasi', data.head(1000), list(app.TAMPILAN)[0])
+
+    print(f"{jumlah} responden, latensi rerun (detik)")
+    print(f"{'tampilan':<20} {'mode':<10} {'cache kosong':>13} {'rerun':>8}")
+    for tampilan in app.TAMPILAN:
+        for mode in ('semua tab', 'navigasi'):
+            dingin, rerun = ukur_tampilan(mode, data, tampilan)
+            print(f"{tampilan:<20} {mode:<10} {dingin:>13.2f} {rerun:>8.2f}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,139 @@
+"""Pembuat data survei sintetis dengan tata letak kolom file Excel asli.
+
+Header kolom jawaban dan kolom sisipan di antara jawaban (isian keterangan yang boleh
+kosong) sengaja dibuat umum ("Pertanyaan N") sehingga tidak dikenali buku aturan; kolom
+jawaban ditemukan lewat isi jawaban seperti pada file ekspor asli yang headernya berupa
+teks pertanyaan formulir.
+Jawaban diambil dari teks opsi yang valid di buku aturan, identitas responden dibuat
+dari daftar nama, instansi, provinsi dsb. yang wajar, dan sebagian jawaban bisa dibuat
+rusak (kosong, teks lain, huruf besar/spasi berlebih) sesuai rasio_rusak.
+
+Bisa juga dijalankan untuk menulis file:
+    python -m benchmarks.data_sintetis 10000 -o data_uji.xlsx --rusak 0.05 --seed 1
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from penilaian import BUKU_ATURAN, KOLOM_JAWABAN
+
+
+KOLOM_DEMOGRAFI = ['Timestamp', 'NAMA', 'INSTANSI', 'JENIS KELAMIN', 'UMUR',
+                   'TINGKAT PENDIDIKAN', 'PROVINSI', 'EMAIL', 'NO. HP']
+
+NAMA_DEPAN = ['Budi', 'Siti', 'Agus', 'Dewi', 'Rizky', 'Putri', 'Andi', 'Nur', 'Dian', 'Eko',
+              'Fitri', 'Hendra', 'Indah', 'Joko', 'Kartika', 'Lestari', 'Muhammad', 'Nanda',
+              'Oktaviani', 'Pratama', 'Rina', 'Sri', 'Taufik', 'Wahyu', 'Yulia', 'Ahmad',
+              'Bayu', 'Citra', 'Dimas', 'Fajar']
+NAMA_BELAKANG = ['Santoso', 'Wijaya', 'Saputra', 'Lestari', 'Hidayat', 'Kurniawan', 'Rahmawati',
+                 'Setiawan', 'Nugroho', 'Siregar', 'Simanjuntak', 'Harahap', 'Pratiwi', 'Susanto',
+                 'Wibowo', 'Gunawan', 'Halim', 'Permana', 'Utami', 'Sembiring', 'Nasution',
+                 'Putra', 'Anggraini', 'Firmansyah', 'Ramadhan']
+
+INSTANSI = ['Dinas Komunikasi dan Informatika', 'Badan Siber dan Sandi Negara', 'Dinas Pendidikan',
+            'Dinas Kesehatan', 'Badan Perencanaan Pembangunan Daerah', 'Badan Pusat Statistik',
+            'Dinas Kependudukan dan Pencatatan Sipil', 'Badan Kepegawaian Daerah',
+            'Badan Pengelolaan Keuangan dan Aset Daerah', 'Dinas Perhubungan', 'Sekretariat Daerah',
+            'Inspektorat Daerah', 'Dinas Sosial', 'Dinas Pekerjaan Umum dan Penataan Ruang',
+            'Rumah Sakit Umum Daerah', 'Dinas Penanaman Modal dan PTSP', 'Badan Pendapatan Daerah',
+            'Dinas Lingkungan Hidup', 'Dinas Pariwisata', 'Satuan Polisi Pamong Praja']
+
+PROVINSI = ['Aceh', 'Sumatera Utara', 'Sumatera Barat', 'Riau', 'Jambi', 'Sumatera Selatan', 'Bengkulu',
+            'Lampung', 'Kepulauan Bangka Belitung', 'Kepulauan Riau', 'DKI Jakarta', 'Jawa Barat',
+            'Jawa Tengah', 'DI Yogyakarta', 'Jawa Timur', 'Banten', 'Bali', 'Nusa Tenggara Barat',
+            'Nusa Tenggara Timur', 'Kalimantan Barat', 'Kalimantan Tengah', 'Kalimantan Selatan',
+            'Kalimantan Timur', 'Kalimantan Utara', 'Sulawesi Utara', 'Sulawesi Tengah',
+            'Sulawesi Selatan', 'Sulawesi Tenggara', 'Gorontalo', 'Sulawesi Barat', 'Maluku',
+            'Maluku Utara', 'Papua', 'Papua Barat', 'Papua Selatan', 'Papua Tengah',
+            'Papua Pegunungan', 'Papua Barat Daya']
+
+# Nilai dan bobot peluang setiap kolom demografi (penulisan tidak seragam seperti di data asli)
+JENIS_KELAMIN = {'Laki-Laki': 0.44, 'Perempuan': 0.44, 'L': 0.04, 'P': 0.04, 'Pria': 0.02, 'Wanita': 0.02}
+UMUR = {'< 20 tahun': 0.05, '20 - 30 tahun': 0.35, '31 - 40 tahun': 0.35, '> 40 tahun': 0.25}
+TINGKAT_PENDIDIKAN = {'SMA/SMK': 0.15, 'D3': 0.15, 'D4': 0.05, 'S1': 0.45, 'S2': 0.17, 'S3': 0.03}
+
+# Jenis jawaban rusak: kosong, teks di luar opsi, atau opsi valid dengan penulisan berbeda
+JAWABAN_LAIN = ['Lainnya', 'Tidak tahu', '-', 'tidak ada']
+
+
+# Peluang berbobot Zipf (beberapa nilai jauh lebih sering muncul, seperti instansi/provinsi asli)
+def _bobot_zipf(jumlah, s=1.1):
+    bobot = 1 / np.arange(1, jumlah + 1) ** s
+    return bobot / bobot.sum()
+
+def _pilih(rng, pilihan, jumlah, bobot=None):
+    return np.asarray(pilihan, dtype=object)[rng.choice(len(pilihan), jumlah, p=bobot)]
+
+# Fungsi untuk membuat kolom jawaban satu pertanyaan: opsi valid, sebagian dibuat rusak
+def _kolom_jawaban(rng, opsi, jumlah, rasio_rusak):
+    jawaban = _pilih(rng, opsi, jumlah)
+    if rasio_rusak <= 0:
+        return jawaban
+    rusak = np.flatnonzero(rng.random(jumlah) < rasio_rusak)
+    jenis = rng.integers(0, 4, len(rusak))
+    jawaban[rusak[jenis == 0]] = None
+    jawaban[rusak[jenis == 1]] = _pilih(rng, JAWABAN_LAIN, int((jenis == 1).sum()))
+    jawaban[rusak[jenis == 2]] = [teks.upper() for teks in jawaban[rusak[jenis == 2]]]
+    jawaban[rusak[jenis == 3]] = [teks + '  ' for teks in jawaban[rusak[jenis == 3]]]
+    return jawaban
+
+# Fungsi untuk membuat data responden sintetis dengan tata letak kolom file Excel.
+# rasio_rusak = peluang setiap jawaban dibuat rusak
+def buat_data_sintetis(jumlah, seed=0, rasio_rusak=0.05):
+    rng = np.random.default_rng(seed)
+    jumlah_kolom = KOLOM_JAWABAN[-1] + 1
+    data = dict.fromkeys(KOLOM_DEMOGRAFI)
+    for posisi in range(len(KOLOM_DEMOGRAFI), jumlah_kolom):
+        data[f'Pertanyaan {posisi - len(KOLOM_DEMOGRAFI) + 1}'] = None
+
+    depan = rng.integers(0, len(NAMA_DEPAN), jumlah)
+    belakang = rng.integers(0, len(NAMA_BELAKANG), jumlah)
+    nama = pd.Series(np.asarray(NAMA_DEPAN, dtype=object)[depan]) + ' ' + \
+        pd.Series(np.asarray(NAMA_BELAKANG, dtype=object)[belakang])
+    nomor = pd.Series(np.arange(1, jumlah + 1)).astype(str)
+
+    data['Timestamp'] = pd.Timestamp('2025-01-01') + pd.to_timedelta(np.arange(jumlah), unit='s')
+    data['NAMA'] = nama.to_numpy()
+    data['INSTANSI'] = _pilih(rng, INSTANSI, jumlah, _bobot_zipf(len(INSTANSI)))
+    data['JENIS KELAMIN'] = _pilih(rng, list(JENIS_KELAMIN), jumlah, list(JENIS_KELAMIN.values()))
+    data['UMUR'] = _pilih(rng, list(UMUR), jumlah, list(UMUR.values()))
+    data['TINGKAT PENDIDIKAN'] = _pilih(rng, list(TINGKAT_PENDIDIKAN), jumlah, list(TINGKAT_PENDIDIKAN.values()))
+    data['PROVINSI'] = _pilih(rng, PROVINSI, jumlah, _bobot_zipf(len(PROVINSI), 0.8))
+    data['EMAIL'] = (nama.str.lower().str.replace(' ', '.', regex=False) + nomor + '@contoh.go.id').to_numpy()
+    data['NO. HP'] = ('08' + pd.Series(rng.integers(10 ** 9, 10 ** 10, jumlah)).astype(str)).to_numpy()
+
+    nama_kolom = list(data)
+    for posisi, opsi in zip(BUKU_ATURAN.kolom, BUKU_ATURAN.opsi):
+        data[nama_kolom[posisi]] = _kolom_jawaban(rng, opsi, jumlah, rasio_rusak)
+
+    return pd.DataFrame(data)
+
+# Fungsi untuk menulis data sintetis ke file (.xlsx, .csv atau .parquet sesuai ekstensi)
+def tulis_data_sintetis(path, jumlah, seed=0, rasio_rusak=0.05):
+    df = buat_data_sintetis(jumlah, seed, rasio_rusak)
+    if path.endswith('.xlsx'):
+        with pd.ExcelWriter(path, engine='xlsxwriter',
+                            engine_kwargs={'options': {'constant_memory': True}}) as writer:
+            df.to_excel(writer, index=False)
+    elif path.endswith('.csv'):
+        df.to_csv(path, index=False)
+    elif path.endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Format file '{path}' tidak didukung, gunakan .xlsx, .csv atau .parquet")
+    return path
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.data_sintetis",
+                                     description="Tulis file survei sintetis.")
+    parser.add_argument('jumlah', type=int, help="jumlah responden")
+    parser.add_argument('-o', '--keluaran', default='data_sintetis.xlsx', help="file keluaran (.xlsx/.csv/.parquet)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--rusak', type=float, default=0.05, help="rasio jawaban rusak (0-1)")
+    args = parser.parse_args(argv)
+    print(tulis_data_sintetis(args.keluaran, args.jumlah, args.seed, args.rusak))
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
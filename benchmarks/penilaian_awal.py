@@ -0,0 +1,334 @@
+"""Penilaian per baris seperti aslinya, sebelum ada mesin vektorisasi dan buku aturan.
+
+Salinan apa adanya dari hitung_nilai_responden di app.py versi awal, hanya dipakai
+sebagai pembanding di benchmarks.bench_penilaian.
+"""
+
+
+# Fungsi untuk menghitung nilai responden
+def hitung_nilai_responden(df, row_index) :
+    # [MASUKKAN SEMUA KODE MAPPING DAN PERHITUNGAN DI SINI]
+    # SKTOTAL
+    map_SK1 = {
+        "Saya tidak membacanya": 1,
+        "Saya hanya membaca pada poin penting": 2,
+        "Saya membacanya sekilas": 3,
+        "Saya membacanya dengan teliti": 4
+    }
+    map_SK2 = {
+        "Saya mengizinkannya walaupun tidak memahami risikonya": 1,
+        "Saya tidak mengizinkannya karena tidak memahami risikonya": 2,
+        "Saya tidak mengizinkannya karena ragu terhadap keamanan risikonya": 3,
+        "Saya mengizinkannya dengan memahami risikonya": 4
+    }
+    # KSTOTAL
+    map_KS1 = {
+        "Saya mengabaikannya": 1,
+        "Saya menggunakan salah satu kombinasi": 2,
+        "Saya menggunakan beberapa kombinasi": 3,
+        "Saya menggunakan seluruh kombinasi": 4
+    }
+    map_KS2 = {
+        "Saya membagikan password seluruh akun yang saya miliki": 1,
+        "Saya membagikan password hanya kepada orang yang saya percayai": 2,
+        "Saya membagikannya ketika hanya ada urgensi": 3,
+        "Saya tidak pernah membagikan password akun kepada siapapun": 4
+    }
+    map_KS3 = {
+        "Tidak sama sekali": 1,
+        "Jika saya ingat saja": 2,
+        "Ya, setiap setahun sekali": 3,
+        "Ya, setiap tiga bulan sekali": 4
+    }
+    map_KS4 = {
+        "Saya tidak menyimpan password saya": 1,
+        "Saya tidak menyimpannya pada aplikasi penyimpan password": 2,
+        "Saya menyimpannya pada aplikasi penyimpan password meskipun tidak tepercaya": 3,
+        "Saya menyimpannya pada aplikasi yang tepercaya": 4
+    }
+    map_KS5 = {
+        "Setiap akun digital saya memiliki password yang sama": 1,
+        "Beberapa akun digital saya memiliki password yang sama": 2,
+        "Satu sampai dua akun digital saya memiliki password yang sama": 3,
+        "Setiap akun digital saya memiliki password yang berbeda-beda": 4
+    }
+    map_KS6 = {
+        "Saya tidak mengetahuinya": 1,
+        "Saya tidak mengaktifkannya": 2,
+        "Saya mengaktifkannya jika tidak mengunduh aplikasi tambahan": 3,
+        "Saya mengaktifkannya walaupun harus menggunakan aplikasi tambahan": 4
+    }
+    # IWTOTAL
+    map_IW1 = {
+        "Saya tidak menyadari risikonya": 1,
+        "Saya menyadari risikonya tetapi tetap mengekliknya": 2,
+        "Saya menyadari risikonya dan mengabaikan tautannya": 3,
+        "Saya menyadari risikonya dan mengecek validitas sumbernya": 4
+    }
+    map_IW2 = {
+        "Saya tidak menyadari risikonya sama sekali": 1,
+        "Saya tidak terlalu menyadari risikonya": 2,
+        "Saya menyadari risikonya tetapi saya tidak peduli": 3,
+        "Saya sangat menyadari risikonya dan selalu waspada": 4
+    }
+    map_IW3 = {
+        "Saya sering mengunjungi situs yang mencurigakan": 1,
+        "Saya kadang-kadang mengunjungi situs yang mencurigakan": 2,
+        "Saya jarang mengunjungi situs yang mencurigakan secara tidak sengaja": 3,
+        "Saya tidak pernah mengunjungi situs yang mencurigakan": 4
+    }
+    map_IW4 = {
+        "Saya selalu menggunakan jaringan publik": 1,
+        "Saya sering menggunakan jaringan publik": 2,
+        "Saya kadang-kadang menggunakan jaringan publik": 3,
+        "Saya tidak pernah menggunakan jaringan publik": 4
+    }
+    map_IW5 = {
+        "Saya tidak pernah memastikannya": 1,
+        "Saya kadang-kadang memastikannya": 2,
+        "Saya sering memastikannya": 3,
+        "Saya selalu memastikannya": 4
+    }
+    # KPTOTAL
+    map_KP1 = {
+        "Saya tidak pernah melakukan update software": 1,
+        "Saya jarang melakukan update software": 2,
+        "Saya melakukan update secara berkala terutama saat menerima pemberitahuan": 3,
+        "Saya selalu melakukan update software secara rutin": 4
+    }
+    map_KP2 = {
+        "Saya tidak pernah memasang antivirus pada perangkat digital": 1,
+        "Saya mengandalkan perlindungan bawaan dari sistem operasi": 2,
+        "Saya hanya memasang antivirus pada beberapa perangkat digital saya tergantung kebutuhan dan aktivitas online saya": 3,
+        "Saya selalu memasang antivirus pada semua perangkat digital saya": 4
+    }
+    map_KP3 = {
+        "Saya selalu mengunduh aplikasi dari penyedia yang tidak resmi": 1,
+        "Saya terkadang mengunduh aplikasi dari sumber yang tidak resmi ketika aplikasi tersebut tidak tersedia dari penyedia resmi": 2,
+        "Saya beberapa kali mengunduh aplikasi dari penyedia aplikasi resmi": 3,
+        "Saya hanya mengunduh aplikasi dari penyedia aplikasi resmi seperti Google Play Store atau Apple Store": 4
+    }
+    map_KP4 = {
+        "Saya tidak pernah melakukan update antivirus": 1,
+        "Saya jarang melakukan update antivirus": 2,
+        "Saya melakukan update secara berkala terutama saat menerima pemberitahuan": 3,
+        "Saya selalu melakukan update antivirus secara rutin": 4
+    }
+    map_KP5 = {
+        "Saya tidak mengetahui mengenai pengaturan penonaktifkan posisi geografis": 1,
+        "Saya mengaktifkan posisi geografis perangkat digital": 2,
+        "Saya menonaktifkan posisi geografis perangkat saya dalam situasi tertentu": 3,
+        "Saya selalu menonaktifkan posisi geografis perangkat saya ketika tidak digunakan": 4
+    }
+    map_KP6 = {
+        "Saya tidak pernah melakukan backup data": 1,
+        "Saya jarang melakukan backup data": 2,
+        "Saya melakukan backup data secara berkala terutama saat menerima pemberitahuan": 3,
+        "Saya selalu melakukan backup data secara rutin": 4
+    }
+    # ATTOTAL
+    map_AT1 = {
+        "Saya tidak mengetahui sama sekali pihak berwenang dalam penanganan insiden siber": 1,
+        "Saya hanya mengetahui beberapa pihak berwenang dalam penanganan insiden siber": 2,
+        "Saya mengetahui semua pihak berwenang dalam penanganan insiden siber, namun tidak tahu cara menghubunginya": 3,
+        "Saya mengetahui semua pihak berwenang dalam penanganan insiden siber dan tahu cara menghubunginya": 4
+    }
+    map_AT2 = {
+        "Saya tidak melaporkannya kepada pihak berwenang": 1,
+        "Saya ragu untuk melaporkannya kepada pihak berwenang karena tidak yakin akan ditindak": 2,
+        "Saya menunda melaporkannya kepada pihak berwenang karena mencoba menyelesaikannya sendiri": 3,
+        "Saya langsung melaporkannya kepada pihak berwenang": 4
+    }
+    map_AT3 = {
+        "Saya tidak mengetahui BSSN memiliki layanan aduan siber": 1,
+        "Saya pernah mendengar BSSN memiliki layanan aduan siber": 2,
+        "Saya mengetahui namun tidak paham mekanisme pelaporan layanan aduan siber BSSN": 3,
+        "Saya mengetahui dan paham mekanisme pelaporan layanan aduan siber BSSN": 4
+    }
+    # HTTOTAL
+    map_HT1 = {
+        "Saya tidak tahu pemerintah memiliki aturan tersebut": 1,
+        "Saya pernah mendengar pemerintah memiliki aturan tersebut": 2,
+        "Saya tidak tahu secara detail": 3,
+        "Saya tahu secara detail": 4
+    }
+    map_HT2 = {
+        "Saya pernah melakukannya walaupun tahu jika itu dilarang": 1,
+        "Saya pernah melakukan karena tidak mengetahui jika itu dilarang": 2,
+        "Saya tidak pernah melakukannya namun tidak tahu jika itu dilarang": 3,
+        "Saya tidak pernah melakukan karena saya tahu itu dilarang": 4
+    }
+
+    # RSTOTAL
+    map_RS1 = {
+        "Saya tidak menyadari dan tidak mengetahui adanya penipuan online": 1,
+        "Saya tidak menyadari adanya praktik tersebut namun mengetahui adanya penipuan online": 2,
+        "Saya sadar tapi kurang berhati-hati dalam berinteraksi online": 3,
+        "Saya sadar dan selalu berhati-hati dalam berinteraksi online": 4
+    }
+    map_RS2 = {
+        "Saya selalu berbagi informasi pribadi": 1,
+        "Saya sering berbagi informasi pribadi": 2,
+        "Saya jarang membagikan informasi pribadi": 3,
+        "Saya tidak pernah membagikan informasi pribadi": 4
+    }
+    map_RS3 = {
+        "Saya tidak mengerti dan tidak peduli": 1,
+        "Saya tidak mengerti hal tersebut penting bagi data saya": 2,
+        "Saya mengerti hal tersebut penting tapi tidak tahu manfaatnya": 3,
+        "Saya mengerti hal tersebut penting demi mencegah manipulasi data": 4
+    }
+    map_RS4 = {
+        "Saya tidak pernah melakukan pengecekan": 1,
+        "Saya jarang melakukan pengecekan": 2,
+        "Saya sering melakukan pengecekan": 3,
+        "Saya selalu melakukan pengecekan": 4
+    }
+    map_RS5 = {
+        "Saya tidak minat dengan keamanan siber": 1,
+        "Saya tidak minat namun mengetahui ancamannya": 2,
+        "Saya berupaya namun tidak selalu meningkatkan literasi keamanan siber": 3,
+        "Saya berupaya dan selalu meningkatkan literasi keamanan siber": 4
+    }
+    map_RS6 = {
+        "Saya tidak mengetahui definisinya maupun bentuk praktik rekayasa sosial": 1,
+        "Saya hanya mengetahui definisinya namun tidak mengetahui bentuk praktik rekayasa sosial": 2,
+        "Saya mengetahui bentuk praktik rekayasa sosial hanya pada beberapa media": 3,
+        "Saya mengetahui bentuk praktik rekayasa sosial pada media apapun": 4
+    }
+    # KNTOTAL
+    map_KN1 = {
+        "Saya selalu menyebarkannya": 1,
+        "Saya sering menyebarkannya": 2,
+        "Saya jarang menyebarkannya": 3,
+        "Saya tidak pernah menyebarkannya": 4
+    }
+    map_KN2 = {
+        "Saya langsung percaya dan langsung meneruskannya kebenaran informasi tersebut": 1,
+        "Saya tidak langsung percaya dan tidak memastikan kebenaran informasi tersebut": 2,
+        "Saya tidak langsung percaya dan memastikan kebenaran informasi tersebut": 3,
+        "Saya tidak langsung percaya, memastikannya dan meneruskan kebenaran informasi tersebut": 4
+    }
+    map_KN3 = {
+        "Saya selalu menyebarkannya": 1,
+        "Saya sering menyebarkannya": 2,
+        "Saya jarang menyebarkannya": 3,
+        "Saya tidak pernah menyebarkannya": 4
+    }
+    # AMTOTAL
+    map_AM1 = {
+        "Saya tidak mengetahui mengenai pengaturan privasi pada media sosial": 1,
+        "Saya tidak mengaktifkan pengaturan privasi pada media sosial": 2,
+        "Saya mengaktifkan pengaturan privasi pada media sosial saya dalam situasi tertentu": 3,
+        "Saya selalu mengaktifkan pengaturan privasi pada media sosial saya": 4
+    }
+    map_AM2 = {
+        "Saya selalu membagikannya": 1,
+        "Saya sering membagikannya": 2,
+        "Saya jarang membagikannya": 3,
+        "Saya tidak pernah membagikannya": 4
+    }
+    map_AM3 = {
+        "Saya tidak peduli": 1,
+        "Saya merasa perlu namun belum melakukan sepenuhnya": 2,
+        "Saya sudah melakukannya": 3,
+        "Saya sudah melakukannya dan mengingatkan orang lain untuk bersikap positif": 4
+    }
+    map_AM4 = {
+        "Saya tidak menyadari dampak negatifnya dan berlebihan menggunakan media sosial": 1,
+        "Saya tidak menyadari dampak negatifnya dan banyak menggunakan media sosial": 2,
+        "Saya menyadari dampak negatifnya namun banyak menggunakan media sosial": 3,
+        "Saya menyadari dampak negatifnya dan menggunakan media sosial dengan bijak": 4
+    }
+    map_AM5 = {
+        "Saya merasa tidak perlu melakukannya": 1,
+        "Saya merasa perlu namun belum melakukannya": 2,
+        "Saya sudah melakukannya namun hanya kepada orang yang saya kenal": 3,
+        "Saya sudah melakukannya": 4
+    }
+    # ASTOTAL
+    map_AS1 = {
+        "Saya tidak mengetahui sama sekali pihak berwenang dalam penanganan konten negatif": 1,
+        "Saya hanya mengetahui beberapa pihak berwenang dalam penanganan konten negatif": 2,
+        "Saya mengetahui semua pihak berwenang dalam penanganan konten negatif, namun tidak tahu cara menghubunginya": 3,
+        "Saya mengetahui semua pihak berwenang dalam penanganan konten negatif dan tahu cara menghubunginya": 4
+    }
+    map_AS2 = {
+        "Saya tidak pernah melaporkannya": 1,
+        "Saya jarang melaporkannya": 2,
+        "Saya sering melaporkannya": 3,
+        "Saya selalu melaporkannya": 4
+    }
+    map_AS3 = {
+        "Saya tidak mengetahui BSSN memiliki layanan Lapor Konten": 1,
+        "Saya pernah mendengar BSSN memiliki layanan Lapor Konten": 2,
+        "Saya mengetahui namun tidak paham mekanisme layanan Lapor Konten BSSN": 3,
+        "Saya mengetahui dan paham mekanisme layanan Lapor Konten BSSN": 4
+    }
+    # HSTOTAL
+    map_HS1 = {
+        "Saya tidak tahu pemerintah memiliki aturan tersebut": 1,
+        "Saya pernah mendengar pemerintah memiliki aturan tersebut": 2,
+        "Saya tidak tahu secara detail": 3,
+        "Saya tahu secara detail": 4
+    }
+    map_HS2 = {
+        "Saya tidak peduli dengan hal tersebut": 1,
+        "Saya tidak percaya pihak berwenang akan menegakkan aturan tersebut": 2,
+        "Saya hanya mempercayai sebagian pihak berwenang akan menegakkan aturan tersebut": 3,
+        "Saya percaya seluruh pihak berwenang akan menegakkan aturan tersebut": 4
+    }
+
+    maps = {
+        'SK': [map_SK1, map_SK2],
+        'KS': [map_KS1, map_KS2, map_KS3, map_KS4, map_KS5, map_KS6],
+        'IW': [map_IW1, map_IW2, map_IW3, map_IW4, map_IW5],
+        'KP': [map_KP1, map_KP2, map_KP3, map_KP4, map_KP5, map_KP6],
+        'AT': [map_AT1, map_AT2, map_AT3],
+        'HT': [map_HT1, map_HT2],
+        'RS': [map_RS1, map_RS2, map_RS3, map_RS4, map_RS5, map_RS6],
+        'KN': [map_KN1, map_KN2, map_KN3],
+        'AM': [map_AM1, map_AM2, map_AM3, map_AM4, map_AM5],
+        'AS': [map_AS1, map_AS2, map_AS3],
+        'HS': [map_HS1, map_HS2],
+    }
+
+    # Ambil jawaban dari dataframe
+    jawaban = [df.iloc[row_index, i] for i in
+               [9, 11, 13, 14, 16, 18, 20, 22, 24, 25, 27, 28, 30, 32, 34, 35, 37, 39, 41, 43, 44, 45, 46, 47,
+                49, 50, 51, 52, 53, 55, 57, 58, 59, 61, 62, 63, 64, 65, 67, 68, 69, 70, 71]]
+
+    # Hitung skor untuk setiap kategori
+    sk_scores = {'sk' + str(i + 1): maps['SK'][i].get(jawaban[i], 0) for i in range(2)}
+    ks_scores = {'ks' + str(i + 1): maps['KS'][i].get(jawaban[i + 2], 0) for i in range(6)}
+    iw_scores = {'iw' + str(i + 1): maps['IW'][i].get(jawaban[i + 8], 0) for i in range(5)}
+    kp_scores = {'kp' + str(i + 1): maps['KP'][i].get(jawaban[i + 13], 0) for i in range(6)}
+    at_scores = {'at' + str(i + 1): maps['AT'][i].get(jawaban[i + 19], 0) for i in range(3)}
+    ht_scores = {'ht' + str(i + 1): maps['HT'][i].get(jawaban[i + 22], 0) for i in range(2)}
+    rs_scores = {'rs' + str(i + 1): maps['RS'][i].get(jawaban[i + 24], 0) for i in range(6)}
+    kn_scores = {'kn' + str(i + 1): maps['KN'][i].get(jawaban[i + 30], 0) for i in range(3)}
+    am_scores = {'am' + str(i + 1): maps['AM'][i].get(jawaban[i + 33], 0) for i in range(5)}
+    as_scores = {'as' + str(i + 1): maps['AS'][i].get(jawaban[i + 38], 0) for i in range(3)}
+    hs_scores = {'hs' + str(i + 1): maps['HS'][i].get(jawaban[i + 41], 0) for i in range(2)}
+
+    # Hitung total nilai per indikator
+    hasil = {
+        'SKTOTAL' : round((sum(sk_scores.values()) / 8) * 100, 2),
+        'KSTOTAL' : round((sum(ks_scores.values()) / 24) * 100, 2),
+        'IWTOTAL' : round((sum(iw_scores.values()) / 20) * 100, 2),
+        'KPTOTAL' : round((sum(kp_scores.values()) / 24) * 100, 2),
+        'ATTOTAL' : round((sum(at_scores.values()) / 12) * 100, 2),
+        'HTTOTAL' : round((sum(ht_scores.values()) / 8) * 100, 2),
+        'RSTOTAL' : round((sum(rs_scores.values()) / 24) * 100, 2),
+        'KNTOTAL' : round((sum(kn_scores.values()) / 12) * 100, 2),
+        'AMTOTAL' : round((sum(am_scores.values()) / 20) * 100, 2),
+        'ASTOTAL' : round((sum(as_scores.values()) / 12) * 100, 2),
+        'HSTOTAL' : round((sum(hs_scores.values()) / 8) * 100, 2),
+    }
+
+    # Hitung nilai rata-rata
+    hasil['NKKST'] = round((hasil['SKTOTAL'] + hasil['KSTOTAL'] + hasil['IWTOTAL'] + hasil['KPTOTAL'] + hasil['ATTOTAL'] + hasil['HTTOTAL']) / 6, 2)
+    hasil['NKKSS'] = round((hasil['RSTOTAL'] + hasil['KNTOTAL'] + hasil['AMTOTAL'] + hasil['ASTOTAL'] + hasil['HSTOTAL']) / 5, 2)
+    hasil['NKI'] = round((hasil['NKKST'] + hasil['NKKSS']) / 2, 2)
+
+    return hasil
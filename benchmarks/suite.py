@@ -0,0 +1,186 @@
+"""Suite benchmark seluruh pipeline dashboard dengan data sintetis.
+
+Untuk setiap ukuran data diukur tahap: baca file, penilaian, agregasi, tabel responden,
+ekspor per format dan render semua grafik dashboard (waktu wall, waktu CPU, kenaikan
+peak RSS, jumlah baris). Setiap ukuran dijalankan di proses terpisah; tahap yang tidak
+selesai sebelum --timeout dicatat sebagai "timeout".
+
+Hasil disimpan di benchmarks/hasil/<commit>.json agar bisa dibandingkan antar commit:
+    python -m benchmarks.suite                                  # 1k, 10k, 100k, 1M
+    python -m benchmarks.suite 1000 10000 --format-input csv
+    python -m benchmarks.suite --bandingkan 2f43d2e ea41f74
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import instrumentasi
+import konfigurasi
+from benchmarks.data_sintetis import tulis_data_sintetis
+from ekspor import FORMAT_EKSPOR, buat_ekspor, tabel_ringkasan_ekspor
+
+
+UKURAN_BAWAAN = [1000, 10000, 100000, 1000000]
+DIREKTORI_HASIL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hasil')
+DIREKTORI_DATA = os.path.join(tempfile.gettempdir(), 'dashboard_benchmark')
+
+
+# Fungsi untuk membaca commit git yang sedang dipakai: (hash pendek, ada perubahan belum di-commit)
+def commit_sekarang():
+    akar = os.path.dirname(DIREKTORI_HASIL.rstrip(os.sep))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=akar, check=True,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip()
+        berubah = subprocess.run(['git', 'diff', '--quiet', 'HEAD', '--'], cwd=akar).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return 'tanpa-git', True
+    return commit, berubah
+
+# Fungsi untuk mengambil file data sintetis (dibuat sekali lalu dipakai ulang antar run)
+def file_data(jumlah, format_input, seed, rasio_rusak):
+    os.makedirs(DIREKTORI_DATA, exist_ok=True)
+    path = os.path.join(DIREKTORI_DATA, f"sintetis_{jumlah}_{seed}_{rasio_rusak}.{format_input}")
+    if not os.path.exists(path):
+        sementara = path + '.tmp.' + format_input
+        tulis_data_sintetis(sementara, jumlah, seed, rasio_rusak)
+        os.replace(sementara, path)
+    return path
+
+# Fungsi yang dijalankan di proses anak: jalankan semua tahap untuk satu file data dan
+# cetak satu baris JSON per tahap begitu tahap itu selesai
+def _jalankan_anak(path, daftar_format, batas_xlsx):
+    from demografi import hitung_distribusi_demografi
+    from grafik import render_paralel, spesifikasi_dashboard
+    from ingest import baca_survei
+    from penilaian import AgregatPenilaian, hitung_semua_responden, ringkasan_dari_agregat
+    from tabel_responden import bangun_tabel_responden
+
+    konfigurasi.INSTRUMENTASI = 1
+    konfigurasi.FILE_JEJAK = konfigurasi.FILE_METRIK = None
+    konfigurasi.DIREKTORI_CACHE = None
+
+    def tahap(nama, fungsi):
+        instrumentasi.mulai_rerun()
+        with instrumentasi.ukur_tahap(nama) as t:
+            hasil = fungsi()
+            bentuk = getattr(hasil, 'shape', None)
+            t.baris = int(bentuk[0]) if bentuk else None
+        rekaman = instrumentasi.selesai_rerun()[-1]
+        print(json.dumps({k: rekaman[k] for k in ('tahap', 'wall_ms', 'cpu_ms', 'memori_mb', 'baris')}), flush=True)
+        return hasil
+
+    def agregasi():
+        agregat = AgregatPenilaian().tambah(df_hasil)
+        return ringkasan_dari_agregat(agregat, hitung_distribusi_demografi(data))
+
+    data = tahap('baca_file', lambda: baca_survei(path))
+    df_hasil = tahap('penilaian', lambda: hitung_semua_responden(data))
+    hasil = tahap('agregasi', agregasi)
+    hasil['df_hasil'] = df_hasil
+    tahap('tabel_responden', lambda: bangun_tabel_responden(data, df_hasil))
+    for format_ekspor in daftar_format:
+        if format_ekspor == 'xlsx' and len(data) > batas_xlsx:
+            print(json.dumps({'tahap': 'ekspor_xlsx', 'status': 'dilewati'}), flush=True)
+            continue
+        tahap(f'ekspor_{format_ekspor}',
+              lambda: buat_ekspor(format_ekspor, tabel_ringkasan_ekspor(hasil), data, df_hasil))
+    spesifikasi_halaman = spesifikasi_dashboard(hasil)
+    tahap('grafik', lambda: render_paralel(list(spesifikasi_halaman.values()), jumlah_worker=1,
+                                           pakai_cache=False))
+
+# Fungsi untuk menjalankan semua tahap satu ukuran data di proses baru
+def ukur_ukuran(path, daftar_format, batas_xlsx, timeout):
+    perintah = [sys.executable, '-m', 'benchmarks.suite', '--anak', path, ','.join(daftar_format), str(batas_xlsx)]
+    try:
+        proses = subprocess.run(perintah, stdout=subprocess.PIPE, text=True, timeout=timeout)
+        keluaran, status = proses.stdout, None if proses.returncode == 0 else f"error (kode {proses.returncode})"
+    except subprocess.TimeoutExpired as e:
+        keluaran = e.stdout.decode() if isinstance(e.stdout, bytes) else (e.stdout or '')
+        status = 'timeout'
+    hasil = [json.loads(baris) for baris in keluaran.splitlines() if baris.startswith('{')]
+    for rekaman in hasil:
+        rekaman.setdefault('status', 'ok')
+    if status:
+        hasil.append({'tahap': 'berikutnya', 'status': status})
+    return hasil
+
+# Fungsi untuk menyimpan hasil suite ke benchmarks/hasil/<commit>.json
+def simpan_hasil(hasil, argumen):
+    commit, berubah = commit_sekarang()
+    os.makedirs(DIREKTORI_HASIL, exist_ok=True)
+    nama = commit + ('-berubah' if berubah else '')
+    path = os.path.join(DIREKTORI_HASIL, f"{nama}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'commit': commit,
+            'berubah': berubah,
+            'waktu': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'mesin': {'cpu': os.cpu_count(), 'platform': platform.platform(), 'python': platform.python_version()},
+            'argumen': argumen,
+            'hasil': hasil,
+        }, f, ensure_ascii=False, indent=2)
+    return path
+
+# Fungsi untuk membaca hasil suite satu commit (nama file tanpa .json, atau path)
+def muat_hasil(nama):
+    path = nama if nama.endswith('.json') else os.path.join(DIREKTORI_HASIL, f"{nama}.json")
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+# Fungsi untuk mencetak perbandingan waktu wall dua hasil suite per (ukuran, tahap)
+def bandingkan(nama_a, nama_b):
+    a, b = muat_hasil(nama_a), muat_hasil(nama_b)
+    waktu_a = {(r['jumlah'], r['tahap']): r.get('wall_ms') for r in a['hasil']}
+    print(f"{'baris':>8} {'tahap':<16} {a['commit']:>12} (ms) {b['commit']:>12} (ms) {'rasio':>7}")
+    for r in b['hasil']:
+        lama, baru = waktu_a.get((r['jumlah'], r['tahap'])), r.get('wall_ms')
+        rasio = f"{baru / lama:>6.2f}x" if lama and baru else f"{'-':>7}"
+        print(f"{r['jumlah']:>8} {r['tahap']:<16} {lama if lama is not None else '-':>17} "
+              f"{baru if baru is not None else '-':>17} {rasio}")
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="Benchmark pipeline dashboard dengan data sintetis.")
+    parser.add_argument('ukuran', nargs='*', type=int, help="jumlah responden (default: 1k 10k 100k 1M)")
+    parser.add_argument('--format-input', default='xlsx', choices=['xlsx', 'csv', 'parquet'])
+    parser.add_argument('--ekspor', default=','.join(FORMAT_EKSPOR),
+                        help="format ekspor yang diukur, dipisah koma (default: semua)")
+    parser.add_argument('--batas-xlsx', type=int, default=100000,
+                        help="ekspor xlsx dilewati untuk data lebih besar dari ini (default: 100000)")
+    parser.add_argument('--rusak', type=float, default=0.05, help="rasio jawaban rusak pada data sintetis")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=int, default=1800, help="batas waktu per ukuran data (detik)")
+    parser.add_argument('--bandingkan', nargs=2, metavar=('COMMIT_A', 'COMMIT_B'),
+                        help="bandingkan dua hasil yang tersimpan, tanpa menjalankan benchmark")
+    args = parser.parse_args(argv)
+
+    if args.bandingkan:
+        bandingkan(*args.bandingkan)
+        return
+
+    daftar_format = [f for f in args.ekspor.split(',') if f]
+    hasil = []
+    print(f"{'baris':>8} {'tahap':<16} {'wall (ms)':>11} {'cpu (ms)':>11} {'naik RSS (MB)':>14} {'status':>9}")
+    for jumlah in args.ukuran or UKURAN_BAWAAN:
+        mulai = time.perf_counter()
+        path = file_data(jumlah, args.format_input, args.seed, args.rusak)
+        print(f"{jumlah:>8} {'(siapkan data)':<16} {(time.perf_counter() - mulai) * 1000:>11.0f}")
+        for rekaman in ukur_ukuran(path, daftar_format, args.batas_xlsx, args.timeout):
+            rekaman = {'jumlah': jumlah, **rekaman}
+            hasil.append(rekaman)
+            print(f"{jumlah:>8} {rekaman['tahap']:<16} {rekaman.get('wall_ms') or 0:>11.1f} "
+                  f"{rekaman.get('cpu_ms') or 0:>11.1f} {rekaman.get('memori_mb') or 0:>14.1f} "
+                  f"{rekaman['status']:>9}")
+    print("Hasil disimpan di", simpan_hasil(hasil, vars(args)))
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--anak']:
+        _jalankan_anak(sys.argv[2], [f for f in sys.argv[3].split(',') if f], int(sys.argv[4]))
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+FOKUS_VALID = ('teknis', 'sosial')
+
+# Lokasi buku aturan bawaan (kuesioner edisi pertama)
+FILE_ATURAN_BAWAAN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "aturan", "kuesioner_v1.json")
+
+
+class BukuAturan:
+    """Aturan penilaian kuesioner yang sudah divalidasi dan dikompilasi.
+
+    Dibuat sekali saat aplikasi dimulai. Setiap pertanyaan punya daftar teks opsi
+    (indeks = kode opsi) dan array skor int8 sehingga penilaian cukup memakai
+    pencarian indeks, tanpa membuat dict baru per responden.
+    """
+
+    def __init__(self, data):
+        _validasi(data)
+        self.nama = data.get('nama', '')
+        self.edisi = data.get('edisi', '')
+        self.digest = digest_aturan(data)
+
+        self.indikator = [ind['kode'] for ind in data['indikator']]
+        self.nama_indikator = {ind['kode']: ind['nama'] for ind in data['indikator']}
+        self.indikator_teknis = [ind['kode'] for ind in data['indikator'] if ind['fokus'] == 'teknis']
+        self.indikator_sosial = [ind['kode'] for ind in data['indikator'] if ind['fokus'] == 'sosial']
+
+        # Pertanyaan diurutkan per indikator sesuai urutan di buku aturan
+        urutan = {kode: i for i, kode in enumerate(self.indikator)}
+        pertanyaan = sorted(data['pertanyaan'], key=lambda p: urutan[p['indikator']])
+        self.kode_pertanyaan = [p['kode'] for p in pertanyaan]
+        self.kolom = [p['kolom'] for p in pertanyaan]
+        self.indikator_pertanyaan = [p['indikator'] for p in pertanyaan]
+        # Teks header yang dikenali untuk setiap pertanyaan: kode, judul dan alias (judul dan
+        # alias boleh tidak diisi, kolomnya lalu ditemukan lewat isi jawaban)
+        self.header_pertanyaan = [frozenset([p['kode']] + ([p['judul']] if p.get('judul') else []) + p.get('alias', []))
+                                  for p in pertanyaan]
+        self.opsi = [list(p['opsi']) for p in pertanyaan]
+        self.indeks_opsi = [{teks: i for i, teks in enumerate(p['opsi'])} for p in pertanyaan]
+        # Satu elemen tambahan bernilai 0 di akhir untuk kode -1 (jawaban tidak dikenal/kosong)
+        self.skor = [np.array(list(p['opsi'].values()) + [0], dtype=np.int8) for p in pertanyaan]
+
+        self.skor_maks = {}
+        for ind in data['indikator']:
+            self.skor_maks[ind['kode']] = ind.get('skor_maks') or sum(
+                max(p['opsi'].values()) for p in pertanyaan if p['indikator'] == ind['kode'])
+
+    def peta_skor(self):
+        """Mapping teks jawaban -> skor per indikator, dalam bentuk dict seperti versi lama."""
+        peta = {indikator: [] for indikator in self.indikator}
+        for indikator, opsi, skor in zip(self.indikator_pertanyaan, self.opsi, self.skor):
+            peta[indikator].append(dict(zip(opsi, skor[:-1].tolist())))
+        return peta
+
+# Fungsi untuk membuat digest buku aturan (dipakai sebagai bagian dari kunci cache)
+def digest_aturan(data):
+    teks = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(teks.encode('utf-8')).hexdigest()
+
+# Fungsi untuk memvalidasi isi buku aturan sebelum dikompilasi
+def _validasi(data):
+    def gagal(pesan):
+        raise ValueError(f"Buku aturan tidak valid: {pesan}")
+
+    if not data.get('indikator'):
+        gagal("daftar 'indikator' kosong")
+    if not data.get('pertanyaan'):
+        gagal("daftar 'pertanyaan' kosong")
+
+    indikator = {}
+    for ind in data['indikator']:
+        kode = ind.get('kode')
+        if not kode or kode in indikator:
+            gagal(f"kode indikator '{kode}' kosong atau ganda")
+        if ind.get('fokus') not in FOKUS_VALID:
+            gagal(f"fokus indikator {kode} harus salah satu dari {FOKUS_VALID}")
+        indikator[kode] = ind
+
+    kode_pertanyaan = set()
+    kolom = set()
+    for p in data['pertanyaan']:
+        kode = p.get('kode')
+        if not kode or kode in kode_pertanyaan:
+            gagal(f"kode pertanyaan '{kode}' kosong atau ganda")
+        kode_pertanyaan.add(kode)
+        if p.get('indikator') not in indikator:
+            gagal(f"pertanyaan {kode} memakai indikator '{p.get('indikator')}' yang tidak terdaftar")
+        if not isinstance(p.get('kolom'), int) or p['kolom'] < 0 or p['kolom'] in kolom:
+            gagal(f"kolom pertanyaan {kode} harus bilangan bulat >= 0 dan tidak boleh dipakai dua kali")
+        kolom.add(p['kolom'])
+        if p.get('judul') is not None and not isinstance(p['judul'], str):
+            gagal(f"judul pertanyaan {kode} harus berupa teks")
+        if not isinstance(p.get('alias', []), list) or not all(isinstance(a, str) for a in p.get('alias', [])):
+            gagal(f"alias pertanyaan {kode} harus berupa daftar teks")
+        if not isinstance(p.get('opsi'), dict) or not p['opsi']:
+            gagal(f"pertanyaan {kode} tidak memiliki opsi jawaban")
+        for teks, skor in p['opsi'].items():
+            if not isinstance(skor, int) or isinstance(skor, bool) or not 0 <= skor <= 127:
+                gagal(f"skor opsi '{teks}' pada pertanyaan {kode} harus bilangan bulat 0-127")
+
+    for kode, ind in indikator.items():
+        daftar = [p for p in data['pertanyaan'] if p['indikator'] == kode]
+        if not daftar:
+            gagal(f"indikator {kode} tidak memiliki pertanyaan")
+        maks = sum(max(p['opsi'].values()) for p in daftar)
+        if ind.get('skor_maks') is not None and ind['skor_maks'] != maks:
+            gagal(f"skor_maks indikator {kode} ({ind['skor_maks']}) tidak sama dengan "
+                  f"jumlah skor tertinggi pertanyaannya ({maks})")
+        if maks <= 0:
+            gagal(f"skor maksimal indikator {kode} harus lebih dari 0")
+
+    for fokus in FOKUS_VALID:
+        if not any(ind['fokus'] == fokus for ind in indikator.values()):
+            gagal(f"tidak ada indikator dengan fokus {fokus}")
+
+# Fungsi untuk memuat buku aturan dari file JSON
+def muat_buku_aturan(path=None):
+    path = path or FILE_ATURAN_BAWAAN
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return BukuAturan(data)
@@ -0,0 +1,230 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from penilaian import VERSI_ATURAN
+
+
+# Penanda nilai tidak ditemukan (None bisa menjadi isi cache yang sah)
+_TIDAK_ADA = object()
+
+# Fungsi untuk membuat kunci cache dari isi file yang diupload
+def kunci_cache(isi_file, versi_aturan=VERSI_ATURAN):
+    h = hashlib.sha256()
+    h.update(isi_file)
+    h.update(b"\0aturan:" + str(versi_aturan).encode())
+    return h.hexdigest()
+
+# Fungsi untuk membuat digest isi data (angka, teks, list, dict, Series, DataFrame)
+def digest_data(nilai):
+    h = hashlib.sha256()
+    _tulis_digest(h, nilai)
+    return h.hexdigest()
+
+def _tulis_digest(h, nilai):
+    if isinstance(nilai, (pd.Series, pd.DataFrame)):
+        h.update(type(nilai).__name__.encode())
+        nama = list(nilai.columns) if isinstance(nilai, pd.DataFrame) else nilai.name
+        h.update(repr(nama).encode())
+        h.update(pd.util.hash_pandas_object(nilai, index=True).to_numpy().tobytes())
+    elif isinstance(nilai, np.ndarray):
+        h.update(f"ndarray{nilai.dtype}{nilai.shape}".encode())
+        h.update(np.ascontiguousarray(nilai).tobytes())
+    elif isinstance(nilai, dict):
+        h.update(b"{")
+        for k, v in nilai.items():
+            _tulis_digest(h, k)
+            _tulis_digest(h, v)
+        h.update(b"}")
+    elif isinstance(nilai, (list, tuple)):
+        h.update(b"[")
+        for v in nilai:
+            _tulis_digest(h, v)
+        h.update(b"]")
+    else:
+        h.update(repr(nilai).encode())
+        h.update(b";")
+
+# Fungsi untuk memperkirakan ukuran objek di memori (byte)
+def perkiraan_ukuran(nilai):
+    if isinstance(nilai, pd.DataFrame):
+        return int(nilai.memory_usage(deep=True).sum())
+    if isinstance(nilai, pd.Series):
+        return int(nilai.memory_usage(deep=True))
+    if isinstance(nilai, (bytes, bytearray, memoryview)):
+        return len(nilai)
+    if isinstance(nilai, dict):
+        return sys.getsizeof(nilai) + sum(perkiraan_ukuran(v) for v in nilai.values())
+    if isinstance(nilai, (list, tuple)):
+        return sys.getsizeof(nilai) + sum(perkiraan_ukuran(v) for v in nilai)
+    # Array numpy, tabel Arrow dan sejenisnya
+    if isinstance(getattr(nilai, 'nbytes', None), int):
+        return nilai.nbytes
+    return sys.getsizeof(nilai)
+
+
+class CacheHasil:
+    """Cache LRU hasil penilaian dengan batas memori dan tingkat disk opsional.
+
+    Dipakai bersama oleh semua sesi Streamlit, sehingga file yang sama hanya
+    dihitung sekali. Isi yang dikeluarkan dari memori tetap tersedia di disk
+    (jika direktori diatur) dan bertahan setelah server di-restart.
+    """
+
+    def __init__(self, batas_memori_mb=512, direktori=None, batas_disk_mb=4096):
+        self.batas_memori = batas_memori_mb * 1024 * 1024
+        self.batas_disk = batas_disk_mb * 1024 * 1024
+        self.direktori = direktori
+        self._isi = OrderedDict()
+        self._ukuran = {}
+        self._total = 0
+        self._kunci_proses = {}
+        self._lock = threading.RLock()
+        self.statistik = {'hit_memori': 0, 'hit_disk': 0, 'miss': 0, 'dikeluarkan': 0}
+        if direktori:
+            os.makedirs(direktori, exist_ok=True)
+
+    def __contains__(self, kunci):
+        with self._lock:
+            return kunci in self._isi or (self.direktori is not None and os.path.exists(self._path(kunci)))
+
+    @property
+    def ukuran_memori(self):
+        return self._total
+
+    def ambil(self, kunci, default=None):
+        with self._lock:
+            if kunci in self._isi:
+                self._isi.move_to_end(kunci)
+                self.statistik['hit_memori'] += 1
+                return self._isi[kunci]
+
+        nilai = self._baca_disk(kunci)
+        if nilai is _TIDAK_ADA:
+            with self._lock:
+                self.statistik['miss'] += 1
+            return default
+
+        with self._lock:
+            self.statistik['hit_disk'] += 1
+            self._simpan_memori(kunci, nilai)
+        return nilai
+
+    def simpan(self, kunci, nilai):
+        with self._lock:
+            self._simpan_memori(kunci, nilai)
+        self._tulis_disk(kunci, nilai)
+
+    def ambil_atau_hitung(self, kunci, fungsi):
+        nilai = self.ambil(kunci, _TIDAK_ADA)
+        if nilai is not _TIDAK_ADA:
+            return nilai
+
+        # Satu kunci hanya dihitung oleh satu sesi, sesi lain menunggu hasilnya
+        with self._lock:
+            lock_kunci = self._kunci_proses.setdefault(kunci, threading.Lock())
+        with lock_kunci:
+            nilai = self.ambil(kunci, _TIDAK_ADA)
+            if nilai is _TIDAK_ADA:
+                nilai = fungsi()
+                self.simpan(kunci, nilai)
+        with self._lock:
+            self._kunci_proses.pop(kunci, None)
+        return nilai
+
+    def hapus(self, kunci):
+        with self._lock:
+            if kunci in self._isi:
+                del self._isi[kunci]
+                self._total -= self._ukuran.pop(kunci)
+        if self.direktori:
+            try:
+                os.remove(self._path(kunci))
+            except FileNotFoundError:
+                pass
+
+    def kosongkan(self):
+        with self._lock:
+            self._isi.clear()
+            self._ukuran.clear()
+            self._total = 0
+
+    def _simpan_memori(self, kunci, nilai):
+        ukuran = perkiraan_ukuran(nilai)
+        if kunci in self._isi:
+            self._total -= self._ukuran[kunci]
+        self._isi[kunci] = nilai
+        self._isi.move_to_end(kunci)
+        self._ukuran[kunci] = ukuran
+        self._total += ukuran
+
+        # Keluarkan isi yang paling lama tidak dipakai sampai di bawah batas,
+        # tetapi isi terbaru tetap disimpan walaupun sendirian melebihi batas
+        while self._total > self.batas_memori and len(self._isi) > 1:
+            kunci_lama, _ = self._isi.popitem(last=False)
+            self._total -= self._ukuran.pop(kunci_lama)
+            self.statistik['dikeluarkan'] += 1
+
+    def _path(self, kunci):
+        nama = hashlib.sha256(kunci.encode()).hexdigest()
+        return os.path.join(self.direktori, nama + ".pkl")
+
+    def _baca_disk(self, kunci):
+        if not self.direktori:
+            return _TIDAK_ADA
+        path = self._path(kunci)
+        try:
+            with open(path, "rb") as f:
+                kunci_tersimpan, nilai = pickle.load(f)
+        except FileNotFoundError:
+            return _TIDAK_ADA
+        except Exception:
+            # File rusak (misalnya server mati saat menulis) dianggap tidak ada
+            return _TIDAK_ADA
+        if kunci_tersimpan != kunci:
+            return _TIDAK_ADA
+        os.utime(path)
+        return nilai
+
+    def _tulis_disk(self, kunci, nilai):
+        if not self.direktori:
+            return
+        # Tulis ke file sementara lalu ganti nama agar tidak ada file setengah jadi
+        fd, path_sementara = tempfile.mkstemp(dir=self.direktori, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((kunci, nilai), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path_sementara, self._path(kunci))
+        except Exception:
+            if os.path.exists(path_sementara):
+                os.remove(path_sementara)
+            raise
+        self._rapikan_disk()
+
+    def _rapikan_disk(self):
+        # Hapus file yang paling lama tidak dipakai jika melebihi batas disk
+        daftar = []
+        for nama in os.listdir(self.direktori):
+            if nama.endswith(".pkl"):
+                path = os.path.join(self.direktori, nama)
+                try:
+                    info = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                daftar.append((info.st_mtime, info.st_size, path))
+        total = sum(ukuran for _, ukuran, _ in daftar)
+        for _, ukuran, path in sorted(daftar):
+            if total <= self.batas_disk:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= ukuran
@@ -0,0 +1,192 @@
+"""Penilaian tanpa antarmuka (untuk cron/job malam).
+
+Menilai semua file survei di direktori atau pola glob secara paralel, lalu menulis
+nilai per responden dan ringkasan ke folder keluaran. Modul ini tidak mengimpor
+Streamlit.
+
+Contoh: python cli.py data/2024Q3/ "arsip/*.xlsx" -o hasil/ -f parquet -f xlsx --workers 8 --grafik
+Dengan --gelombang 2024-Q3 agregat hasilnya juga disimpan ke riwayat tren (DASHBOARD_FILE_RIWAYAT).
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from datetime import date
+
+import konfigurasi
+from batch import proses_banyak_file, rangkum_banyak_file
+from cache_hasil import kunci_cache
+from ekspor import FORMAT_EKSPOR, buat_ekspor, tabel_ringkasan_ekspor
+from ingest import FORMAT_DIDUKUNG
+from kubus import bangun_kubus
+from penilaian import VERSI_ATURAN
+from riwayat import RiwayatPenilaian
+
+
+# Fungsi untuk mengumpulkan path file survei dari daftar direktori, pola glob atau file.
+# Urutan mengikuti argumen, file di dalam direktori/glob diurutkan berdasarkan nama
+def kumpulkan_file(daftar_sumber):
+    daftar_path = []
+    for sumber in daftar_sumber:
+        if os.path.isdir(sumber):
+            daftar_path += sorted(os.path.join(sumber, nama) for nama in os.listdir(sumber)
+                                  if os.path.splitext(nama)[1].lower() in FORMAT_DIDUKUNG
+                                  and not nama.startswith('~$'))
+        elif glob.has_magic(sumber):
+            daftar_path += sorted(path for path in glob.glob(sumber) if os.path.isfile(path))
+        else:
+            daftar_path.append(sumber)
+    return list(dict.fromkeys(daftar_path))
+
+# Fungsi untuk mengubah ringkasan penilaian menjadi dict yang bisa ditulis ke JSON
+def ringkasan_json(hasil):
+    return {
+        'versi_aturan': VERSI_ATURAN,
+        'jumlah_responden': int(hasil['jumlah_responden']),
+        'rata_rata': {kolom: float(nilai) for kolom, nilai in hasil['rata_rata'].items()},
+        'distribusi_kategori': {kategori: int(jumlah) for kategori, jumlah in hasil['distribusi_kategori'].items()},
+        'demografi': {kolom: {str(k): int(v) for k, v in distribusi.items()}
+                      for kolom, distribusi in hasil['demografi'].items()},
+        'per_file': hasil['per_file'].to_dict(orient='records'),
+        'gagal': hasil['gagal'],
+    }
+
+# Fungsi untuk merender semua grafik dashboard ke folder keluaran (dan cache grafik di
+# disk jika DASHBOARD_CACHE_DIR diisi). matplotlib baru diimpor di sini
+def render_grafik_ke_folder(hasil, folder, jumlah_worker):
+    from grafik import render_paralel, spesifikasi_dashboard
+
+    os.makedirs(folder, exist_ok=True)
+    spesifikasi_halaman = spesifikasi_dashboard(hasil)
+    gagal = {}
+    for jenis, gambar in zip(spesifikasi_halaman, render_paralel(list(spesifikasi_halaman.values()),
+                                                                 jumlah_worker=jumlah_worker)):
+        if isinstance(gambar, Exception):
+            gagal[jenis] = f"{type(gambar).__name__}: {gambar}"
+        elif gambar is not None:
+            with open(os.path.join(folder, f"{jenis}.png"), 'wb') as f:
+                f.write(gambar)
+    return gagal
+
+# Fungsi untuk membuat kunci isi gabungan file, sama seperti unggahan banyak file di dashboard,
+# sehingga file yang sama yang disimpan lewat CLI dan dashboard dikenali sebagai satu unggahan
+def kunci_gabungan(daftar_path):
+    daftar_kunci = []
+    for path in daftar_path:
+        with open(path, 'rb') as f:
+            daftar_kunci.append(f"{os.path.basename(path)}:{kunci_cache(f.read())}")
+    return kunci_cache("\n".join(daftar_kunci).encode())
+
+def buat_parser():
+    parser = argparse.ArgumentParser(
+        prog="python cli.py",
+        description="Menilai file survei kesadaran keamanan siber tanpa membuka dashboard.")
+    parser.add_argument('sumber', nargs='+',
+                        help="direktori, pola glob (diberi tanda kutip) atau file survei")
+    parser.add_argument('-o', '--keluaran', default='hasil_penilaian',
+                        help="folder keluaran (default: hasil_penilaian)")
+    parser.add_argument('-f', '--format', action='append', choices=list(FORMAT_EKSPOR), dest='daftar_format',
+                        help="format nilai per responden, bisa diulang (default: parquet)")
+    parser.add_argument('-w', '--workers', type=int, default=konfigurasi.JUMLAH_WORKER_INGEST,
+                        help="jumlah proses paralel (default: DASHBOARD_WORKER_INGEST atau jumlah CPU)")
+    parser.add_argument('--grafik', action='store_true',
+                        help="render juga gambar grafik dashboard ke <keluaran>/grafik")
+    parser.add_argument('--gelombang', metavar='LABEL',
+                        help="simpan agregat hasil ke riwayat tren dengan label gelombang ini (misalnya 2024-Q3)")
+    parser.add_argument('--tanggal', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                        help="tanggal gelombang untuk --gelombang (default: hari ini)")
+    parser.add_argument('--riwayat', metavar='FILE', default=konfigurasi.FILE_RIWAYAT,
+                        help="file SQLite riwayat (default: DASHBOARD_FILE_RIWAYAT)")
+    parser.add_argument('--timing', metavar='FILE',
+                        help="tulis ringkasan waktu (JSON) ke file ini selain ke stdout")
+    parser.add_argument('-q', '--diam', action='store_true', help="jangan tampilkan progres per file")
+    return parser
+
+def main(argv=None):
+    parser = buat_parser()
+    args = parser.parse_args(argv)
+    if args.gelombang and not args.riwayat:
+        parser.error("--gelombang membutuhkan --riwayat atau DASHBOARD_FILE_RIWAYAT")
+    daftar_format = args.daftar_format or ['parquet']
+    mulai = time.perf_counter()
+    waktu = {}
+
+    daftar_path = kumpulkan_file(args.sumber)
+    if not daftar_path:
+        print("Tidak ada file survei yang ditemukan", file=sys.stderr)
+        return 2
+
+    # Tahap 1: baca dan nilai setiap file di process pool
+    def progres(hasil_file, selesai, total):
+        if not args.diam:
+            status = "OK" if hasil_file.berhasil else f"GAGAL: {hasil_file.error}"
+            print(f"[{selesai}/{total}] {hasil_file.nama_file} ({hasil_file.waktu:.2f} detik) {status}",
+                  file=sys.stderr)
+
+    tahap = time.perf_counter()
+    daftar_hasil = proses_banyak_file([(os.path.basename(path), path) for path in daftar_path],
+                                      args.workers, progres)
+    waktu['baca_nilai'] = time.perf_counter() - tahap
+
+    tahap = time.perf_counter()
+    data, hasil = rangkum_banyak_file(daftar_hasil)
+    waktu['gabung'] = time.perf_counter() - tahap
+
+    # Tahap 2: tulis nilai per responden dan ringkasan
+    os.makedirs(args.keluaran, exist_ok=True)
+    berkas = []
+    if hasil['per_file'].empty:
+        print("Tidak ada file yang berhasil dinilai", file=sys.stderr)
+    else:
+        tabel_ringkasan = tabel_ringkasan_ekspor(hasil)
+        for format_ekspor in daftar_format:
+            tahap = time.perf_counter()
+            path = os.path.join(args.keluaran, f"nilai_responden.{format_ekspor}")
+            with open(path, 'wb') as f:
+                f.write(buat_ekspor(format_ekspor, tabel_ringkasan, data, hasil['df_hasil']))
+            waktu[f'ekspor_{format_ekspor}'] = time.perf_counter() - tahap
+            berkas.append(path)
+
+        path = os.path.join(args.keluaran, "ringkasan.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(ringkasan_json(hasil), f, ensure_ascii=False, indent=2)
+        berkas.append(path)
+
+    gagal_grafik = {}
+    if args.grafik and not hasil['per_file'].empty:
+        tahap = time.perf_counter()
+        gagal_grafik = render_grafik_ke_folder(hasil, os.path.join(args.keluaran, "grafik"), args.workers)
+        waktu['grafik'] = time.perf_counter() - tahap
+
+    # Tahap 3: simpan agregat per demografi ke riwayat tren
+    if args.gelombang and not hasil['per_file'].empty:
+        tahap = time.perf_counter()
+        RiwayatPenilaian(args.riwayat).simpan(args.gelombang, bangun_kubus(data, hasil['df_hasil']),
+                                              kunci_gabungan(daftar_path), f"gabungan {len(daftar_path)} file",
+                                              args.tanggal)
+        waktu['riwayat'] = time.perf_counter() - tahap
+    waktu['total'] = time.perf_counter() - mulai
+
+    timing = {
+        'jumlah_file': len(daftar_path),
+        'file_berhasil': len(hasil['per_file']),
+        'file_gagal': len(hasil['gagal']),
+        'jumlah_responden': int(hasil['jumlah_responden']),
+        'workers': args.workers,
+        'waktu_detik': {tahap: round(detik, 4) for tahap, detik in waktu.items()},
+        'per_file': [{'file': h.nama_file, 'waktu_detik': round(h.waktu, 4), 'error': h.error}
+                     for h in daftar_hasil],
+        'gagal_grafik': gagal_grafik,
+        'berkas': berkas,
+    }
+    teks = json.dumps(timing, ensure_ascii=False, indent=2)
+    print(teks)
+    if args.timing:
+        with open(args.timing, 'w', encoding='utf-8') as f:
+            f.write(teks + "\n")
+    return 1 if hasil['gagal'] or gagal_grafik else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+from instrumentasi import diukur
+
+
+# Kolom demografi yang ditampilkan sebagai grafik
+KOLOM_GRAFIK_DEMOGRAFI = ['JENIS KELAMIN', 'UMUR', 'TINGKAT PENDIDIKAN', 'PROVINSI']
+
+# Label untuk nilai demografi yang kosong
+LABEL_KOSONG = 'Tidak Ada Data'
+
+# Penulisan jenis kelamin (huruf besar, tanpa spasi berlebih) dan label seragamnya.
+# Penulisan lain tetap ditampilkan dalam huruf besar
+PETA_JENIS_KELAMIN = {
+    'L': 'Laki-Laki',
+    'LAKI-LAKI': 'Laki-Laki',
+    'LAKI LAKI': 'Laki-Laki',
+    'LAKI2': 'Laki-Laki',
+    'PRIA': 'Laki-Laki',
+    'P': 'Perempuan',
+    'PEREMPUAN': 'Perempuan',
+    'WANITA': 'Perempuan',
+    LABEL_KOSONG.upper(): LABEL_KOSONG,
+}
+
+# Kelompok umur untuk kolom UMUR yang berisi angka (batas atas setiap kelompok, inklusif)
+BATAS_UMUR = [19, 30, 40]
+LABEL_UMUR = ['< 20 tahun', '20 - 30 tahun', '31 - 40 tahun', '> 40 tahun']
+
+
+# Fungsi untuk merapikan spasi satu teks (teks kosong menjadi None)
+def _teks_seragam(nilai):
+    return ' '.join(str(nilai).split()) or None
+
+# Fungsi untuk mengganti label kategori satu kolom lewat label_baru(label lama).
+# Hanya daftar kategorinya yang diproses, bukan setiap baris; label yang menjadi sama
+# digabung dan label None menjadi nilai kosong. Kolom asli tidak diubah
+def _ganti_label(kolom, label_baru):
+    if not isinstance(kolom.dtype, pd.CategoricalDtype):
+        kolom = kolom.astype('category')
+    baru = [label_baru(label) for label in kolom.cat.categories]
+    kategori = list(dict.fromkeys(label for label in baru if label is not None))
+    posisi = {label: i for i, label in enumerate(kategori)}
+    kode = np.array([posisi.get(label, -1) for label in baru] + [-1], dtype=np.int64)
+    return pd.Series(pd.Categorical.from_codes(kode[kolom.cat.codes.to_numpy()], categories=kategori),
+                     index=kolom.index, name=kolom.name)
+
+# Fungsi untuk menyeragamkan penulisan jenis kelamin (nilai kosong menjadi LABEL_KOSONG)
+def normalisasi_jenis_kelamin(kolom):
+    def label_baru(teks):
+        teks = _teks_seragam(teks)
+        return None if teks is None else PETA_JENIS_KELAMIN.get(teks.upper(), teks.upper())
+
+    kolom = _ganti_label(kolom, label_baru)
+    if kolom.isna().any():
+        if LABEL_KOSONG not in kolom.cat.categories:
+            kolom = kolom.cat.add_categories([LABEL_KOSONG])
+        kolom = kolom.fillna(LABEL_KOSONG)
+    return kolom
+
+# Fungsi untuk mengubah kolom UMUR berisi angka menjadi kelompok umur.
+# Kolom yang sebagian besar sudah berupa kelompok (teks) hanya dirapikan spasinya
+def pita_umur(kolom):
+    if not isinstance(kolom.dtype, pd.CategoricalDtype):
+        kolom = kolom.astype('category')
+    angka = pd.to_numeric(pd.Series(kolom.cat.categories.astype(object)), errors='coerce').to_numpy()
+    kode = kolom.cat.codes.to_numpy()
+    jumlah = np.bincount(kode[kode >= 0], minlength=len(angka))
+    if jumlah[~np.isnan(angka)].sum() <= jumlah.sum() / 2:
+        return _ganti_label(kolom, _teks_seragam)
+
+    # Nilai yang bukan angka tetap memakai teks aslinya
+    kelompok = {label: None if np.isnan(x) else LABEL_UMUR[np.searchsorted(BATAS_UMUR, x, side='left')]
+                for label, x in zip(kolom.cat.categories, angka)}
+    return _ganti_label(kolom, lambda label: kelompok[label] or _teks_seragam(label))
+
+# Fungsi untuk menyeragamkan penulisan yang hanya berbeda huruf besar/kecil atau spasi
+# (misalnya 'jawa barat', 'JAWA BARAT ' dan 'Jawa Barat'). Dipilih penulisan campuran
+# huruf besar-kecil, lalu huruf besar, lalu urutan abjad, sehingga hasilnya sama untuk
+# setiap bagian data
+def seragamkan_penulisan(kolom):
+    if not isinstance(kolom.dtype, pd.CategoricalDtype):
+        kolom = kolom.astype('category')
+    terpilih = {}
+    for teks in sorted({_teks_seragam(label) for label in kolom.cat.categories} - {None},
+                       key=lambda teks: (teks.islower(), teks.isupper(), teks)):
+        terpilih.setdefault(teks.casefold(), teks)
+
+    def label_baru(label):
+        teks = _teks_seragam(label)
+        return None if teks is None else terpilih[teks.casefold()]
+
+    return _ganti_label(kolom, label_baru)
+
+# Penyeragam setiap kolom demografi grafik
+PENYERAGAM_DEMOGRAFI = {
+    'JENIS KELAMIN': normalisasi_jenis_kelamin,
+    'UMUR': pita_umur,
+    'TINGKAT PENDIDIKAN': seragamkan_penulisan,
+    'PROVINSI': seragamkan_penulisan,
+}
+
+# Fungsi untuk menormalisasi kolom demografi sekali saat ingest menjadi kategori dengan
+# penulisan seragam. Hasilnya DataFrame baru, data masukan tidak diubah
+@diukur
+def normalisasi_demografi(df):
+    kolom = {nama: penyeragam(df[nama]) for nama, penyeragam in PENYERAGAM_DEMOGRAFI.items()
+             if nama in df.columns}
+    return df.assign(**kolom) if kolom else df
+
+# Fungsi untuk mengurutkan distribusi: jumlah terbanyak dulu, lalu nama kategori
+def urutkan_distribusi(distribusi):
+    distribusi = distribusi[distribusi > 0].astype('int64')
+    distribusi = distribusi.sort_index(key=lambda idx: idx.astype(str))
+    return distribusi.sort_values(ascending=False, kind='stable')
+
+# Fungsi untuk menghitung distribusi setiap kolom demografi yang ada di data. Kolom yang
+# sudah dinormalisasi saat ingest cukup dihitung dari kode kategorinya
+@diukur
+def hitung_distribusi_demografi(df):
+    distribusi = {}
+    for kolom in KOLOM_GRAFIK_DEMOGRAFI:
+        if kolom not in df.columns:
+            continue
+        nilai = PENYERAGAM_DEMOGRAFI[kolom](df[kolom])
+        distribusi[kolom] = urutkan_distribusi(nilai.value_counts())
+    return distribusi
+
+# Fungsi untuk menggabungkan dua hasil hitung_distribusi_demografi (misalnya per chunk)
+def gabung_distribusi(distribusi_a, distribusi_b):
+    hasil = dict(distribusi_a)
+    for kolom, jumlah in distribusi_b.items():
+        if kolom in hasil:
+            jumlah = hasil[kolom].add(jumlah, fill_value=0)
+        hasil[kolom] = urutkan_distribusi(jumlah)
+    return hasil
@@ -0,0 +1,177 @@
+import io
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+from batch import KOLOM_SUMBER
+from instrumentasi import diukur
+from penilaian import INDIKATOR_SOSIAL, INDIKATOR_TEKNIS, KOLOM_NILAI, NAMA_INDIKATOR, kategorikan, nilai_persis
+
+
+FORMAT_EKSPOR = {
+    'xlsx': "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    'csv': "text/csv",
+    'parquet': "application/vnd.apache.parquet",
+}
+
+# Jumlah baris yang ditulis per langkah dan batas baris data per sheet Excel
+# (1.048.576 baris dikurangi header)
+UKURAN_CHUNK_EKSPOR = 50000
+BATAS_BARIS_SHEET = 1048575
+
+# Sheet nilai per responden: nama sheet dan kolom nilai yang ditulis
+SHEET_RESPONDEN = {
+    'Nilai Teknis': [indikator + 'TOTAL' for indikator in INDIKATOR_TEKNIS] + ['NKKST'],
+    'Nilai Sosial': [indikator + 'TOTAL' for indikator in INDIKATOR_SOSIAL] + ['NKKSS'],
+    'NKI Responden': ['NKKST', 'NKKSS', 'NKI', 'Kategori NKI'],
+}
+
+# Judul kolom nilai pada file ekspor
+JUDUL_KOLOM = {indikator + 'TOTAL': NAMA_INDIKATOR[indikator] for indikator in NAMA_INDIKATOR}
+
+# Fungsi untuk menyusun daftar tabel ringkasan rata-rata pada sheet 'Hasil Penilaian'
+# (tabel indikator teknis, NKKST, tabel indikator sosial, NKKSS, NKI)
+def tabel_ringkasan_ekspor(hasil):
+    rata_rata = hasil['rata_rata']
+    kategori = dict(zip(['NKKST', 'NKKSS', 'NKI'],
+                        kategorikan([rata_rata['NKKST'], rata_rata['NKKSS'], rata_rata['NKI']])[0]))
+
+    def baris(nama):
+        return pd.DataFrame({"Deskripsi": [f"Rata-Rata {nama}"], "Nilai": [rata_rata[nama]],
+                             "Kategori": [kategori[nama]]})
+
+    return [hasil['tabel_teknis'], baris('NKKST'), hasil['tabel_sosial'], baris('NKKSS'), baris('NKI')]
+
+# Fungsi untuk menyusun tabel ekspor per responden (identitas, nilai dan kategori NKI).
+# Kolom diambil langsung dari data tanpa menyalin baris
+def tabel_ekspor_responden(data, df_hasil):
+    kolom = {'No.': np.arange(1, len(df_hasil) + 1), 'Responden_ID': df_hasil['Responden_ID']}
+    for nama, judul in (('NAMA', 'Nama Responden'), ('INSTANSI', 'Asal Instansi')):
+        if data is not None and nama in data.columns:
+            kolom[judul] = data[nama].reset_index(drop=True)
+    for nama in df_hasil.columns.drop('Responden_ID'):
+        kolom[nama] = nilai_persis(df_hasil[nama]) if nama in KOLOM_NILAI else df_hasil[nama]
+    kolom['Kategori NKI'] = kategorikan(df_hasil['NKI'])[0]
+    return pd.DataFrame(kolom)
+
+# Fungsi untuk mengubah satu kolom menjadi list nilai Python yang bisa ditulis xlsxwriter
+# (NaN/NaT menjadi None = sel kosong)
+def _nilai_kolom(kolom):
+    if pd.api.types.is_float_dtype(kolom.dtype):
+        nilai = kolom.to_numpy()
+        if not np.isnan(nilai).any():
+            return nilai.tolist()
+    return kolom.astype(object).where(kolom.notna(), None).tolist()
+
+# Fungsi untuk menulis tabel ringkasan rata-rata ke satu sheet (format laporan lama)
+def _tulis_ringkasan(workbook, daftar_tabel):
+    worksheet = workbook.add_worksheet('Hasil Penilaian')
+    header_format = workbook.add_format({
+        'bold': True,
+        'text_wrap': True,
+        'valign': 'top',
+        'fg_color': '#4472C4',
+        'font_color': 'white',
+        'border': 1
+    })
+    number_format = workbook.add_format({'num_format': '0.00'})
+    worksheet.set_column('A:A', 30)
+    worksheet.set_column('B:B', 15, number_format)
+    worksheet.set_column('C:C', 20)
+
+    # Setiap tabel ditulis di bawah tabel sebelumnya dengan jarak satu baris
+    baris = 0
+    for tabel in daftar_tabel:
+        worksheet.write_row(baris, 0, list(tabel.columns), header_format)
+        for isi in zip(*(_nilai_kolom(tabel[k]) for k in tabel.columns)):
+            baris += 1
+            worksheet.write_row(baris, 0, isi)
+        baris += 2
+
+# Fungsi untuk menulis tabel responden ke beberapa sheet, baris demi baris per chunk.
+# Sheet yang melebihi batas baris Excel dilanjutkan ke sheet berikutnya
+def _tulis_sheet_responden(workbook, tabel, ukuran_chunk):
+    header_format = workbook.add_format({'bold': True, 'fg_color': '#4472C4', 'font_color': 'white', 'border': 1})
+    identitas = [k for k in ('No.', 'Responden_ID', 'Nama Responden', 'Asal Instansi', KOLOM_SUMBER)
+                 if k in tabel.columns]
+    for nama_sheet, kolom_nilai in SHEET_RESPONDEN.items():
+        kolom = identitas + kolom_nilai
+        judul = [JUDUL_KOLOM.get(k, k) for k in kolom]
+        for ke, awal_sheet in enumerate(range(0, max(len(tabel), 1), BATAS_BARIS_SHEET)):
+            worksheet = workbook.add_worksheet(nama_sheet if ke == 0 else f"{nama_sheet} ({ke + 1})")
+            worksheet.set_column(0, len(kolom) - 1, 18)
+            worksheet.write_row(0, 0, judul, header_format)
+            akhir_sheet = min(awal_sheet + BATAS_BARIS_SHEET, len(tabel))
+            baris = 1
+            for awal in range(awal_sheet, akhir_sheet, ukuran_chunk):
+                bagian = tabel.iloc[awal:min(awal + ukuran_chunk, akhir_sheet)]
+                for isi in zip(*(_nilai_kolom(bagian[k]) for k in kolom)):
+                    worksheet.write_row(baris, 0, isi)
+                    baris += 1
+
+# Fungsi untuk menulis file Excel: sheet ringkasan rata-rata dan (jika ada) sheet nilai
+# per responden. Mode constant_memory menulis setiap baris langsung ke file sementara,
+# sehingga memori tidak bertambah sesuai jumlah responden
+def tulis_excel(tujuan, daftar_tabel_ringkasan, tabel_responden=None, ukuran_chunk=UKURAN_CHUNK_EKSPOR):
+    workbook = xlsxwriter.Workbook(tujuan, {
+        'constant_memory': True,
+        'nan_inf_to_errors': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+        'remove_timezone': True,
+    })
+    try:
+        _tulis_ringkasan(workbook, daftar_tabel_ringkasan)
+        if tabel_responden is not None:
+            _tulis_sheet_responden(workbook, tabel_responden, ukuran_chunk)
+    finally:
+        workbook.close()
+
+# Fungsi untuk menulis tabel responden ke CSV per chunk
+def tulis_csv(tujuan, tabel_responden, ukuran_chunk=UKURAN_CHUNK_EKSPOR):
+    teks = io.TextIOWrapper(tujuan, encoding='utf-8', newline='', write_through=True)
+    try:
+        for awal in range(0, max(len(tabel_responden), 1), ukuran_chunk):
+            tabel_responden.iloc[awal:awal + ukuran_chunk].to_csv(teks, index=False, header=(awal == 0))
+    finally:
+        teks.detach()
+
+# Fungsi untuk menulis tabel responden ke Parquet, satu row group per chunk
+def tulis_parquet(tujuan, tabel_responden, ukuran_chunk=UKURAN_CHUNK_EKSPOR):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    skema = pa.Schema.from_pandas(tabel_responden.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(tujuan, skema) as writer:
+        for awal in range(0, len(tabel_responden), ukuran_chunk):
+            bagian = tabel_responden.iloc[awal:awal + ukuran_chunk]
+            writer.write_table(pa.Table.from_pandas(bagian, schema=skema, preserve_index=False))
+
+# Fungsi untuk membuat isi file ekspor (bytes) dalam format yang diminta. File ditulis
+# ke file sementara di disk terlebih dahulu, baru dibaca sekali di akhir
+@diukur
+def buat_ekspor(format_ekspor, daftar_tabel_ringkasan, data=None, df_hasil=None,
+                ukuran_chunk=UKURAN_CHUNK_EKSPOR):
+    if format_ekspor not in FORMAT_EKSPOR:
+        raise ValueError(f"Format ekspor '{format_ekspor}' tidak didukung, "
+                         f"gunakan salah satu dari: {', '.join(FORMAT_EKSPOR)}")
+    tabel_responden = tabel_ekspor_responden(data, df_hasil) if df_hasil is not None else None
+    if format_ekspor != 'xlsx' and tabel_responden is None:
+        raise ValueError(f"Ekspor {format_ekspor} membutuhkan nilai per responden")
+
+    fd, path = tempfile.mkstemp(suffix='.' + format_ekspor)
+    os.close(fd)
+    try:
+        if format_ekspor == 'xlsx':
+            tulis_excel(path, daftar_tabel_ringkasan, tabel_responden, ukuran_chunk)
+        elif format_ekspor == 'csv':
+            with open(path, 'wb') as f:
+                tulis_csv(f, tabel_responden, ukuran_chunk)
+        else:
+            tulis_parquet(path, tabel_responden, ukuran_chunk)
+        with open(path, 'rb') as f:
+            return f.read()
+    finally:
+        os.remove(path)
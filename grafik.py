@@ -0,0 +1,750 @@
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+import matplotlib.pyplot as plt
+from matplotlib.patches import Wedge
+from matplotlib.ticker import MaxNLocator
+import numpy as np
+
+import konfigurasi
+from cache_hasil import CacheHasil, digest_data
+from instrumentasi import catat, daftarkan_metrik, diukur, ukur_tahap
+from penilaian import INDIKATOR_SOSIAL, INDIKATOR_TEKNIS
+
+
+# Keterangan singkat kode indikator pada legenda grafik NKKST dan NKKSS
+KETERANGAN_INDIKATOR = {
+    'SK': 'Syarat & Ketentuan Instalasi',
+    'KS': 'Kata Sandi',
+    'IW': 'Internet & WiFi',
+    'KP': 'Keamanan Perangkat',
+    'AT': 'Aduan Insiden Siber Teknis',
+    'HT': 'Hukum & Regulasi Keamanan Siber Teknis',
+    'RS': 'Rekayasa Sosial',
+    'KN': 'Konten Negatif',
+    'AM': 'Aktivitas Media Sosial',
+    'AS': 'Aduan Insiden Siber Sosial',
+    'HS': 'Hukum & Regulasi Keamanan Siber Sosial',
+}
+
+# Fungsi untuk membuat grafik index
+def create_bar_index(index_value, figsize=(8, 4)):
+    fig, ax = plt.subplots(figsize=figsize)
+
+    # Warna dan segmentasi
+    color_ranges = [
+        (0, 25, '#ec204f', "Buruk" ,'25'),
+        (25, 50, '#feed47', "Kurang Baik" , '50'),
+        (50, 80, '#8de45f', "Baik", '80'),
+        (80, 100, '#2ecf03', "Sangat Baik", '100')
+    ]
+
+    center = (0.5, 0.0)
+    radius = 0.5
+
+    # Gambar segmen warna
+    for start_val, end_val, color, category_label, value_label in color_ranges:
+        # 1. Gambar segmen wedge
+        wedge = Wedge(center, radius,
+                      theta1=180 - (end_val / 100) * 180,
+                      theta2=180 - (start_val / 100) * 180,
+                      color=color,
+                      width=0.2)
+        ax.add_patch(wedge)
+
+        # 2. Label kategori (di luar)
+        mid_angle = 180 - ((start_val + end_val) / 2 / 100) * 180
+        angle_rad = np.radians(mid_angle)
+        label_radius = radius * 0.7
+        x_cat = center[0] + label_radius * np.cos(angle_rad)
+        y_cat = center[1] + label_radius * np.sin(angle_rad)
+        rotation = mid_angle - 90
+        ax.text(x_cat, y_cat, category_label,
+                ha='center', va='center',
+                fontsize=14, rotation=rotation)
+
+        # 3. Label nilai di KANAN ATAS LUAR TEPI
+        edge_angle = 180 - (end_val / 100) * 180
+        edge_rad = np.radians(edge_angle)
+
+        # Posisi kanan atas (adjustment khusus)
+        offset_x = 0.0  # Geser horizontal
+        offset_y = 0.0  # Geser vertikal
+        x_val = center[0] + (radius * 1.0) * np.cos(edge_rad) + (
+            offset_x if np.cos(edge_rad) >= 0 else -offset_x
+        )
+        y_val = center[1] + (radius * 1.0) * np.sin(edge_rad) + (
+            offset_y if np.sin(edge_rad) >= 0 else -offset_y
+        )
+
+        # Alignment dinamis berdasarkan kuadran
+        ha = 'left' if np.cos(edge_rad) >= 0 else 'right'
+        va = 'bottom' if np.sin(edge_rad) >= 0 else 'top'
+
+        ax.text(x_val, y_val, value_label,
+                ha=ha,
+                va=va,
+                fontsize=12,
+                fontweight='bold',
+                color='black')
+
+    # Nilai index di tengah cukup ditulis sekali (bukan sekali per segmen warna)
+    ax.text(center[0], center[1] - 0.05, f"{index_value:.2f}",
+            ha='center', va='center',
+            fontsize=34, fontweight='bold')
+
+    # Parameter jarum
+    needle_length = 0.6  # Panjang relatif terhadap radius (0 < x ≤ 1)
+    needle_base_width = 0.4  # Lebar pangkal jarum
+    needle_tip_width = 0.4 # Lebar ujung jarum
+
+    # Hitung posisi jarum
+    angle = np.radians(180 - (index_value / 100) * 180)
+
+    # Titik pangkal (base) jarum
+    base_length = radius * 0.01  # Jarak dari pusat
+    base_x = center[0] + base_length * np.cos(angle)
+    base_y = center[1] + base_length * np.sin(angle)
+
+    # Titik ujung (tip) jarum
+    tip_x = center[0] + (radius * needle_length) * np.cos(angle)
+    tip_y = center[1] + (radius * needle_length) * np.sin(angle)
+
+    # Gambar jarum dengan bentuk wedge
+    ax.annotate("",
+                xy=(tip_x, tip_y),  # Ujung jarum
+                xytext=(base_x, base_y),  # Pangkal jarum
+                arrowprops=dict(
+                    arrowstyle="wedge,tail_width={},shrink_factor={}".format(
+                        needle_base_width,
+                        needle_tip_width / needle_base_width
+                    ),
+                    color="black",
+                    linewidth=0
+                ))
+
+    ax.add_patch(plt.Circle(center, 0.03, color='black'))
+
+    ax.set_title('Nilai Rata-Rata Kesadaran Keamanan Siber',
+                 fontsize=16, pad=30, loc="center")
+
+    ax.set_xlim(0.0, 1.0)
+    ax.set_ylim(0.0, 0.5)
+    ax.axis('off')
+    # Tanpa tick, posisi judul dan bbox tight tidak lagi menghitung label tick sumbu
+    # yang tidak ditampilkan (bagian terbesar waktu render gauge)
+    ax.set_xticks([])
+    ax.set_yticks([])
+
+    return fig
+
+# Fungsi untuk membuat pie chart kategori NKI
+def create_pie_kategori(distribusi_kategori, figsize=(8, 4)):
+    """Buat pie chart yang hanya menampilkan kategori dengan nilai > 0"""
+    # Siapkan data, filter kategori dengan nilai > 0
+    labels = []
+    sizes = []
+    colors = []
+
+    # Warna dan label default (sesuaikan dengan kebutuhan)
+    color_map = {
+        'Sangat Baik': '#4CAF50',
+        'Baik': '#8BC34A',
+        'Kurang Baik': '#FFC107',
+        'Buruk': '#F44336'
+    }
+
+    # Filter kategori yang memiliki nilai > 0
+    for kategori, nilai in distribusi_kategori.items():
+        if nilai > 0:
+            labels.append(f"{kategori}\n({nilai} Responden)")  # Contoh: "Baik (15)"
+            sizes.append(nilai)
+            colors.append(color_map[kategori])
+
+    # Jika tidak ada data sama sekali
+    if not sizes:
+        return None
+
+    # Buat pie chart
+    fig, ax = plt.subplots(figsize=figsize)
+
+    # Tanpa autopct (satu kategori) ax.pie hanya mengembalikan wedges dan texts
+    ax.pie(
+        sizes,
+        labels=labels if len(labels) > 1 else None,  # Sembunyikan label jika hanya 1 kategori
+        autopct='%1.1f%%' if len(sizes) > 1 else None,  # Sembunyikan persentase jika hanya 1 kategori
+        startangle=90,
+        colors=colors,
+        wedgeprops={'linewidth': 1, 'edgecolor': 'white'},
+        textprops={'fontsize': 12}
+    )
+
+    # Atur judul
+    ax.set_title('Distribusi Kategori Kesadaran Keamanan Siber', pad=20, fontsize=12)
+
+    ax.axis('equal')
+    return fig
+
+# Fungsi untuk membuat bar variabel
+def create_bar_variabel(avg_nkkst, avg_nkkss, figsize=(6, 5)):
+    fig, ax = plt.subplots(figsize=figsize)
+
+    # Posisi bar di x-axis (lebih rapat)
+    x_pos = [0.4, 1.0]  # Mengurangi jarak dari default [0,1]
+
+    colors = ['blue', 'red']  # Biru dan Oranye
+    bars = ax.bar(x_pos, [avg_nkkst, avg_nkkss],
+                  width=0.5,  # Lebar bar diperbesar
+                  color=colors,
+                  alpha=0.7)
+
+    # Styling
+    ax.set_xticks(x_pos)
+    ax.set_title('Perbandingan Rata-Rata Nilai Kesadaran Keamanan Siber\nBerdasarkan Fokus Area',
+                 fontsize=14, pad=50, loc="left")
+    ax.set_xticklabels(['Keamanan Siber Teknis', 'Keamanan Siber Sosial'], fontsize=10)
+    ax.set_ylim(0, max(avg_nkkst, avg_nkkss) * 1.2)
+
+    # Tambahkan nilai di atas bar
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2, height,
+                f'{height:.2f}',
+                ha='center', va='bottom', fontsize=14)
+
+    # Hapus garis tepi dan tambah grid
+    for spine in ['top', 'right']:
+        ax.spines[spine].set_visible(False)
+    ax.grid(axis='y', color='gray', linestyle='--', linewidth=0.5)
+    ax.set_ylim(0, 100)
+
+    return fig
+
+# Fungsi untuk membuat bar chart NKKST
+def create_bar_chart_NKKST(categories, values, color='blue', figsize=(6, 4)):
+    fig, ax = plt.subplots(figsize=figsize)
+
+    # Mapping nama lengkap indikator
+    indicator_descriptions = KETERANGAN_INDIKATOR
+
+    # Membuat bar chart
+    bars = ax.bar(categories, values, color=color, alpha=0.7)
+
+
+    # Menambahkan nilai di atas bar
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+                f'{height:.1f}',
+                ha='center', va='bottom', fontsize=12)
+
+    # Grid dan styling
+    ax.set_ylim(0, 100)
+    ax.grid(axis='y', color='gray', linestyle='--', linewidth=0.5)
+
+    # Title dan label
+    ax.set_title('Perbandingan Rata-Rata Nilai Kesadaran Keamanan Siber\nBerdasarkan Fokus Area Keamanan Siber Teknis', loc='left', fontsize=12, pad=50)
+    ax.set_xlabel('Indikator')
+    ax.set_ylabel('Nilai')
+    ax.spines['top'].set_visible(False)
+
+    # Membuat legenda kustom
+    legend_elements = [
+        plt.Line2D([0], [0], marker='s', color='w',
+                   label=f'{cat} = {indicator_descriptions[cat]}',
+                   markerfacecolor=color, markersize=10)
+        for cat in categories
+    ]
+
+    # Menambahkan legenda di sebelah kanan
+    ax.legend(
+        handles=legend_elements,
+        loc='center left',
+        bbox_to_anchor=(1, 0.5),
+        frameon=False,
+        fontsize=8
+    )
+
+    plt.tight_layout()
+    return fig
+
+# Fungsi untuk membuat bar chart NKKSS
+def create_bar_chart_NKKSS(categories, values, color='red', figsize=(6, 4)):
+    fig, ax = plt.subplots(figsize=figsize)
+    # Mapping nama lengkap indikator
+    indicator_descriptions = KETERANGAN_INDIKATOR
+
+    # Membuat bar chart
+    bars = ax.bar(categories, values, color=color, alpha=0.7)
+    # Menambahkan nilai di atas bar
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height,
+                f'{height:.1f}',
+                ha='center', va='bottom', fontsize=12)
+
+    # Grid dan styling
+    ax.set_ylim(0, 100)
+    ax.grid(axis='y', color='gray', linestyle='dashed', linewidth=0.5)
+
+    # Title dan label
+    ax.set_title('Perbandingan Rata-Rata Nilai Kesadaran Keamanan Siber\nBerdasarkan Fokus Area Keamanan Siber Sosial', loc='left', fontsize=12, pad=50)
+    ax.set_xlabel('Indikator')
+    ax.set_ylabel('Nilai')
+    ax.spines['top'].set_visible(False)
+    # Membuat legenda kustom
+    legend_elements = [
+        plt.Line2D([0], [0], marker='s', color='w',
+                   label=f'{cat} = {indicator_descriptions[cat]}',
+                   markerfacecolor=color, markersize=10)
+        for cat in categories
+    ]
+
+    # Menambahkan legenda di sebelah kanan
+    ax.legend(
+        handles=legend_elements,
+        loc='center left',
+        bbox_to_anchor=(1, 0.5),
+        frameon=False,
+        fontsize=8
+    )
+
+    plt.tight_layout()
+    return fig
+
+# Fungsi untuk membuat grafik jenis kelamin
+def create_pie_kelamin(distribusi):
+    # Distribusi sudah dinormalisasi oleh demografi.hitung_distribusi_demografi
+    total = distribusi.sum()
+
+    # Buat figure dengan ukuran lebih proporsional
+    fig, ax = plt.subplots(figsize=(8, 4.8), dpi=100)
+
+    # Warna dan label
+    colors = ['#25C4F8', '#F354A9', '#A9A9A9']  # Biru, Pink, Abu-abu (untuk data kosong)
+    labels = distribusi.index
+
+    # Fungsi untuk menampilkan jumlah dan persentase
+    def format_label(pct):
+        absolute = int(round(pct / 100. * total))
+        return f"{absolute}"
+
+    # Buat pie chart
+    wedges, texts, autotexts = ax.pie(
+        distribusi,
+        labels=labels,
+        autopct=format_label,
+        startangle=90,
+        colors=colors[:len(distribusi)],
+        textprops={'fontsize': 14, 'color': 'black'},
+        pctdistance=0.75,
+        wedgeprops={'linewidth': 1, 'edgecolor': 'white'}
+    )
+
+    # Atur style teks
+    plt.setp(autotexts, size=14)
+    plt.setp(texts, size=10)
+
+    # Tambahkan judul
+    ax.set_title('Distribusi Jenis Kelamin Responden',
+                 pad=20, fontsize=14, loc='center')
+
+    # Tambahkan total responden di tengah (donut chart)
+    centre_circle = plt.Circle((0, 0), 0.6, color='white')
+    ax.add_artist(centre_circle)
+    ax.text(0, 0, f"Total:\n{total} Responden",
+            ha='center', va='center',
+            fontsize=12)
+
+    # Atur layout
+    plt.tight_layout()
+    ax.axis('equal')  # Pastikan pie tetap lingkaran
+
+    return fig
+
+# Jumlah tick maksimal sumbu jumlah responden pada grafik batang demografi
+MAKS_TICK_JUMLAH = 16
+
+# Fungsi untuk mengatur tick sumbu x grafik batang demografi: setiap 2 responden seperti
+# semula selama jumlahnya sedikit. Untuk data besar tick setiap 2 responden berarti ribuan
+# label yang membuat render sangat lambat, jadi intervalnya dipilih otomatis (bilangan bulat)
+def atur_sumbu_jumlah(ax, max_count):
+    if max_count + 3 <= 2 * MAKS_TICK_JUMLAH:
+        ax.set_xticks(np.arange(0, max_count + 3, 2))  # +3 untuk memastikan cukup
+        ax.set_xticklabels([str(int(x)) for x in np.arange(0, max_count + 3, 2)])
+    else:
+        ax.xaxis.set_major_locator(MaxNLocator(nbins=MAKS_TICK_JUMLAH // 2, integer=True))
+        ax.set_xlim(0, max_count * 1.1)  # ruang untuk teks jumlah di ujung bar
+
+# Fungsi untuk membuat grafik umur
+def create_bar_umur(distribusi):
+    # Urutkan distribusi
+    distribusi = distribusi.sort_values(ascending=True)
+
+    # Buat figure
+    fig, ax = plt.subplots(figsize=(8, 4.8))
+
+    # Warna untuk bar chart
+    color = '#53E8D4'  # Warna biru standar
+
+    # Buat horizontal bar chart
+    bars = ax.barh(
+        distribusi.index.astype(str),  # Kategori umur sebagai string
+        distribusi.values,  # Jumlah responden
+        color=color,
+        height=0.6  # Tinggi bar
+    )
+
+    # Tambahkan jumlah responden di ujung setiap bar
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width + 0.5,  # Posisi x (jumlah + sedikit spacing)
+                bar.get_y() + bar.get_height() / 2,  # Posisi y di tengah bar
+                f'{int(width)}',  # Teks yang ditampilkan
+                va='center',  # Vertikal alignment
+                ha='left',  # Horizontal alignment
+                fontsize=10)
+
+    # Atur sumbu x dengan interval 2 (dibatasi untuk jumlah responden besar)
+    atur_sumbu_jumlah(ax, distribusi.max())
+
+    # Atur label dan judul
+    ax.set_xlabel('Jumlah Responden', fontsize=12)
+    ax.set_title('Distribusi Umur Responden', pad=20, fontsize=14, loc='left')
+
+    # Hilangkan spines (garis tepi) yang tidak perlu
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    # Atur grid untuk memudahkan pembacaan
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+
+    # Auto adjust layout
+    plt.tight_layout()
+
+    return fig
+
+# Fungsi untuk membuat grafik tingkat pendidikan
+def create_bar_pendidikan(distribusi):
+    # Urutkan distribusi
+    distribusi = distribusi.sort_values(ascending=True)
+
+    # Buat figure
+    fig, ax = plt.subplots(figsize=(8, 4.8))
+
+    # Warna untuk bar chart
+    color = '#F0533C'  # Warna biru standar
+
+    # Buat horizontal bar chart
+    bars = ax.barh(
+        distribusi.index.astype(str),  # Kategori umur sebagai string
+        distribusi.values,  # Jumlah responden
+        color=color,
+        height=0.6  # Tinggi bar
+    )
+
+    # Tambahkan jumlah responden di ujung setiap bar
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width + 0.5,  # Posisi x (jumlah + sedikit spacing)
+                bar.get_y() + bar.get_height() / 2,  # Posisi y di tengah bar
+                f'{int(width)}',  # Teks yang ditampilkan
+                va='center',  # Vertikal alignment
+                ha='left',  # Horizontal alignment
+                fontsize=10)
+
+    # Atur sumbu x dengan interval 2 (dibatasi untuk jumlah responden besar)
+    atur_sumbu_jumlah(ax, distribusi.max())
+
+    # Atur label dan judul
+    ax.set_xlabel('Jumlah Responden', fontsize=12)
+    ax.set_title('Distribusi Tingkat Pendidikan Responden', pad=20, fontsize=14, loc='left')
+
+    # Hilangkan spines (garis tepi) yang tidak perlu
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    # Atur grid untuk memudahkan pembacaan
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+
+    # Auto adjust layout
+    plt.tight_layout()
+
+    return fig
+
+# Fungsi untuk membuat grafik domisili
+def create_bar_domisili(distribusi):
+    # Urutkan distribusi
+    distribusi = distribusi.sort_values(ascending=True)
+
+    # Buat figure
+    fig, ax = plt.subplots(figsize=(8, 4.8))
+
+    # Warna untuk bar chart
+    color = '#8921C2'  # Warna biru standar
+
+    # Buat horizontal bar chart
+    bars = ax.barh(
+        distribusi.index.astype(str),  # Kategori umur sebagai string
+        distribusi.values,  # Jumlah responden
+        color=color,
+        height=0.6  # Tinggi bar
+    )
+
+    # Tambahkan jumlah responden di ujung setiap bar
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width + 0.5,  # Posisi x (jumlah + sedikit spacing)
+                bar.get_y() + bar.get_height() / 2,  # Posisi y di tengah bar
+                f'{int(width)}',  # Teks yang ditampilkan
+                va='center',  # Vertikal alignment
+                ha='left',  # Horizontal alignment
+                fontsize=10)
+
+    # Atur sumbu x dengan interval 2 (dibatasi untuk jumlah responden besar)
+    atur_sumbu_jumlah(ax, distribusi.max())
+
+    # Atur label dan judul
+    ax.set_xlabel('Jumlah Responden', fontsize=12)
+    ax.set_title('Distribusi Domisili Responden', pad=20, fontsize=14, loc='left')
+
+    # Hilangkan spines (garis tepi) yang tidak perlu
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    # Atur grid untuk memudahkan pembacaan
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
+
+    # Auto adjust layout
+    plt.tight_layout()
+
+    return fig
+
+# Daftar pembuat grafik yang bisa dirender lewat render_paralel
+PEMBUAT_GRAFIK = {
+    'index': create_bar_index,
+    'pie_kategori': create_pie_kategori,
+    'variabel': create_bar_variabel,
+    'nkkst': create_bar_chart_NKKST,
+    'nkkss': create_bar_chart_NKKSS,
+    'kelamin': create_pie_kelamin,
+    'umur': create_bar_umur,
+    'pendidikan': create_bar_pendidikan,
+    'domisili': create_bar_domisili,
+}
+
+# pyplot menyimpan figure di state global yang tidak aman dipakai bersamaan
+# oleh beberapa sesi, jadi proses render dijalankan satu per satu
+_lock_render = threading.Lock()
+_cache_render = None
+
+# Penghitung statistik render diubah dari beberapa thread sesi, jadi selalu diubah
+# sambil memegang _lock_render
+STATISTIK_RENDER = {'hit': 0, 'miss': 0, 'jumlah_render': 0, 'waktu_render': 0.0}
+
+# Penanda gambar tidak ada di cache (None berarti grafik tanpa data)
+_TIDAK_ADA = object()
+
+# Fungsi untuk mengambil cache gambar grafik (dibuat sekali per proses)
+def ambil_cache_render():
+    global _cache_render
+    if _cache_render is None:
+        direktori = None
+        if konfigurasi.DIREKTORI_CACHE:
+            direktori = os.path.join(konfigurasi.DIREKTORI_CACHE, "grafik")
+        _cache_render = CacheHasil(batas_memori_mb=konfigurasi.BATAS_CACHE_GRAFIK_MB,
+                                   direktori=direktori,
+                                   batas_disk_mb=konfigurasi.BATAS_DISK_CACHE_MB)
+    return _cache_render
+
+# Fungsi untuk menyimpan figure ke bytes (PNG/SVG) lalu menutupnya
+def simpan_figure(fig, format_gambar="png"):
+    try:
+        buf = BytesIO()
+        fig.savefig(buf, format=format_gambar, bbox_inches="tight", dpi=200)
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+# Fungsi untuk membuat satu grafik dan langsung mengubahnya menjadi bytes
+def gambar_grafik(jenis, *args, format_gambar="png", **kwargs):
+    with _lock_render:
+        sebelum = set(plt.get_fignums())
+        try:
+            fig = PEMBUAT_GRAFIK[jenis](*args, **kwargs)
+            return None if fig is None else simpan_figure(fig, format_gambar)
+        finally:
+            # Tutup juga figure yang tertinggal jika pembuat grafik gagal di tengah jalan
+            for nomor in set(plt.get_fignums()) - sebelum:
+                plt.close(nomor)
+
+# Fungsi untuk membuat kunci cache gambar dari jenis grafik, data, figsize dan format
+def _kunci_render(jenis, args, kwargs, format_gambar):
+    return f"{jenis}/{digest_data((tuple(args), kwargs))}/{kwargs.get('figsize')}/{format_gambar}"
+
+# Fungsi untuk membuat spesifikasi grafik (data yang dibutuhkan fungsi create_*)
+def spesifikasi(jenis, *args, **kwargs):
+    return (jenis, args, kwargs)
+
+# Fungsi untuk menyusun spesifikasi semua grafik dashboard dari ringkasan penilaian
+def spesifikasi_dashboard(hasil):
+    avg_dict = hasil['rata_rata']
+    daftar = {
+        'index': spesifikasi('index', avg_dict['NKI']),
+        'pie_kategori': spesifikasi('pie_kategori', hasil['distribusi_kategori']),
+        'variabel': spesifikasi('variabel', avg_dict['NKKST'], avg_dict['NKKSS'], figsize=(7, 5.2)),
+        'nkkst': spesifikasi('nkkst', INDIKATOR_TEKNIS,
+                             [avg_dict[i + 'TOTAL'] for i in INDIKATOR_TEKNIS], figsize=(7, 5.1)),
+        'nkkss': spesifikasi('nkkss', INDIKATOR_SOSIAL,
+                             [avg_dict[i + 'TOTAL'] for i in INDIKATOR_SOSIAL], figsize=(7, 5.1)),
+    }
+    # Grafik demografi hanya dibuat jika kolomnya ada di data
+    for jenis, kolom in [('kelamin', 'JENIS KELAMIN'), ('umur', 'UMUR'),
+                         ('pendidikan', 'TINGKAT PENDIDIKAN'), ('domisili', 'PROVINSI')]:
+        if kolom in hasil['demografi']:
+            daftar[jenis] = spesifikasi(jenis, hasil['demografi'][kolom])
+    return daftar
+
+_pool = None
+_jumlah_worker_pool = 0
+_lock_pool = threading.Lock()
+# Antrean tempat setiap worker pool melaporkan pid-nya, dipakai _reset_pool untuk
+# menghentikan worker tanpa mengakses atribut internal ProcessPoolExecutor
+_antrean_pid = None
+
+# Initializer worker pool: laporkan pid proses worker ke proses utama
+def _lapor_pid(antrean):
+    antrean.put(os.getpid())
+
+# Fungsi untuk mengambil process pool render (dibuat sekali dan dipakai ulang antar rerun)
+def ambil_pool(jumlah_worker):
+    global _pool, _jumlah_worker_pool, _antrean_pid
+    with _lock_pool:
+        if _pool is None or _jumlah_worker_pool != jumlah_worker:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # spawn dipakai karena server Streamlit berjalan dengan banyak thread
+            konteks = multiprocessing.get_context("spawn")
+            _antrean_pid = konteks.SimpleQueue()
+            _pool = ProcessPoolExecutor(max_workers=jumlah_worker, mp_context=konteks,
+                                        initializer=_lapor_pid, initargs=(_antrean_pid,))
+            _jumlah_worker_pool = jumlah_worker
+        return _pool
+
+# Fungsi untuk membuang pool render. shutdown tidak menghentikan render yang sedang
+# berjalan, jadi proses worker (pid dari _lapor_pid) dihentikan langsung agar render yang
+# macet (melebihi timeout) tidak terus menempati worker; pool baru dibuat pada
+# pemanggilan berikutnya
+def _reset_pool():
+    global _pool, _antrean_pid
+    with _lock_pool:
+        pool, _pool = _pool, None
+        antrean, _antrean_pid = _antrean_pid, None
+    if pool is None:
+        return
+    while not antrean.empty():
+        try:
+            os.kill(antrean.get(), signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    antrean.close()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+# Render satu grafik (di proses worker atau langsung), hasilnya (gambar, waktu wall,
+# waktu CPU) untuk instrumentasi dan statistik render
+def _render_di_worker(jenis, args, kwargs, format_gambar):
+    mulai, mulai_cpu = time.perf_counter(), time.thread_time()
+    gambar = gambar_grafik(jenis, *args, format_gambar=format_gambar, **kwargs)
+    return gambar, time.perf_counter() - mulai, time.thread_time() - mulai_cpu
+
+# Statistik render dihitung di proses utama dari waktu yang dikembalikan _render_di_worker,
+# karena penghitung di proses worker tidak terlihat dari proses utama
+def _catat_render(waktu):
+    with _lock_render:
+        STATISTIK_RENDER['jumlah_render'] += 1
+        STATISTIK_RENDER['waktu_render'] += waktu
+
+# Fungsi untuk merender banyak grafik sekaligus di process pool.
+# Hasilnya list sesuai urutan spesifikasi: bytes gambar, None (tidak ada data),
+# atau objek Exception jika render gagal/melebihi timeout
+@diukur
+def render_paralel(daftar_spesifikasi, jumlah_worker=None, timeout=None,
+                   format_gambar="png", pakai_cache=True):
+    jumlah_worker = konfigurasi.JUMLAH_WORKER_GRAFIK if jumlah_worker is None else jumlah_worker
+    timeout = konfigurasi.TIMEOUT_GRAFIK if timeout is None else timeout
+    cache = ambil_cache_render()
+    hasil = [None] * len(daftar_spesifikasi)
+    kunci = [_kunci_render(jenis, args, kwargs, format_gambar)
+             for jenis, args, kwargs in daftar_spesifikasi]
+
+    # Ambil yang sudah ada di cache, sisanya dirender. Cache cukup dibaca sekali, karena
+    # gambar bisa dibuang sesi lain di antara pemeriksaan dan pengambilan
+    belum = []
+    for i, k in enumerate(kunci):
+        gambar = cache.ambil(k, _TIDAK_ADA) if pakai_cache else _TIDAK_ADA
+        if gambar is not _TIDAK_ADA:
+            hasil[i] = gambar
+            catat(f"grafik_{daftar_spesifikasi[i][0]}", 0.0, 0.0, keterangan="cache")
+        else:
+            belum.append(i)
+    with _lock_render:
+        STATISTIK_RENDER['hit'] += len(kunci) - len(belum)
+        STATISTIK_RENDER['miss'] += len(belum)
+
+    if jumlah_worker <= 1 or len(belum) <= 1:
+        for i in belum:
+            jenis, args, kwargs = daftar_spesifikasi[i]
+            try:
+                with ukur_tahap(f"grafik_{jenis}", keterangan=format_gambar):
+                    hasil[i], waktu, _ = _render_di_worker(jenis, args, kwargs, format_gambar)
+            except Exception as e:
+                hasil[i] = e
+                continue
+            _catat_render(waktu)
+            cache.simpan(kunci[i], hasil[i])
+        return hasil
+
+    try:
+        pool = ambil_pool(jumlah_worker)
+        futures = {pool.submit(_render_di_worker, *daftar_spesifikasi[i], format_gambar): i
+                   for i in belum}
+    except BrokenProcessPool:
+        _reset_pool()
+        return render_paralel(daftar_spesifikasi, 1, timeout, format_gambar, pakai_cache)
+
+    selesai, tertunda = wait(futures, timeout=timeout)
+    for future in tertunda:
+        jenis = daftar_spesifikasi[futures[future]][0]
+        hasil[futures[future]] = TimeoutError(f"Render grafik '{jenis}' melebihi {timeout} detik")
+    # Render yang sudah berjalan tidak bisa dibatalkan lewat future.cancel()
+    if not all([future.cancel() for future in tertunda]):
+        _reset_pool()
+    for future in selesai:
+        i = futures[future]
+        try:
+            hasil[i], waktu, waktu_cpu = future.result()
+            catat(f"grafik_{daftar_spesifikasi[i][0]}", waktu, waktu_cpu, keterangan=f"{format_gambar} worker")
+            _catat_render(waktu)
+        except BrokenProcessPool as e:
+            _reset_pool()
+            hasil[i] = e
+            continue
+        except Exception as e:
+            hasil[i] = e
+            continue
+        cache.simpan(kunci[i], hasil[i])
+    return hasil
+
+# Fungsi untuk melihat statistik render (hit cache, waktu render, figure yang masih terbuka)
+def statistik_render():
+    statistik = dict(STATISTIK_RENDER)
+    statistik['figure_hidup'] = len(plt.get_fignums())
+    return statistik
+
+daftarkan_metrik('grafik', statistik_render, counter=STATISTIK_RENDER)
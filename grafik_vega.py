@@ -0,0 +1,302 @@
+import math
+
+from cache_hasil import digest_data
+from grafik import KETERANGAN_INDIKATOR, ambil_cache_render
+from instrumentasi import diukur, ukur_tahap
+
+
+# Grafik mode klien: server hanya mengirim spesifikasi Vega-Lite berisi data agregat
+# (rata-rata indikator, jumlah per kategori/demografi) dan browser yang merendernya.
+# Tata letak dan warna mengikuti fungsi create_* di grafik.py. Spesifikasi disusun
+# langsung sebagai dict (bentuk yang sama dengan hasil Chart.to_dict() Altair), karena
+# membuat objek Altair sendiri memakan puluhan milidetik CPU server per grafik
+
+# Segmen gauge NKI: (awal, akhir, warna, kategori)
+SEGMEN_GAUGE = [
+    (0, 25, '#ec204f', 'Buruk'),
+    (25, 50, '#feed47', 'Kurang Baik'),
+    (50, 80, '#8de45f', 'Baik'),
+    (80, 100, '#2ecf03', 'Sangat Baik'),
+]
+
+# Warna kategori NKI pada pie chart
+WARNA_KATEGORI = {
+    'Sangat Baik': '#4CAF50',
+    'Baik': '#8BC34A',
+    'Kurang Baik': '#FFC107',
+    'Buruk': '#F44336',
+}
+
+# Warna donut jenis kelamin (urut dari jumlah terbanyak) dan grafik batang demografi
+WARNA_KELAMIN = ['#25C4F8', '#F354A9', '#A9A9A9']
+WARNA_DEMOGRAFI = {'umur': '#53E8D4', 'pendidikan': '#F0533C', 'domisili': '#8921C2'}
+
+# Skala sudut gauge: nilai 0 di kiri, 100 di kanan (setengah lingkaran atas)
+SKALA_GAUGE = {'domain': [0, 100], 'range': [-math.pi / 2, math.pi / 2]}
+
+# Tampilan tanpa bingkai untuk grafik lingkaran dan batang horizontal
+TANPA_BINGKAI = {'view': {'strokeWidth': 0}}
+
+
+# Tinggi grafik (piksel) dari figsize matplotlib (inci); lebar mengikuti kolom Streamlit
+def _tinggi(figsize, default):
+    return int((figsize or default)[1] * 65)
+
+def _judul(teks, anchor='middle'):
+    return {'text': teks.split('\n'), 'anchor': anchor, 'fontSize': 14, 'fontWeight': 'normal'}
+
+# Encoding satu field, misalnya _field('jumlah', 'Q') -> {'field': 'jumlah', 'type': 'quantitative'}
+def _field(nama, tipe, **lain):
+    return {'field': nama, 'type': {'Q': 'quantitative', 'N': 'nominal'}[tipe], **lain}
+
+# Satu lapisan grafik; data dipakai jika lapisan tidak memakai data grafik induknya
+def _lapisan(mark, encoding, data=None):
+    lapisan = {'mark': mark, 'encoding': encoding}
+    if data is not None:
+        lapisan['data'] = {'values': data}
+    return lapisan
+
+# Fungsi untuk membuat gauge NKI (setara create_bar_index)
+def vega_index(index_value, figsize=None):
+    tinggi = _tinggi(figsize, (8, 4))
+    radius = tinggi - 70
+    pusat = {'x': {'expr': 'width / 2'}, 'y': {'expr': 'height - 40'}}
+    segmen = [{'awal': awal, 'akhir': akhir, 'tengah': (awal + akhir) / 2, 'warna': warna, 'kategori': kategori,
+               'sudut': 1.8 * (awal + akhir) / 2 - 90, 'nilai': str(akhir)}
+              for awal, akhir, warna, kategori in SEGMEN_GAUGE]
+
+    def sudut(nama):
+        return _field(nama, 'Q', scale=SKALA_GAUGE, stack=None)
+
+    return {
+        'height': tinggi,
+        'title': _judul('Nilai Rata-Rata Kesadaran Keamanan Siber'),
+        'layer': [
+            _lapisan({'type': 'arc', 'innerRadius': radius * 0.6, 'outerRadius': radius, **pusat},
+                     {'theta': sudut('awal'), 'theta2': {'field': 'akhir'},
+                      'color': _field('warna', 'N', scale=None), 'tooltip': [_field('kategori', 'N')]}, segmen),
+            _lapisan({'type': 'text', 'radius': radius * 0.8, 'fontSize': 12, **pusat},
+                     {'theta': sudut('tengah'), 'angle': _field('sudut', 'Q', scale=None),
+                      'text': _field('kategori', 'N')}, segmen),
+            _lapisan({'type': 'text', 'radius': radius + 12, 'fontSize': 12, 'fontWeight': 'bold', **pusat},
+                     {'theta': sudut('akhir'), 'text': _field('nilai', 'N')}, segmen),
+            # Jarum: busur tipis dari pusat ke arah nilai
+            _lapisan({'type': 'arc', 'innerRadius': 0, 'outerRadius': radius * 0.6, 'color': 'black', **pusat},
+                     {'theta': sudut('awal'), 'theta2': {'field': 'akhir'}},
+                     [{'awal': index_value - 1, 'akhir': index_value + 1}]),
+            _lapisan({'type': 'circle', 'size': 120, 'color': 'black', 'opacity': 1, **pusat}, {}, [{}]),
+            _lapisan({'type': 'text', 'fontSize': 30, 'fontWeight': 'bold',
+                      'x': {'expr': 'width / 2'}, 'y': {'expr': 'height - 10'}},
+                     {'text': _field('teks', 'N')}, [{'teks': f"{index_value:.2f}"}]),
+        ],
+        'config': TANPA_BINGKAI,
+    }
+
+# Fungsi untuk membuat pie chart kategori NKI (setara create_pie_kategori)
+def vega_pie_kategori(distribusi_kategori, figsize=None):
+    baris = [{'kategori': kategori, 'jumlah': int(jumlah), 'label': f"{kategori} ({jumlah} Responden)"}
+             for kategori, jumlah in distribusi_kategori.items() if jumlah > 0]
+    if not baris:
+        return None
+    tinggi = _tinggi(figsize, (8, 4))
+    radius = tinggi / 2 - 30
+    total = sum(b['jumlah'] for b in baris)
+    for i, b in enumerate(baris):
+        b['urutan'] = i
+        # Persentase disembunyikan jika hanya ada satu kategori
+        b['persen'] = f"{b['jumlah'] / total * 100:.1f}%" if len(baris) > 1 else ""
+    label = [b['label'] for b in baris]
+
+    dasar = {'theta': _field('jumlah', 'Q', stack=True), 'order': _field('urutan', 'Q')}
+    return {
+        'height': tinggi,
+        'title': _judul('Distribusi Kategori Kesadaran Keamanan Siber'),
+        'data': {'values': baris},
+        'layer': [
+            _lapisan({'type': 'arc', 'outerRadius': radius, 'stroke': 'white', 'strokeWidth': 1},
+                     {**dasar, 'color': _field('label', 'N', sort=label, title=None, scale={
+                         'domain': label, 'range': [WARNA_KATEGORI[b['kategori']] for b in baris]}),
+                      'tooltip': [_field('kategori', 'N'), _field('jumlah', 'Q'), _field('persen', 'N')]}),
+            _lapisan({'type': 'text', 'radius': radius * 0.6, 'fontSize': 12},
+                     {**dasar, 'text': _field('persen', 'N')}),
+        ],
+        'config': TANPA_BINGKAI,
+    }
+
+# Fungsi untuk membuat grafik batang NKKST dan NKKSS (setara create_bar_variabel)
+def vega_variabel(avg_nkkst, avg_nkkss, figsize=None):
+    baris = [{'fokus': 'Keamanan Siber Teknis', 'nilai': float(avg_nkkst), 'warna': 'blue'},
+             {'fokus': 'Keamanan Siber Sosial', 'nilai': float(avg_nkkss), 'warna': 'red'}]
+    dasar = {'x': _field('fokus', 'N', sort=None, title=None, axis={'labelAngle': 0}),
+             'y': _field('nilai', 'Q', scale={'domain': [0, 100]}, title=None, axis={'gridDash': [4, 4]})}
+    return {
+        'height': _tinggi(figsize, (6, 5)),
+        'title': _judul('Perbandingan Rata-Rata Nilai Kesadaran Keamanan Siber\nBerdasarkan Fokus Area', 'start'),
+        'data': {'values': baris},
+        'layer': [
+            _lapisan({'type': 'bar', 'opacity': 0.7, 'size': 60},
+                     {**dasar, 'color': _field('warna', 'N', scale=None),
+                      'tooltip': [_field('fokus', 'N'), _field('nilai', 'Q', format='.2f')]}),
+            _lapisan({'type': 'text', 'dy': -10, 'fontSize': 14},
+                     {**dasar, 'text': _field('nilai', 'Q', format='.2f')}),
+        ],
+    }
+
+# Fungsi untuk membuat grafik batang indikator satu fokus area dengan legenda keterangan kode
+def _vega_indikator(categories, values, color, judul, figsize):
+    baris = [{'kode': kode, 'nilai': float(nilai), 'keterangan': f"{kode} = {KETERANGAN_INDIKATOR[kode]}"}
+             for kode, nilai in zip(categories, values)]
+    dasar = {'x': _field('kode', 'N', sort=None, title='Indikator', axis={'labelAngle': 0}),
+             'y': _field('nilai', 'Q', scale={'domain': [0, 100]}, title='Nilai', axis={'gridDash': [4, 4]})}
+    return {
+        'height': _tinggi(figsize, (6, 4)),
+        'title': _judul(judul, 'start'),
+        'data': {'values': baris},
+        'layer': [
+            _lapisan({'type': 'bar', 'opacity': 0.7},
+                     {**dasar, 'color': _field('keterangan', 'N', sort=None, title=None, scale={'range': [color]},
+                                               legend={'orient': 'right', 'symbolType': 'square',
+                                                       'labelFontSize': 9, 'labelLimit': 300}),
+                      'tooltip': [_field('keterangan', 'N'), _field('nilai', 'Q', format='.1f')]}),
+            _lapisan({'type': 'text', 'dy': -8, 'fontSize': 12},
+                     {**dasar, 'text': _field('nilai', 'Q', format='.1f')}),
+        ],
+    }
+
+# Fungsi untuk membuat grafik batang indikator teknis (setara create_bar_chart_NKKST)
+def vega_nkkst(categories, values, color='blue', figsize=None):
+    return _vega_indikator(categories, values, color, 'Perbandingan Rata-Rata Nilai Kesadaran Keamanan Siber\n'
+                           'Berdasarkan Fokus Area Keamanan Siber Teknis', figsize)
+
+# Fungsi untuk membuat grafik batang indikator sosial (setara create_bar_chart_NKKSS)
+def vega_nkkss(categories, values, color='red', figsize=None):
+    return _vega_indikator(categories, values, color, 'Perbandingan Rata-Rata Nilai Kesadaran Keamanan Siber\n'
+                           'Berdasarkan Fokus Area Keamanan Siber Sosial', figsize)
+
+# Fungsi untuk membuat donut jenis kelamin (setara create_pie_kelamin)
+def vega_kelamin(distribusi, figsize=None):
+    tinggi = _tinggi(figsize, (8, 4.8))
+    radius = tinggi / 2 - 40
+    baris = [{'kategori': str(kategori), 'jumlah': int(jumlah), 'urutan': i}
+             for i, (kategori, jumlah) in enumerate(distribusi.items())]
+    kategori = [b['kategori'] for b in baris]
+
+    dasar = {'theta': _field('jumlah', 'Q', stack=True), 'order': _field('urutan', 'Q')}
+    return {
+        'height': tinggi,
+        'title': _judul('Distribusi Jenis Kelamin Responden'),
+        'data': {'values': baris},
+        'layer': [
+            _lapisan({'type': 'arc', 'innerRadius': radius * 0.6, 'outerRadius': radius,
+                      'stroke': 'white', 'strokeWidth': 1},
+                     {**dasar, 'color': _field('kategori', 'N', sort=kategori, legend=None,
+                                               scale={'domain': kategori, 'range': WARNA_KELAMIN}),
+                      'tooltip': [_field('kategori', 'N'), _field('jumlah', 'Q')]}),
+            _lapisan({'type': 'text', 'radius': radius * 0.8, 'fontSize': 14},
+                     {**dasar, 'text': _field('jumlah', 'Q')}),
+            _lapisan({'type': 'text', 'radius': radius + 20, 'fontSize': 11},
+                     {**dasar, 'text': _field('kategori', 'N')}),
+            # Total responden di tengah donut
+            _lapisan({'type': 'text', 'fontSize': 12, 'lineBreak': '\n'}, {'text': _field('teks', 'N')},
+                     [{'teks': f"Total:\n{int(distribusi.sum())} Responden"}]),
+        ],
+        'config': TANPA_BINGKAI,
+    }
+
+# Fungsi untuk membuat grafik batang horizontal satu kolom demografi
+def _vega_demografi(distribusi, warna, judul, figsize):
+    baris = [{'kategori': str(kategori), 'jumlah': int(jumlah)} for kategori, jumlah in distribusi.items()]
+    dasar = {'y': _field('kategori', 'N', sort='-x', title=None),
+             'x': _field('jumlah', 'Q', title='Jumlah Responden',
+                         axis={'tickMinStep': 1, 'format': 'd', 'gridDash': [4, 4], 'gridOpacity': 0.7})}
+    return {
+        'height': _tinggi(figsize, (8, 4.8)),
+        'title': _judul(judul, 'start'),
+        'data': {'values': baris},
+        'layer': [
+            _lapisan({'type': 'bar', 'color': warna, 'size': 20},
+                     {**dasar, 'tooltip': [_field('kategori', 'N'), _field('jumlah', 'Q')]}),
+            _lapisan({'type': 'text', 'align': 'left', 'dx': 4, 'fontSize': 10},
+                     {**dasar, 'text': _field('jumlah', 'Q')}),
+        ],
+        'config': TANPA_BINGKAI,
+    }
+
+# Fungsi untuk membuat grafik umur (setara create_bar_umur)
+def vega_umur(distribusi, figsize=None):
+    return _vega_demografi(distribusi, WARNA_DEMOGRAFI['umur'], 'Distribusi Umur Responden', figsize)
+
+# Fungsi untuk membuat grafik tingkat pendidikan (setara create_bar_pendidikan)
+def vega_pendidikan(distribusi, figsize=None):
+    return _vega_demografi(distribusi, WARNA_DEMOGRAFI['pendidikan'], 'Distribusi Tingkat Pendidikan Responden',
+                           figsize)
+
+# Fungsi untuk membuat grafik domisili (setara create_bar_domisili)
+def vega_domisili(distribusi, figsize=None):
+    return _vega_demografi(distribusi, WARNA_DEMOGRAFI['domisili'], 'Distribusi Domisili Responden', figsize)
+
+# Daftar pembuat spesifikasi Vega-Lite, dengan jenis grafik yang sama seperti PEMBUAT_GRAFIK
+PEMBUAT_VEGA = {
+    'index': vega_index,
+    'pie_kategori': vega_pie_kategori,
+    'variabel': vega_variabel,
+    'nkkst': vega_nkkst,
+    'nkkss': vega_nkkss,
+    'kelamin': vega_kelamin,
+    'umur': vega_umur,
+    'pendidikan': vega_pendidikan,
+    'domisili': vega_domisili,
+}
+
+def _buat_diukur(jenis, args, kwargs):
+    with ukur_tahap(f"grafik_{jenis}", keterangan="vega"):
+        return PEMBUAT_VEGA[jenis](*args, **kwargs)
+
+# Fungsi untuk membuat spesifikasi Vega-Lite banyak grafik (pengganti render_paralel pada
+# mode klien). Hasilnya list sesuai urutan spesifikasi: dict Vega-Lite, None (tidak ada
+# data) atau objek Exception. Spesifikasi disimpan di cache grafik per digest data
+@diukur
+def render_vega(daftar_spesifikasi, pakai_cache=True):
+    cache = ambil_cache_render()
+    hasil = []
+    for jenis, args, kwargs in daftar_spesifikasi:
+        kunci = f"vega/{jenis}/{digest_data((tuple(args), kwargs))}"
+        try:
+            if pakai_cache:
+                hasil.append(cache.ambil_atau_hitung(kunci, lambda: _buat_diukur(jenis, args, kwargs)))
+            else:
+                hasil.append(_buat_diukur(jenis, args, kwargs))
+        except Exception as e:
+            hasil.append(e)
+    return hasil
+
+# Fungsi untuk membuat grafik garis tren per gelombang dari hasil RiwayatPenilaian.tren.
+# Setiap kolom nilai (dan setiap nilai dimensi per, jika diisi) menjadi satu garis.
+# Grafik ini selalu dirender di browser pada kedua mode grafik karena datanya hanya
+# beberapa titik per gelombang dan perlu tooltip per titik
+def vega_tren(tabel, daftar_kolom, per=None, figsize=None):
+    urutan = list(dict.fromkeys(tabel['gelombang']))
+    baris = []
+    for rekaman in tabel.to_dict('records'):
+        for kolom in daftar_kolom:
+            if math.isnan(rekaman[kolom]):
+                # Nilai kosong (indikator belum ada pada gelombang itu) tidak digambar
+                continue
+            seri = kolom if not per else rekaman[per] if len(daftar_kolom) == 1 else f"{kolom} · {rekaman[per]}"
+            baris.append({'gelombang': rekaman['gelombang'], 'seri': seri, 'nilai': float(rekaman[kolom]),
+                          'responden': int(rekaman['jumlah_responden']), 'tanggal': rekaman['tanggal']})
+    if not baris:
+        return None
+    return {
+        'height': _tinggi(figsize, (8, 5)),
+        'title': _judul('Tren Nilai Kesadaran Keamanan Siber per Gelombang', 'start'),
+        'data': {'values': baris},
+        'mark': {'type': 'line', 'point': True},
+        'encoding': {
+            'x': _field('gelombang', 'N', sort=urutan, title='Gelombang', axis={'labelAngle': 0}),
+            'y': _field('nilai', 'Q', scale={'domain': [0, 100]}, title='Nilai Rata-Rata', axis={'gridDash': [4, 4]}),
+            'color': _field('seri', 'N', title=None, legend={'orient': 'right', 'labelLimit': 300}),
+            'tooltip': [_field('gelombang', 'N'), _field('tanggal', 'N'), _field('seri', 'N'),
+                        _field('nilai', 'Q', format='.2f'), _field('responden', 'Q')],
+        },
+    }
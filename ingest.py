@@ -0,0 +1,234 @@
+import itertools
+import operator
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+import konfigurasi
+from demografi import normalisasi_demografi
+from instrumentasi import diukur
+from penilaian import BUKU_ATURAN, KODE_PERTANYAAN
+from skema import BARIS_SAMPEL, periksa_jawaban, resolusi_skema
+
+
+# Kolom demografi yang dipakai tabel responden dan grafik
+KOLOM_DEMOGRAFI = ['NAMA', 'INSTANSI', 'JENIS KELAMIN', 'UMUR', 'TINGKAT PENDIDIKAN', 'PROVINSI']
+
+# Kolom demografi yang nilainya berulang sehingga lebih hemat disimpan sebagai kategori
+KOLOM_DEMOGRAFI_KATEGORI = ['INSTANSI', 'JENIS KELAMIN', 'UMUR', 'TINGKAT PENDIDIKAN', 'PROVINSI']
+
+FORMAT_DIDUKUNG = {
+    '.xlsx': 'excel',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+
+# Fungsi untuk memilih engine pembaca Excel tercepat yang terpasang
+def engine_excel():
+    if konfigurasi.ENGINE_EXCEL != 'auto':
+        return konfigurasi.ENGINE_EXCEL
+    try:
+        import python_calamine  # noqa: F401
+        return 'calamine'
+    except ImportError:
+        return 'openpyxl'
+
+# Fungsi untuk menentukan format file dari namanya
+def tentukan_format(nama_file):
+    ekstensi = os.path.splitext(nama_file or '')[1].lower()
+    if ekstensi not in FORMAT_DIDUKUNG:
+        raise ValueError(f"Format file '{ekstensi or nama_file}' tidak didukung, "
+                         f"gunakan salah satu dari: {', '.join(sorted(FORMAT_DIDUKUNG))}")
+    return FORMAT_DIDUKUNG[ekstensi]
+
+# Fungsi untuk menyamakan penulisan nama kolom (huruf besar, tanpa spasi berlebih)
+def _normalisasi_header(nama):
+    return ' '.join(str(nama).upper().split())
+
+# Fungsi untuk menentukan posisi kolom yang perlu dibaca dari daftar header file dan
+# contoh isinya (sampel: DataFrame baris pertama file, urutan kolom sama seperti header).
+# Hasilnya rencana {posisi: nama kolom} dan hasil pencocokan skema untuk laporan
+def rencana_kolom(header, sampel=None):
+    header = list(header)
+    if not header:
+        raise ValueError("File tidak memiliki header kolom")
+
+    # Kolom pertama (Timestamp) dipakai sebagai ID responden
+    rencana = {0: header[0]}
+
+    # Kolom demografi dicari berdasarkan nama, kolom jawaban dicocokkan dengan buku aturan
+    header_normal = [_normalisasi_header(h) for h in header]
+    for nama in KOLOM_DEMOGRAFI:
+        if nama in header_normal:
+            rencana[header_normal.index(nama)] = nama
+    skema = resolusi_skema(header, BUKU_ATURAN, kolom_tetap=rencana, sampel=sampel)
+    if not skema.valid:
+        raise ValueError(skema.pesan_error())
+    for kode, posisi in skema.indeks.items():
+        rencana[posisi] = kode
+    return rencana, skema
+
+# Fungsi untuk menyimpan laporan skema pada DataFrame. Kolom jawaban yang sebagian besar
+# isinya tidak dikenali buku aturan menghentikan ingest agar tidak dinilai sebagai skor 0;
+# kolom dengan sedikit jawaban terisi hanya ditambahkan ke peringatan laporan
+def lampirkan_laporan(df, skema):
+    masalah, peringatan = periksa_jawaban(df, BUKU_ATURAN)
+    if masalah:
+        raise ValueError(masalah[0])
+    laporan = skema.laporan()
+    laporan['peringatan'] += peringatan
+    df.attrs['skema'] = laporan
+    return df
+
+# Fungsi untuk mengubah kolom hasil baca menjadi tipe data yang dipakai penilaian
+def bentuk_data(df_mentah, rencana):
+    posisi = sorted(rencana)
+    df = df_mentah.copy(deep=False)
+    df.columns = [rencana[p] for p in posisi]
+
+    for kolom in df.columns:
+        if kolom in KODE_PERTANYAAN or kolom in KOLOM_DEMOGRAFI_KATEGORI:
+            df[kolom] = df[kolom].astype('category')
+
+    # Urutan kolom: ID responden, demografi, lalu jawaban
+    urutan = [rencana[0]] + [k for k in KOLOM_DEMOGRAFI if k in df.columns] + KODE_PERTANYAAN
+    return normalisasi_demografi(df[urutan].reset_index(drop=True))
+
+# Fungsi untuk membaca header dan BARIS_SAMPEL baris pertama file tanpa memuat seluruh isi
+def baca_header(sumber, format_file):
+    if format_file == 'csv':
+        sampel = pd.read_csv(sumber, nrows=BARIS_SAMPEL)
+    else:
+        import pyarrow.parquet as pq
+        batch = next(pq.ParquetFile(sumber).iter_batches(batch_size=BARIS_SAMPEL), None)
+        if hasattr(sumber, 'seek'):
+            sumber.seek(0)
+        sampel = batch.to_pandas() if batch is not None else pd.DataFrame(columns=pq.read_schema(sumber).names)
+    if hasattr(sumber, 'seek'):
+        sumber.seek(0)
+    return list(sampel.columns), sampel
+
+# Fungsi untuk mengambil BARIS_SAMPEL baris pertama dari iterator baris (calamine/openpyxl).
+# Hasilnya sampel dan iterator baris yang tetap dimulai dari baris pertama
+def ambil_sampel_baris(baris, header):
+    awal = list(itertools.islice(baris, BARIS_SAMPEL))
+    sampel = pd.DataFrame([[_nilai_sel(nilai) for nilai in isi[:len(header)]] for isi in awal],
+                          columns=range(len(header)))
+    return sampel, itertools.chain(awal, baris)
+
+# Fungsi untuk membuka sheet pertama dengan calamine, hasilnya header dan iterator baris
+def buka_excel_calamine(sumber):
+    from python_calamine import CalamineWorkbook
+
+    if isinstance(sumber, (str, os.PathLike)):
+        workbook = CalamineWorkbook.from_path(os.fspath(sumber))
+    else:
+        workbook = CalamineWorkbook.from_filelike(sumber)
+    baris = workbook.get_sheet_by_index(0).iter_rows()
+    header = next(baris, [])
+    return header, baris
+
+# Fungsi untuk mengubah nilai sel calamine/openpyxl seperti yang dilakukan pd.read_excel
+def _nilai_sel(nilai):
+    if nilai is None or nilai == '':
+        return np.nan
+    if isinstance(nilai, date):
+        return pd.Timestamp(nilai)
+    if isinstance(nilai, float) and nilai.is_integer():
+        return int(nilai)
+    return nilai
+
+# Fungsi untuk mengambil kolom sesuai rencana dari iterator baris (calamine/openpyxl)
+def kumpulkan_kolom(baris, rencana):
+    posisi = sorted(rencana)
+    ambil = operator.itemgetter(*posisi)
+    isi_kolom = list(zip(*map(ambil, baris))) or [()] * len(posisi)
+    data = {}
+    for p, isi in zip(posisi, isi_kolom):
+        # Sel kosong dibaca calamine sebagai string kosong, jadi dibuang dari kategori
+        if rencana[p] in KODE_PERTANYAAN or rencana[p] in KOLOM_DEMOGRAFI_KATEGORI:
+            kolom = pd.Categorical(isi)
+            if '' in kolom.categories:
+                kolom = kolom.remove_categories('')
+            data[p] = kolom
+        else:
+            data[p] = pd.Series([_nilai_sel(nilai) for nilai in isi])
+    return pd.DataFrame(data)
+
+# Fungsi untuk membaca file survei (xlsx, csv atau parquet) hanya pada kolom yang dipakai
+@diukur
+def baca_survei(sumber, nama_file=None):
+    if nama_file is None:
+        nama_file = getattr(sumber, 'name', sumber if isinstance(sumber, str) else '')
+    format_file = tentukan_format(nama_file)
+
+    if format_file == 'excel':
+        if engine_excel() == 'calamine':
+            header, baris = buka_excel_calamine(sumber)
+            sampel, baris = ambil_sampel_baris(baris, header)
+            rencana, skema = rencana_kolom(header, sampel)
+            return lampirkan_laporan(bentuk_data(kumpulkan_kolom(baris, rencana), rencana), skema)
+
+        # openpyxl tetap mem-parsing semua sel walaupun memakai usecols,
+        # jadi workbook cukup dibaca sekali lalu kolomnya dipilih
+        df_mentah = pd.read_excel(sumber, engine='openpyxl')
+        rencana, skema = rencana_kolom(df_mentah.columns, df_mentah.head(BARIS_SAMPEL))
+        return lampirkan_laporan(bentuk_data(df_mentah.iloc[:, sorted(rencana)], rencana), skema)
+
+    header, sampel = baca_header(sumber, format_file)
+    rencana, skema = rencana_kolom(header, sampel)
+    posisi = sorted(rencana)
+
+    if format_file == 'csv':
+        df_mentah = pd.read_csv(sumber, usecols=posisi)
+    else:
+        df_mentah = pd.read_parquet(sumber, columns=[header[p] for p in posisi])
+
+    return lampirkan_laporan(bentuk_data(df_mentah, rencana), skema)
+
+# Fungsi untuk membaca file survei per bagian (chunk) berisi maksimal ukuran_chunk baris
+# (bawaan: konfigurasi.UKURAN_CHUNK), sehingga memori yang dipakai tidak bergantung pada
+# besar file
+def baca_survei_bertahap(sumber, nama_file=None, ukuran_chunk=None):
+    ukuran_chunk = ukuran_chunk or konfigurasi.UKURAN_CHUNK
+    if nama_file is None:
+        nama_file = getattr(sumber, 'name', sumber if isinstance(sumber, str) else '')
+    format_file = tentukan_format(nama_file)
+
+    if format_file == 'excel':
+        # calamine selalu memuat satu sheet penuh, jadi dipakai openpyxl mode read-only
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(sumber, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            header = [sel.value for sel in next(sheet.iter_rows(max_row=1))]
+            baris = sheet.iter_rows(min_row=2, max_col=len(header), values_only=True)
+            sampel, baris = ambil_sampel_baris(baris, header)
+            rencana, skema = rencana_kolom(header, sampel)
+            while True:
+                bagian = list(itertools.islice(baris, ukuran_chunk))
+                if not bagian:
+                    break
+                yield lampirkan_laporan(bentuk_data(kumpulkan_kolom(bagian, rencana), rencana), skema)
+        finally:
+            workbook.close()
+        return
+
+    header, sampel = baca_header(sumber, format_file)
+    rencana, skema = rencana_kolom(header, sampel)
+    posisi = sorted(rencana)
+
+    if format_file == 'csv':
+        for bagian in pd.read_csv(sumber, usecols=posisi, chunksize=ukuran_chunk):
+            yield lampirkan_laporan(bentuk_data(bagian, rencana), skema)
+    else:
+        import pyarrow.parquet as pq
+
+        file_parquet = pq.ParquetFile(sumber)
+        for batch in file_parquet.iter_batches(batch_size=ukuran_chunk,
+                                               columns=[header[p] for p in posisi]):
+            yield lampirkan_laporan(bentuk_data(batch.to_pandas(), rencana), skema)
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+import konfigurasi
+from cache_hasil import CacheHasil
+from demografi import hitung_distribusi_demografi
+from instrumentasi import diukur
+from penilaian import (DTYPE_NILAI, KODE_PERTANYAAN, KOLOM_NILAI, AgregatPenilaian, ambil_kolom_jawaban,
+                       VERSI_ATURAN, hitung_semua_responden, hitung_semua_responden_bertahap,
+                       hitung_skor_item, ringkasan_dari_agregat)
+
+
+# Tipe nilai per seratus di status (nilai paling besar 100,00 = 10000, cukup int16)
+DTYPE_SEN = np.int16
+
+# Fungsi untuk membuat ID setiap responden: hash kolom ID (Timestamp) ditambah urutan
+# kemunculannya, sehingga dua responden dengan Timestamp yang sama tetap berbeda
+def hash_id_responden(df):
+    kolom_id = df.iloc[:, 0].reset_index(drop=True)
+    ke = kolom_id.groupby(kolom_id, dropna=False, sort=False).cumcount()
+    return pd.util.hash_pandas_object(pd.DataFrame({'id': kolom_id, 'ke': ke}), index=False).to_numpy()
+
+# Fungsi untuk membuat sidik jari setiap baris (ID + seluruh jawaban), dipakai untuk
+# mendeteksi responden yang jawabannya berubah
+def sidik_responden(df, hash_id):
+    jawaban = pd.DataFrame(dict(zip(KODE_PERTANYAAN, (k.reset_index(drop=True) for k in ambil_kolom_jawaban(df)))))
+    sidik = pd.util.hash_pandas_object(jawaban, index=False).to_numpy()
+    return sidik ^ hash_id
+
+
+class StatusInkremental:
+    """Nilai setiap responden yang sudah pernah dinilai beserta akumulatornya.
+
+    Disimpan di CacheHasil per nama file, sehingga unggahan ulang file kumulatif
+    cukup menilai responden baru atau yang jawabannya berubah. Matriks skor per
+    pertanyaan ikut disimpan agar analisis butir tidak perlu menilai ulang. Objek ini
+    tidak diubah setelah dibuat; perbarui() selalu mengembalikan status baru.
+    """
+
+    def __init__(self, hash_id=None, sidik=None, nilai_sen=None, agregat=None, skor_item=None):
+        self.hash_id = pd.Index(np.empty(0, dtype=np.uint64) if hash_id is None else hash_id)
+        self.sidik = np.empty(0, dtype=np.uint64) if sidik is None else sidik
+        self.nilai_sen = np.empty((0, len(KOLOM_NILAI)), dtype=DTYPE_SEN) if nilai_sen is None else nilai_sen
+        self.agregat = agregat or AgregatPenilaian()
+        self.skor_item = np.empty((0, len(KODE_PERTANYAAN)), dtype=np.int8) if skor_item is None else skor_item
+
+    def __sizeof__(self):
+        return self.hash_id.nbytes + self.sidik.nbytes + self.nilai_sen.nbytes + self.skor_item.nbytes
+
+    def __len__(self):
+        return len(self.sidik)
+
+    # Fungsi untuk menilai data terbaru; hanya baris baru atau berubah yang dihitung ulang.
+    # progres (opsional) menerima jumlah baris yang sudah selesai, termasuk baris tetap.
+    # Hasilnya (df_hasil, skor_item, status baru, statistik jumlah baris
+    # baru/berubah/tetap/dihapus)
+    def perbarui(self, df, progres=None):
+        hash_id = hash_id_responden(df)
+        sidik = sidik_responden(df, hash_id)
+
+        posisi_lama = self.hash_id.get_indexer(hash_id) if len(self) else np.full(len(df), -1)
+        ada = posisi_lama >= 0
+        tetap = ada & (self.sidik[np.where(ada, posisi_lama, 0)] == sidik) if len(self) else ada
+        dinilai = ~tetap
+
+        nilai_sen = np.empty((len(df), len(KOLOM_NILAI)), dtype=DTYPE_SEN)
+        nilai_sen[tetap] = self.nilai_sen[posisi_lama[tetap]]
+        # Skor per pertanyaan: baris tetap diambil dari status, baris lain dari penilaian ulang
+        skor_item = np.empty((len(df), len(KODE_PERTANYAAN)), dtype=np.int8, order='F')
+        skor_item[tetap] = self.skor_item[posisi_lama[tetap]]
+        if dinilai.any():
+            if progres is None:
+                skor_dinilai = hitung_skor_item(df[dinilai])
+                df_nilai = hitung_semua_responden(df[dinilai], skor_dinilai)
+            else:
+                skor_dinilai = np.empty((int(dinilai.sum()), len(KODE_PERTANYAAN)), dtype=np.int8, order='F')
+                jumlah_tetap = int(tetap.sum())
+                df_nilai = hitung_semua_responden_bertahap(df[dinilai], lambda baris: progres(jumlah_tetap + baris),
+                                                           skor_item=skor_dinilai)
+            skor_item[dinilai] = skor_dinilai
+            df_nilai = df_nilai[KOLOM_NILAI].to_numpy(dtype=np.float64)
+            nilai_sen[dinilai] = np.rint(df_nilai * 100).astype(DTYPE_SEN)
+
+        # Akumulator: keluarkan baris lama yang berubah/dihapus, masukkan baris baru/berubah
+        dipakai = np.zeros(len(self), dtype=bool)
+        dipakai[posisi_lama[tetap]] = True
+        agregat = AgregatPenilaian().gabung(self.agregat)
+        agregat.kurangi(AgregatPenilaian.dari_sen(self.nilai_sen[~dipakai]))
+        agregat.gabung(AgregatPenilaian.dari_sen(nilai_sen[dinilai]))
+
+        # Nilai per seratus dibagi 100 menghasilkan float yang sama persis dengan round(x, 2),
+        # lalu disimpan dengan tipe yang sama seperti hasil hitung_semua_responden
+        df_hasil = pd.DataFrame((nilai_sen / 100).astype(DTYPE_NILAI), columns=KOLOM_NILAI)
+        df_hasil.insert(0, 'Responden_ID', df.iloc[:, 0].reset_index(drop=True))
+
+        statistik = {
+            'baru': int((~ada).sum()),
+            'berubah': int((ada & ~tetap).sum()),
+            'tetap': int(tetap.sum()),
+            'dihapus': int((~dipakai).sum() - (ada & ~tetap).sum()),
+        }
+        return df_hasil, skor_item, StatusInkremental(hash_id, sidik, nilai_sen, agregat, skor_item), statistik
+
+# Fungsi untuk menghitung hasil penilaian seperti rangkum_penilaian, memakai status
+# penilaian sebelumnya. Hasilnya (ringkasan, status baru)
+@diukur
+def rangkum_penilaian_inkremental(df, status=None, progres=None):
+    df_hasil, skor_item, status, statistik = (status or StatusInkremental()).perbarui(df, progres)
+    agregat = AgregatPenilaian().gabung(status.agregat)
+    ringkasan = ringkasan_dari_agregat(agregat, hitung_distribusi_demografi(df))
+    ringkasan['df_hasil'] = df_hasil
+    ringkasan['skor_item'] = skor_item
+    ringkasan['skema'] = df.attrs.get('skema')
+    ringkasan['inkremental'] = statistik
+    return ringkasan, status
+
+# Fungsi untuk membuat penyimpanan status inkremental: CacheHasil dengan tingkat disk di
+# DIREKTORI_INKREMENTAL, sehingga status tidak hilang bersama isi memori cache hasil
+def buat_penyimpanan_status():
+    return CacheHasil(
+        batas_memori_mb=konfigurasi.BATAS_MEMORI_INKREMENTAL_MB,
+        direktori=konfigurasi.DIREKTORI_INKREMENTAL,
+        batas_disk_mb=konfigurasi.BATAS_DISK_INKREMENTAL_MB
+    )
+
+# Fungsi untuk menilai data memakai status penilaian unggahan sebelumnya dengan nama
+# file yang sama di penyimpanan status (buat_penyimpanan_status), sehingga hanya
+# responden baru atau yang berubah yang dinilai ulang. Status baru disimpan kembali
+def rangkum_dengan_status(penyimpanan, nama_file, df, progres=None):
+    kunci_status = f"inkremental/{VERSI_ATURAN}/{nama_file}"
+    hasil, status = rangkum_penilaian_inkremental(df, penyimpanan.ambil(kunci_status), progres)
+    penyimpanan.simpan(kunci_status, status)
+    return hasil
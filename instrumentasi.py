@@ -0,0 +1,280 @@
+import functools
+import json
+import os
+import resource
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+import konfigurasi
+
+
+# Catatan tahap disimpan per thread: setiap sesi Streamlit menjalankan rerun di thread
+# sendiri, sehingga tahap dari sesi lain tidak tercampur
+_lokal = threading.local()
+
+# Total per tahap sejak proses berjalan, untuk file metrik Prometheus
+_total = {}
+_lock_total = threading.Lock()
+
+# Sumber metrik tambahan dari modul lain (misalnya statistik render grafik):
+# nama -> (fungsi yang mengembalikan dict statistik, kunci yang berupa counter)
+_sumber_metrik = {}
+
+# Peak RSS (VmHWM) di Linux bisa direset per tahap lewat /proc/self/clear_refs.
+# Di sistem lain dipakai ru_maxrss yang hanya bisa naik
+_BISA_RESET_PUNCAK = os.path.exists('/proc/self/clear_refs')
+
+# Tahap yang sedang berjalan di semua thread. Peak RSS berlaku untuk seluruh proses, jadi
+# hanya direset jika tidak ada tahap lain di thread lain, dan tahap yang pernah berjalan
+# bersamaan dengan tahap di thread lain dicatat tanpa memori
+_tahap_aktif = []
+_lock_puncak = threading.Lock()
+
+
+# Fungsi untuk memeriksa apakah instrumentasi aktif
+def aktif():
+    return bool(konfigurasi.INSTRUMENTASI)
+
+# Fungsi untuk membaca memori proses (MB): (RSS sekarang, peak RSS)
+def _baca_memori():
+    if _BISA_RESET_PUNCAK:
+        rss = puncak = 0
+        with open('/proc/self/status') as f:
+            for baris in f:
+                if baris.startswith('VmRSS:'):
+                    rss = int(baris.split()[1]) / 1024
+                elif baris.startswith('VmHWM:'):
+                    puncak = int(baris.split()[1]) / 1024
+        return rss, puncak
+    puncak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return puncak, puncak
+
+def _reset_puncak():
+    if _BISA_RESET_PUNCAK:
+        try:
+            with open('/proc/self/clear_refs', 'w') as f:
+                f.write('5')
+        except OSError:
+            pass
+
+
+class _Tahap:
+    """Pengukuran satu tahap: waktu wall, waktu CPU thread, kenaikan peak RSS dan jumlah baris.
+
+    Kenaikan peak RSS hanya dilaporkan jika selama tahap berjalan tidak ada tahap lain di
+    thread lain (peak RSS milik seluruh proses, bukan milik satu sesi).
+    """
+
+    def __init__(self, nama, baris=None, keterangan=None):
+        self.nama = nama
+        self.baris = baris
+        self.keterangan = keterangan
+
+    def __enter__(self):
+        tumpukan = _tumpukan()
+        with _lock_puncak:
+            lain = [tahap for tahap in _tahap_aktif if tahap not in tumpukan]
+            for tahap in lain:
+                tahap.tercampur = True
+            self.tercampur = bool(lain)
+            rss, puncak = _baca_memori()
+            # Peak induk sejauh ini disimpan dulu sebelum direset untuk tahap ini
+            if tumpukan:
+                tumpukan[-1].puncak = max(tumpukan[-1].puncak, puncak)
+            if not lain:
+                _reset_puncak()
+            _tahap_aktif.append(self)
+        self.induk = tumpukan[-1].nama if tumpukan else None
+        self.kedalaman = len(tumpukan)
+        self.rss_awal = rss
+        self.puncak = _baca_memori()[1]
+        tumpukan.append(self)
+        self.mulai_cpu = time.thread_time()
+        self.mulai = time.perf_counter()
+        return self
+
+    def __exit__(self, jenis_error, error, traceback):
+        waktu = time.perf_counter() - self.mulai
+        waktu_cpu = time.thread_time() - self.mulai_cpu
+        tumpukan = _tumpukan()
+        tumpukan.pop()
+        with _lock_puncak:
+            _tahap_aktif.remove(self)
+            self.puncak = max(self.puncak, _baca_memori()[1])
+        if tumpukan:
+            tumpukan[-1].puncak = max(tumpukan[-1].puncak, self.puncak)
+        memori = None if self.tercampur else max(0.0, self.puncak - self.rss_awal)
+        catat(self.nama, waktu, waktu_cpu, memori_mb=memori,
+              baris=self.baris, keterangan=self.keterangan if error is None else f"error: {jenis_error.__name__}",
+              induk=self.induk, kedalaman=self.kedalaman)
+        return False
+
+
+class _TanpaUkur:
+    """Pengganti _Tahap saat instrumentasi nonaktif (tidak mengukur apa pun)."""
+
+    baris = None
+    keterangan = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, jenis_error, error, traceback):
+        return False
+
+    def __setattr__(self, nama, nilai):
+        pass
+
+_TANPA_UKUR = _TanpaUkur()
+
+def _tumpukan():
+    if not hasattr(_lokal, 'tumpukan'):
+        _lokal.tumpukan = []
+    return _lokal.tumpukan
+
+# Fungsi untuk mengukur satu tahap dengan blok with. Jumlah baris bisa diisi belakangan:
+#     with ukur_tahap("baca_file") as tahap:
+#         df = ...
+#         tahap.baris = len(df)
+def ukur_tahap(nama, baris=None, keterangan=None):
+    if not konfigurasi.INSTRUMENTASI:
+        return _TANPA_UKUR
+    return _Tahap(nama, baris, keterangan)
+
+# Decorator untuk mengukur setiap pemanggilan fungsi sebagai satu tahap bernama sama
+# dengan fungsinya. Jumlah baris diambil dari hasil yang punya shape (DataFrame, Table)
+def diukur(fungsi):
+    @functools.wraps(fungsi)
+    def pembungkus(*args, **kwargs):
+        if not konfigurasi.INSTRUMENTASI:
+            return fungsi(*args, **kwargs)
+        with _Tahap(fungsi.__name__) as tahap:
+            hasil = fungsi(*args, **kwargs)
+            bentuk = getattr(hasil, 'shape', None)
+            if bentuk:
+                tahap.baris = int(bentuk[0])
+            return hasil
+    return pembungkus
+
+# Fungsi untuk mencatat tahap yang diukur di tempat lain (misalnya di proses worker).
+# Di luar rerun (CLI, callback unduhan) catatan langsung ditulis ke file
+def catat(nama, waktu, waktu_cpu=None, memori_mb=None, baris=None, keterangan=None,
+          induk=None, kedalaman=None):
+    if not konfigurasi.INSTRUMENTASI:
+        return
+    if kedalaman is None:
+        tumpukan = _tumpukan()
+        induk = tumpukan[-1].nama if tumpukan else None
+        kedalaman = len(tumpukan)
+    rekaman = {
+        'waktu': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'rerun': getattr(_lokal, 'id_rerun', None),
+        'tahap': nama,
+        'induk': induk,
+        'kedalaman': kedalaman,
+        'wall_ms': round(waktu * 1000, 3),
+        'cpu_ms': None if waktu_cpu is None else round(waktu_cpu * 1000, 3),
+        'memori_mb': None if memori_mb is None else round(memori_mb, 1),
+        'baris': baris,
+        'keterangan': keterangan,
+    }
+    _tambah_total(rekaman)
+    catatan = getattr(_lokal, 'catatan', None)
+    if catatan is not None:
+        catatan.append(rekaman)
+    else:
+        tulis_catatan([rekaman])
+
+def _tambah_total(rekaman):
+    with _lock_total:
+        total = _total.setdefault(rekaman['tahap'], {
+            'jumlah': 0, 'detik': 0.0, 'cpu_detik': 0.0, 'baris': 0, 'memori_mb': 0.0, 'detik_terakhir': 0.0})
+        total['jumlah'] += 1
+        total['detik'] += rekaman['wall_ms'] / 1000
+        total['cpu_detik'] += (rekaman['cpu_ms'] or 0) / 1000
+        total['baris'] += rekaman['baris'] or 0
+        total['memori_mb'] = max(total['memori_mb'], rekaman['memori_mb'] or 0)
+        total['detik_terakhir'] = rekaman['wall_ms'] / 1000
+
+# Fungsi untuk memulai pengumpulan catatan satu rerun (dipanggil di awal main())
+def mulai_rerun():
+    if not konfigurasi.INSTRUMENTASI:
+        return
+    _lokal.id_rerun = uuid.uuid4().hex[:12]
+    _lokal.catatan = []
+    _lokal.tumpukan = []
+
+# Fungsi untuk menutup rerun: catatan ditulis ke file lalu dikembalikan (untuk panel debug)
+def selesai_rerun():
+    catatan = getattr(_lokal, 'catatan', None)
+    _lokal.catatan = None
+    _lokal.id_rerun = None
+    if not konfigurasi.INSTRUMENTASI or catatan is None:
+        return []
+    tulis_catatan(catatan)
+    return catatan
+
+# Fungsi untuk menulis catatan ke file JSON lines dan memperbarui file metrik Prometheus
+def tulis_catatan(catatan):
+    if konfigurasi.FILE_JEJAK and catatan:
+        with open(konfigurasi.FILE_JEJAK, 'a', encoding='utf-8') as f:
+            for rekaman in catatan:
+                f.write(json.dumps(rekaman, ensure_ascii=False) + "\n")
+    if konfigurasi.FILE_METRIK:
+        tulis_metrik(konfigurasi.FILE_METRIK)
+
+# Fungsi untuk mendaftarkan statistik modul lain agar ikut ditampilkan di panel debug dan
+# ditulis ke metrik Prometheus sebagai dashboard_<nama>_<kunci>. Kunci di counter ditulis
+# sebagai counter, sisanya sebagai gauge
+def daftarkan_metrik(nama, fungsi, counter=()):
+    _sumber_metrik[nama] = (fungsi, frozenset(counter))
+
+# Fungsi untuk membaca semua statistik yang didaftarkan: {nama: {kunci: nilai}}
+def metrik_tambahan():
+    return {nama: dict(fungsi()) for nama, (fungsi, _) in _sumber_metrik.items()}
+
+# Fungsi untuk menyusun teks metrik format Prometheus dari total per tahap dan statistik
+# yang didaftarkan lewat daftarkan_metrik
+def teks_metrik():
+    metrik = [
+        ('dashboard_tahap_total', 'counter', 'Jumlah eksekusi per tahap', 'jumlah'),
+        ('dashboard_tahap_detik_total', 'counter', 'Total waktu wall per tahap (detik)', 'detik'),
+        ('dashboard_tahap_cpu_detik_total', 'counter', 'Total waktu CPU per tahap (detik)', 'cpu_detik'),
+        ('dashboard_tahap_baris_total', 'counter', 'Total baris yang diproses per tahap', 'baris'),
+        ('dashboard_tahap_memori_puncak_mb', 'gauge', 'Kenaikan peak RSS terbesar per tahap (MB)', 'memori_mb'),
+        ('dashboard_tahap_detik_terakhir', 'gauge', 'Waktu wall eksekusi terakhir per tahap (detik)',
+         'detik_terakhir'),
+    ]
+    with _lock_total:
+        total = {tahap: dict(nilai) for tahap, nilai in _total.items()}
+    baris = []
+    for nama, jenis, keterangan, kunci in metrik:
+        baris.append(f"# HELP {nama} {keterangan}")
+        baris.append(f"# TYPE {nama} {jenis}")
+        for tahap in sorted(total):
+            label = tahap.replace('\\', '\\\\').replace('"', '\\"')
+            baris.append(f'{nama}{{tahap="{label}"}} {total[tahap][kunci]:.6g}')
+    for sumber, statistik in metrik_tambahan().items():
+        counter = _sumber_metrik[sumber][1]
+        for kunci, nilai in statistik.items():
+            nama = f"dashboard_{sumber}_{kunci}"
+            baris.append(f"# HELP {nama} Statistik {sumber}: {kunci}")
+            baris.append(f"# TYPE {nama} {'counter' if kunci in counter else 'gauge'}")
+            baris.append(f"{nama} {nilai:.6g}")
+    return "\n".join(baris) + "\n"
+
+# Fungsi untuk menulis file metrik secara atomik (format textfile collector node_exporter)
+def tulis_metrik(path):
+    direktori = os.path.dirname(os.path.abspath(path))
+    fd, path_sementara = tempfile.mkstemp(dir=direktori, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(teks_metrik())
+        os.replace(path_sementara, path)
+    except BaseException:
+        if os.path.exists(path_sementara):
+            os.remove(path_sementara)
+        raise
@@ -0,0 +1,85 @@
+import os
+import tempfile
+
+
+# Pengaturan dashboard dibaca dari environment variable agar bisa diubah
+# per deployment tanpa mengubah kode
+
+# Fungsi untuk membaca environment variable bilangan bulat
+def _env_int(nama, default):
+    nilai = os.environ.get(nama)
+    if nilai is None or nilai.strip() == "":
+        return default
+    try:
+        return int(nilai)
+    except ValueError:
+        raise ValueError(f"Environment variable {nama} harus berupa bilangan bulat, bukan '{nilai}'")
+
+# Batas memori cache hasil penilaian (MB)
+BATAS_MEMORI_CACHE_MB = _env_int("DASHBOARD_CACHE_MB", 512)
+
+# Direktori cache di disk (kosongkan untuk menonaktifkan) dan batas ukurannya (MB)
+DIREKTORI_CACHE = os.environ.get("DASHBOARD_CACHE_DIR") or None
+BATAS_DISK_CACHE_MB = _env_int("DASHBOARD_CACHE_DISK_MB", 4096)
+
+# Engine pembaca Excel: "auto" (calamine jika terpasang), "calamine" atau "openpyxl"
+ENGINE_EXCEL = os.environ.get("DASHBOARD_ENGINE_EXCEL", "auto")
+
+# File yang lebih besar dari batas ini (MB) dinilai per bagian (streaming),
+# dengan jumlah baris per bagian sesuai UKURAN_CHUNK
+BATAS_STREAMING_MB = _env_int("DASHBOARD_BATAS_STREAMING_MB", 100)
+UKURAN_CHUNK = _env_int("DASHBOARD_UKURAN_CHUNK", 50000)
+
+# Batas memori cache gambar grafik (MB)
+BATAS_CACHE_GRAFIK_MB = _env_int("DASHBOARD_CACHE_GRAFIK_MB", 64)
+
+# Jumlah proses untuk render grafik paralel (1 = render di proses Streamlit)
+# dan batas waktu render seluruh grafik satu halaman (detik)
+JUMLAH_WORKER_GRAFIK = _env_int("DASHBOARD_WORKER_GRAFIK", min(4, os.cpu_count() or 1))
+TIMEOUT_GRAFIK = _env_int("DASHBOARD_TIMEOUT_GRAFIK", 60)
+
+# Mode grafik: "server" (gambar matplotlib dirender di server) atau "klien"
+# (spesifikasi Vega-Lite berisi data agregat, grafik dirender di browser)
+MODE_GRAFIK = os.environ.get("DASHBOARD_MODE_GRAFIK", "server")
+
+# File buku aturan penilaian (JSON); kosongkan untuk memakai aturan/kuesioner_v1.json
+FILE_ATURAN = os.environ.get("DASHBOARD_ATURAN") or None
+
+# Mode inkremental (1 = aktif): unggahan ulang file dengan nama yang sama hanya menilai
+# responden baru atau yang jawabannya berubah
+MODE_INKREMENTAL = _env_int("DASHBOARD_INKREMENTAL", 1)
+
+# Status penilaian inkremental per nama file disimpan di direktori ini (terpisah dari
+# cache hasil, yang secara bawaan hanya di memori) agar tetap ada setelah dikeluarkan
+# dari memori atau server di-restart, dengan batas memori dan disk (MB)
+DIREKTORI_INKREMENTAL = os.environ.get("DASHBOARD_DIREKTORI_INKREMENTAL") or os.path.join(
+    tempfile.gettempdir(), "dashboard_inkremental")
+BATAS_MEMORI_INKREMENTAL_MB = _env_int("DASHBOARD_INKREMENTAL_MB", 128)
+BATAS_DISK_INKREMENTAL_MB = _env_int("DASHBOARD_INKREMENTAL_DISK_MB", 2048)
+
+# Tugas latar belakang (1 = aktif): unggahan satu file dibaca dan dinilai di thread worker
+# sehingga interaksi widget tidak mengulang proses. Status tugas disimpan sebagai file
+# di DIREKTORI_TUGAS agar tetap bisa dipantau setelah rerun atau muat ulang halaman
+TUGAS_LATAR = _env_int("DASHBOARD_TUGAS_LATAR", 1)
+JUMLAH_WORKER_TUGAS = _env_int("DASHBOARD_WORKER_TUGAS", 1)
+DIREKTORI_TUGAS = os.environ.get("DASHBOARD_DIREKTORI_TUGAS") or os.path.join(tempfile.gettempdir(),
+                                                                              "dashboard_tugas")
+
+# Jumlah proses untuk membaca dan menilai banyak file sekaligus (unggahan banyak file)
+JUMLAH_WORKER_INGEST = _env_int("DASHBOARD_WORKER_INGEST", os.cpu_count() or 1)
+
+# Instrumentasi waktu, CPU dan memori per tahap (1 = aktif, menampilkan panel debug)
+# serta file keluarannya: JSON lines per tahap dan file metrik format Prometheus
+INSTRUMENTASI = _env_int("DASHBOARD_INSTRUMENTASI", 0)
+FILE_JEJAK = os.environ.get("DASHBOARD_FILE_JEJAK") or None
+FILE_METRIK = os.environ.get("DASHBOARD_FILE_METRIK") or None
+
+# File SQLite riwayat penilaian per gelombang survei (tren antar gelombang); kosongkan
+# untuk menonaktifkan penyimpanan riwayat dan tampilan tren
+FILE_RIWAYAT = os.environ.get("DASHBOARD_FILE_RIWAYAT", "riwayat_penilaian.sqlite") or None
+
+# Mesin agregasi ringkasan, distribusi demografi dan kubus filter: "pandas" (NumPy di
+# proses Streamlit) atau "duckdb" (query SQL multi-thread, butuh paket duckdb) dengan
+# jumlah thread DuckDB
+MESIN_AGREGASI = os.environ.get("DASHBOARD_MESIN_AGREGASI", "pandas")
+JUMLAH_THREAD_DUCKDB = _env_int("DASHBOARD_THREAD_DUCKDB", os.cpu_count() or 1)
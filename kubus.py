@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+import konfigurasi
+from batch import KOLOM_SUMBER
+from demografi import KOLOM_GRAFIK_DEMOGRAFI, LABEL_KOSONG, PENYERAGAM_DEMOGRAFI, urutkan_distribusi
+from instrumentasi import diukur
+from penilaian import (KOLOM_NILAI, LABEL_KATEGORI, AgregatPenilaian, kategorikan, nilai_persis,
+                       ringkasan_dari_agregat)
+
+
+# Kolom demografi yang bisa dipakai untuk memfilter (yang tidak ada di data dilewati)
+DIMENSI_KUBUS = ['INSTANSI', 'PROVINSI', 'JENIS KELAMIN', 'UMUR', 'TINGKAT PENDIDIKAN', KOLOM_SUMBER]
+
+
+# Fungsi untuk mengambil nilai satu dimensi sebagai kode bilangan bulat dan daftar label
+# (urut abjad, nilai kosong menjadi LABEL_KOSONG di akhir daftar)
+def kode_dimensi(data, kolom):
+    nilai = data[kolom]
+    if kolom in PENYERAGAM_DEMOGRAFI:
+        nilai = PENYERAGAM_DEMOGRAFI[kolom](nilai)
+    kode, label = pd.factorize(nilai.astype(object), use_na_sentinel=True)
+    label = [str(x) for x in label]
+    urutan = sorted(range(len(label)), key=lambda i: label[i])
+    posisi_baru = np.empty(len(label) + 1, dtype=np.int64)
+    posisi_baru[urutan] = np.arange(len(label))
+    label = [label[i] for i in urutan]
+    if (kode < 0).any():
+        if LABEL_KOSONG in label:
+            posisi_baru[-1] = label.index(LABEL_KOSONG)
+        else:
+            posisi_baru[-1] = len(label)
+            label.append(LABEL_KOSONG)
+    return posisi_baru[kode], label
+
+
+class KubusDemografi:
+    """Agregat penilaian per kombinasi nilai demografi (sel kubus).
+
+    Setiap sel menyimpan jumlah responden, jumlah nilai per seratus untuk setiap kolom
+    KOLOM_NILAI dan jumlah responden per kategori NKI. Ringkasan untuk kombinasi filter
+    apa pun dihitung dengan menjumlahkan sel yang cocok, tanpa membaca ulang data
+    responden, dan hasilnya identik dengan menilai responden yang difilter.
+    """
+
+    def __init__(self, dimensi, label, kode_sel, jumlah_responden, jumlah_sen, jumlah_kategori):
+        self.dimensi = dimensi
+        self.label = label
+        self.kode_sel = kode_sel
+        self.jumlah_responden = jumlah_responden
+        self.jumlah_sen = jumlah_sen
+        self.jumlah_kategori = jumlah_kategori
+
+    @property
+    def nbytes(self):
+        return (self.kode_sel.nbytes + self.jumlah_responden.nbytes + self.jumlah_sen.nbytes
+                + self.jumlah_kategori.nbytes)
+
+    def __len__(self):
+        return len(self.jumlah_responden)
+
+    # Masker sel yang cocok dengan filter {dimensi: daftar label}. Dimensi yang tidak
+    # disebut atau daftarnya kosong berarti semua nilai
+    def masker(self, filter_dimensi=None):
+        cocok = np.ones(len(self), dtype=bool)
+        for kolom, pilihan in (filter_dimensi or {}).items():
+            if not pilihan or kolom not in self.dimensi:
+                continue
+            d = self.dimensi.index(kolom)
+            dipilih = np.isin(np.array(self.label[kolom], dtype=object), list(pilihan))
+            cocok &= dipilih[self.kode_sel[:, d]]
+        return cocok
+
+    # Akumulator penilaian untuk responden yang cocok dengan filter
+    def agregat(self, filter_dimensi=None):
+        cocok = self.masker(filter_dimensi)
+        agregat = AgregatPenilaian()
+        agregat.jumlah_sen += self.jumlah_sen[cocok].sum(axis=0)
+        agregat.jumlah_responden = int(self.jumlah_responden[cocok].sum())
+        jumlah_kategori = self.jumlah_kategori[cocok].sum(axis=0)
+        for kategori, jumlah in zip(LABEL_KATEGORI, jumlah_kategori):
+            agregat.distribusi_kategori[kategori] = int(jumlah)
+        return agregat
+
+    # Distribusi demografi (seperti hitung_distribusi_demografi) untuk responden yang cocok
+    def distribusi_demografi(self, filter_dimensi=None):
+        cocok = self.masker(filter_dimensi)
+        distribusi = {}
+        for d, kolom in enumerate(self.dimensi):
+            if kolom not in KOLOM_GRAFIK_DEMOGRAFI:
+                continue
+            jumlah = pd.Series(np.bincount(self.kode_sel[cocok, d], weights=self.jumlah_responden[cocok],
+                                           minlength=len(self.label[kolom])), index=self.label[kolom])
+            # Nilai kosong hanya dihitung untuk jenis kelamin, sama seperti distribusi global
+            if kolom != 'JENIS KELAMIN':
+                jumlah = jumlah.drop(LABEL_KOSONG, errors='ignore')
+            distribusi[kolom] = urutkan_distribusi(jumlah)
+        return distribusi
+
+    # Ringkasan penilaian (format rangkum_penilaian, tanpa nilai per responden) untuk filter
+    def ringkasan(self, filter_dimensi=None):
+        return ringkasan_dari_agregat(self.agregat(filter_dimensi), self.distribusi_demografi(filter_dimensi))
+
+# Fungsi untuk membangun kubus dari data responden dan nilai per responden (sekali per data)
+@diukur
+def bangun_kubus(data, df_hasil):
+    if konfigurasi.MESIN_AGREGASI == 'duckdb' and len(df_hasil):
+        # Diimpor di sini karena agregasi_duckdb memakai modul ini
+        from agregasi_duckdb import RelasiPenilaian
+        with RelasiPenilaian(data, df_hasil) as relasi:
+            return relasi.kubus()
+
+    dimensi = [kolom for kolom in DIMENSI_KUBUS if kolom in data.columns]
+    label = {}
+    kode = []
+    for kolom in dimensi:
+        kode_kolom, label[kolom] = kode_dimensi(data, kolom)
+        kode.append(kode_kolom)
+
+    # Gabungkan kode semua dimensi menjadi satu kunci sel (mixed radix)
+    kunci = np.zeros(len(df_hasil), dtype=np.int64)
+    for kolom, kode_kolom in zip(dimensi, kode):
+        kunci = kunci * len(label[kolom]) + kode_kolom
+    kunci_sel, sel = np.unique(kunci, return_inverse=True)
+    jumlah_sel = len(kunci_sel)
+
+    kode_sel = np.empty((jumlah_sel, len(dimensi)), dtype=np.int32)
+    sisa = kunci_sel
+    for d in reversed(range(len(dimensi))):
+        sisa, kode_sel[:, d] = np.divmod(sisa, len(label[dimensi[d]]))
+
+    nilai_sen = np.rint(df_hasil[KOLOM_NILAI].to_numpy(dtype=np.float64) * 100).astype(np.int64)
+    jumlah_sen = np.zeros((jumlah_sel, len(KOLOM_NILAI)), dtype=np.int64)
+    for j in range(len(KOLOM_NILAI)):
+        # Jumlah per sel tetap bulat dan persis selama di bawah 2^53
+        jumlah_sen[:, j] = np.rint(np.bincount(sel, weights=nilai_sen[:, j], minlength=jumlah_sel))
+
+    # NKI kosong tidak dihitung di distribusi kategori (sama seperti kategorikan)
+    nki = nilai_persis(df_hasil['NKI'])
+    ada = ~np.isnan(nki)
+    kode_kategori = kategorikan(nki[ada])[0].codes.astype(np.int64)
+    jumlah_kategori = np.bincount(sel[ada] * len(LABEL_KATEGORI) + kode_kategori,
+                                  minlength=jumlah_sel * len(LABEL_KATEGORI)).reshape(jumlah_sel, -1)
+
+    return KubusDemografi(dimensi, label, kode_sel,
+                          np.bincount(sel, minlength=jumlah_sel).astype(np.int64),
+                          jumlah_sen, jumlah_kategori.astype(np.int64))
+
+# Fungsi untuk menggabungkan kubus dari beberapa bagian data yang dimensinya sama
+# (misalnya setiap bagian file yang dinilai per bagian). Label setiap dimensi disatukan
+# (urut abjad, LABEL_KOSONG di akhir) lalu sel dengan kombinasi label yang sama dijumlahkan
+def gabung_kubus(daftar_kubus):
+    dimensi = daftar_kubus[0].dimensi
+    label = {}
+    for kolom in dimensi:
+        semua = {x for kubus in daftar_kubus for x in kubus.label[kolom]}
+        label[kolom] = sorted(semua - {LABEL_KOSONG}) + ([LABEL_KOSONG] if LABEL_KOSONG in semua else [])
+
+    # Kunci sel (mixed radix) setiap kubus dengan kode dari label gabungan
+    kunci = []
+    for kubus in daftar_kubus:
+        kunci_kubus = np.zeros(len(kubus), dtype=np.int64)
+        for d, kolom in enumerate(dimensi):
+            posisi = {x: i for i, x in enumerate(label[kolom])}
+            kode_baru = np.array([posisi[x] for x in kubus.label[kolom]], dtype=np.int64)
+            kunci_kubus = kunci_kubus * len(label[kolom]) + kode_baru[kubus.kode_sel[:, d]]
+        kunci.append(kunci_kubus)
+    kunci_sel, sel = np.unique(np.concatenate(kunci), return_inverse=True)
+    jumlah_sel = len(kunci_sel)
+
+    kode_sel = np.empty((jumlah_sel, len(dimensi)), dtype=np.int32)
+    sisa = kunci_sel
+    for d in reversed(range(len(dimensi))):
+        sisa, kode_sel[:, d] = np.divmod(sisa, len(label[dimensi[d]]))
+
+    # Penjumlahan per sel dengan bilangan bulat agar tetap persis
+    def jumlahkan(nama):
+        nilai = np.concatenate([getattr(kubus, nama) for kubus in daftar_kubus])
+        hasil = np.zeros((jumlah_sel,) + nilai.shape[1:], dtype=np.int64)
+        np.add.at(hasil, sel, nilai)
+        return hasil
+
+    return KubusDemografi(dimensi, label, kode_sel, jumlahkan('jumlah_responden'),
+                          jumlahkan('jumlah_sen'), jumlahkan('jumlah_kategori'))
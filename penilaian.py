@@ -0,0 +1,316 @@
+import bisect
+
+import numpy as np
+import pandas as pd
+
+import konfigurasi
+from buku_aturan import muat_buku_aturan
+from demografi import hitung_distribusi_demografi
+from instrumentasi import diukur
+from skema import indeks_kolom_jawaban
+
+
+# Buku aturan penilaian (pertanyaan, posisi kolom, skor opsi jawaban, indikator)
+# dimuat dan divalidasi sekali saat import
+BUKU_ATURAN = muat_buku_aturan(konfigurasi.FILE_ATURAN)
+
+# Mapping jawaban -> skor untuk setiap pertanyaan, dikelompokkan per indikator
+PETA_SKOR = BUKU_ATURAN.peta_skor()
+
+# Posisi kolom jawaban pada file Excel, urut sesuai PETA_SKOR
+KOLOM_JAWABAN = BUKU_ATURAN.kolom
+
+# Kode pertanyaan (SK1, SK2, KS1, ...), urut sesuai KOLOM_JAWABAN
+KODE_PERTANYAAN = BUKU_ATURAN.kode_pertanyaan
+
+# Skor maksimal setiap indikator (jumlah skor tertinggi seluruh pertanyaannya)
+SKOR_MAKS = BUKU_ATURAN.skor_maks
+
+INDIKATOR_TEKNIS = BUKU_ATURAN.indikator_teknis
+INDIKATOR_SOSIAL = BUKU_ATURAN.indikator_sosial
+
+# Nama lengkap indikator untuk tabel rata-rata
+NAMA_INDIKATOR = BUKU_ATURAN.nama_indikator
+
+# Versi rumus penilaian, naikkan setiap kali rumus atau pengolahan data saat ingest
+# berubah. Versi aturan juga memuat digest buku aturan agar hasil di cache tidak
+# terpakai lagi jika kuesioner berubah
+VERSI_RUMUS = "3"
+VERSI_ATURAN = f"{VERSI_RUMUS}-{BUKU_ATURAN.digest[:16]}"
+
+# Tabel nilai indikator untuk setiap kemungkinan jumlah skor, dihitung dengan
+# rumus yang sama persis seperti hitung_nilai_responden agar hasilnya identik
+TABEL_NILAI_INDIKATOR = {
+    indikator: np.array([round((jumlah / maks) * 100, 2) for jumlah in range(maks + 1)])
+    for indikator, maks in SKOR_MAKS.items()
+}
+
+# Batas kategori (kategori naik jika nilai > batas) dan labelnya, dari terendah
+BATAS_KATEGORI = [25, 50, 80]
+LABEL_KATEGORI = ["Buruk", "Kurang Baik", "Baik", "Sangat Baik"]
+
+# Urutan kategori pada distribusi (dari tertinggi)
+URUTAN_DISTRIBUSI = LABEL_KATEGORI[::-1]
+
+# Tipe kolom nilai pada df_hasil. Semua nilai sudah dibulatkan 2 desimal dan <= 100,
+# sehingga float32 cukup untuk memulihkan nilai aslinya (lihat nilai_persis) dengan
+# separuh memori float64
+DTYPE_NILAI = np.float32
+
+# Fungsi untuk menentukan kategori satu nilai
+def tentukan_kategori(nilai):
+    # bisect_left = banyaknya batas yang < nilai; NaN menjadi "Buruk"
+    return LABEL_KATEGORI[bisect.bisect_left(BATAS_KATEGORI, nilai)]
+
+# Fungsi untuk menentukan kategori banyak nilai sekaligus dalam satu kali jalan.
+# Hasilnya kolom kategori (Categorical) dan jumlah responden per kategori;
+# NaN dikategorikan "Buruk" seperti tentukan_kategori tetapi tidak ikut dihitung
+def kategorikan(nilai):
+    nilai = np.asarray(nilai, dtype=np.float64)
+    kode = np.searchsorted(BATAS_KATEGORI, nilai, side='left')
+    kosong = np.isnan(nilai)
+    if kosong.any():
+        kode[kosong] = 0
+        jumlah = np.bincount(kode[~kosong], minlength=len(LABEL_KATEGORI))
+    else:
+        jumlah = np.bincount(kode, minlength=len(LABEL_KATEGORI))
+    kategori = pd.Categorical.from_codes(kode, categories=LABEL_KATEGORI, ordered=True)
+    distribusi = {label: int(jumlah[LABEL_KATEGORI.index(label)]) for label in URUTAN_DISTRIBUSI}
+    return kategori, distribusi
+
+# Fungsi untuk menghitung distribusi kategori
+def hitung_distribusi_kategori(df_hasil):
+    # Pastikan kolom 'NKI' ada
+    if 'NKI' not in df_hasil.columns:
+        raise ValueError("DataFrame tidak memiliki kolom 'NKI'")
+    return kategorikan(df_hasil['NKI'])[1]
+
+# Fungsi untuk menghitung nilai responden
+def hitung_nilai_responden(df, row_index) :
+    # Ambil jawaban dari dataframe (posisi kolom dicocokkan sekali per header)
+    jawaban = [df.iloc[row_index, i] for i in indeks_kolom_jawaban(df, BUKU_ATURAN)]
+
+    # Hitung skor untuk setiap pertanyaan lewat kode opsi (-1 = jawaban tidak dikenal -> skor 0)
+    skor = [BUKU_ATURAN.skor[i][BUKU_ATURAN.indeks_opsi[i].get(x, -1)] for i, x in enumerate(jawaban)]
+
+    # Hitung total nilai per indikator
+    jumlah = dict.fromkeys(BUKU_ATURAN.indikator, 0)
+    for indikator, nilai in zip(BUKU_ATURAN.indikator_pertanyaan, skor):
+        jumlah[indikator] += int(nilai)
+    hasil = {indikator + 'TOTAL': round((jumlah[indikator] / SKOR_MAKS[indikator]) * 100, 2)
+             for indikator in BUKU_ATURAN.indikator}
+
+    # Hitung nilai rata-rata (dijumlahkan berurutan)
+    hasil['NKKST'] = round(sum(hasil[i + 'TOTAL'] for i in INDIKATOR_TEKNIS) / len(INDIKATOR_TEKNIS), 2)
+    hasil['NKKSS'] = round(sum(hasil[i + 'TOTAL'] for i in INDIKATOR_SOSIAL) / len(INDIKATOR_SOSIAL), 2)
+    hasil['NKI'] = round((hasil['NKKST'] + hasil['NKKSS']) / 2, 2)
+
+    return hasil
+
+# Fungsi pembulatan 2 desimal yang identik dengan round() bawaan Python
+def _bulatkan(nilai):
+    hasil = np.round(nilai, 2)
+    # np.round bisa berbeda dari round() hanya jika nilai x 100 tepat di sekitar .5,
+    # jadi nilai-nilai tersebut dibulatkan ulang satu per satu
+    skala = nilai * 100
+    dekat_setengah = np.abs(skala - np.floor(skala) - 0.5) < 1e-6
+    if dekat_setengah.any():
+        hasil[dekat_setengah] = [round(float(x), 2) for x in nilai[dekat_setengah]]
+    return hasil
+
+# Fungsi untuk mengubah nilai float32 dari df_hasil kembali menjadi float64 yang identik
+# dengan round(x, 2) (dipakai saat nilai ditampilkan atau diekspor)
+def nilai_persis(nilai):
+    return np.round(np.asarray(nilai, dtype=np.float64), 2)
+
+# Fungsi untuk mengubah satu kolom jawaban (pertanyaan ke-i buku aturan) menjadi array skor
+def _skor_kolom(kolom, i):
+    indeks_opsi, skor = BUKU_ATURAN.indeks_opsi[i], BUKU_ATURAN.skor[i]
+    if isinstance(kolom.dtype, pd.CategoricalDtype):
+        # Cukup petakan kategorinya ke kode opsi, lalu ambil skor lewat kode (-1 = kosong -> skor 0)
+        skor_kategori = np.append(skor[[indeks_opsi.get(k, -1) for k in kolom.cat.categories]], 0)
+        return skor_kategori[kolom.cat.codes.to_numpy()]
+    kode = kolom.map(indeks_opsi).fillna(-1).to_numpy(dtype=np.intp)
+    return skor[kode]
+
+# Fungsi untuk mengambil kolom jawaban, baik dari data hasil ingest (kolom bernama
+# kode pertanyaan) maupun dari data mentah Excel (dicocokkan lewat header)
+def ambil_kolom_jawaban(df):
+    if all(kode in df.columns for kode in KODE_PERTANYAAN):
+        return [df[kode] for kode in KODE_PERTANYAAN]
+    return [df.iloc[:, posisi] for posisi in indeks_kolom_jawaban(df, BUKU_ATURAN)]
+
+# Fungsi untuk menyusun matriks skor per pertanyaan (baris = responden, kolom = urutan
+# KODE_PERTANYAAN) sebagai int8, disimpan per kolom agar setiap pertanyaan bersebelahan
+@diukur
+def hitung_skor_item(df):
+    skor_item = np.empty((len(df), len(KODE_PERTANYAAN)), dtype=np.int8, order='F')
+    for i, kolom in enumerate(ambil_kolom_jawaban(df)):
+        skor_item[:, i] = _skor_kolom(kolom, i)
+    return skor_item
+
+# Fungsi untuk menghitung semua responden sekaligus (vektorisasi per kolom).
+# Matriks skor per pertanyaan yang sudah dihitung (hitung_skor_item) bisa diberikan
+@diukur
+def hitung_semua_responden(df, skor_item=None):
+    if df.empty:
+        return pd.DataFrame()
+    if skor_item is None:
+        skor_item = hitung_skor_item(df)
+
+    # Jumlahkan skor jawaban per indikator, satu kolom per langkah
+    jumlah = {indikator: np.zeros(len(df), dtype=np.int16) for indikator in BUKU_ATURAN.indikator}
+    for i, indikator in enumerate(BUKU_ATURAN.indikator_pertanyaan):
+        jumlah[indikator] += skor_item[:, i]
+    total = {indikator + 'TOTAL': TABEL_NILAI_INDIKATOR[indikator][jumlah[indikator]]
+             for indikator in BUKU_ATURAN.indikator}
+
+    # Penjumlahan dilakukan berurutan seperti pada hitung_nilai_responden
+    jumlah_teknis = total[INDIKATOR_TEKNIS[0] + 'TOTAL']
+    for indikator in INDIKATOR_TEKNIS[1:]:
+        jumlah_teknis = jumlah_teknis + total[indikator + 'TOTAL']
+    jumlah_sosial = total[INDIKATOR_SOSIAL[0] + 'TOTAL']
+    for indikator in INDIKATOR_SOSIAL[1:]:
+        jumlah_sosial = jumlah_sosial + total[indikator + 'TOTAL']
+
+    total['NKKST'] = _bulatkan(jumlah_teknis / len(INDIKATOR_TEKNIS))
+    total['NKKSS'] = _bulatkan(jumlah_sosial / len(INDIKATOR_SOSIAL))
+    total['NKI'] = _bulatkan((total['NKKST'] + total['NKKSS']) / 2)
+
+    df_hasil = pd.DataFrame({nama: nilai.astype(DTYPE_NILAI) for nama, nilai in total.items()})
+
+    # Tambahkan kolom ID responden
+    df_hasil.insert(0, 'Responden_ID', df.iloc[:, 0])
+
+    return df_hasil
+
+# Fungsi untuk menilai semua responden per bagian berisi ukuran_bagian baris, dengan
+# progres(jumlah baris selesai) dipanggil setiap satu bagian selesai. progres boleh melempar
+# exception untuk menghentikan penilaian (misalnya tugas yang dibatalkan). Hasilnya sama
+# dengan hitung_semua_responden. Jika skor_item (matriks kosong berukuran len(df) x jumlah
+# pertanyaan) diberikan, skor per pertanyaan setiap bagian ikut diisikan ke dalamnya
+def hitung_semua_responden_bertahap(df, progres, ukuran_bagian=None, skor_item=None):
+    ukuran_bagian = ukuran_bagian or konfigurasi.UKURAN_CHUNK
+    bagian = []
+    for awal in range(0, len(df), ukuran_bagian):
+        potongan = df.iloc[awal:awal + ukuran_bagian].reset_index(drop=True)
+        skor_bagian = hitung_skor_item(potongan)
+        if skor_item is not None:
+            skor_item[awal:awal + len(potongan)] = skor_bagian
+        bagian.append(hitung_semua_responden(potongan, skor_bagian))
+        progres(min(awal + ukuran_bagian, len(df)))
+    if not bagian:
+        return pd.DataFrame()
+    return pd.concat(bagian, ignore_index=True)
+
+# Kolom nilai pada df_hasil (selain Responden_ID)
+KOLOM_NILAI = [indikator + 'TOTAL' for indikator in BUKU_ATURAN.indikator] + ['NKKST', 'NKKSS', 'NKI']
+
+
+class AgregatPenilaian:
+    """Akumulator jumlah nilai, jumlah responden dan distribusi kategori NKI.
+
+    Nilai disimpan sebagai bilangan bulat per seratus (semua nilai sudah dibulatkan
+    2 desimal), sehingga penjumlahan per bagian (chunk) menghasilkan rata-rata yang
+    persis sama dengan penjumlahan seluruh data sekaligus.
+    """
+
+    def __init__(self):
+        self.jumlah_sen = np.zeros(len(KOLOM_NILAI), dtype=np.int64)
+        self.jumlah_responden = 0
+        self.distribusi_kategori = {'Sangat Baik': 0, 'Baik': 0, 'Kurang Baik': 0, 'Buruk': 0}
+
+    def tambah(self, df_hasil):
+        if len(df_hasil) == 0:
+            return self
+        nilai = df_hasil[KOLOM_NILAI].to_numpy(dtype=np.float64)
+        self.jumlah_sen += np.rint(nilai * 100).astype(np.int64).sum(axis=0)
+        self.jumlah_responden += len(df_hasil)
+        for kategori, jumlah in hitung_distribusi_kategori(df_hasil).items():
+            self.distribusi_kategori[kategori] += jumlah
+        return self
+
+    # Buat akumulator dari matriks nilai per seratus (baris = responden, kolom = KOLOM_NILAI)
+    @classmethod
+    def dari_sen(cls, nilai_sen):
+        agregat = cls()
+        if len(nilai_sen) == 0:
+            return agregat
+        agregat.jumlah_sen += nilai_sen.sum(axis=0, dtype=np.int64)
+        agregat.jumlah_responden = len(nilai_sen)
+        # Nilai per seratus / 100 identik dengan nilai aslinya (sudah dibulatkan 2 desimal)
+        agregat.distribusi_kategori = kategorikan(nilai_sen[:, KOLOM_NILAI.index('NKI')] / 100)[1]
+        return agregat
+
+    def gabung(self, lain):
+        self.jumlah_sen += lain.jumlah_sen
+        self.jumlah_responden += lain.jumlah_responden
+        for kategori, jumlah in lain.distribusi_kategori.items():
+            self.distribusi_kategori[kategori] += jumlah
+        return self
+
+    def kurangi(self, lain):
+        self.jumlah_sen -= lain.jumlah_sen
+        self.jumlah_responden -= lain.jumlah_responden
+        for kategori, jumlah in lain.distribusi_kategori.items():
+            self.distribusi_kategori[kategori] -= jumlah
+        return self
+
+    def rata_rata(self):
+        if self.jumlah_responden == 0:
+            return pd.Series(np.nan, index=KOLOM_NILAI)
+        return pd.Series(self.jumlah_sen / (100 * self.jumlah_responden), index=KOLOM_NILAI)
+
+# Fungsi untuk menghitung rata-rata setiap kolom nilai
+def hitung_rata_rata(df_hasil):
+    return AgregatPenilaian().tambah(df_hasil).rata_rata()
+
+# Fungsi untuk membuat tabel rata-rata indikator teknis dan sosial
+def buat_tabel_rata_rata(avg_dict):
+    tabel = []
+    for daftar_indikator in (INDIKATOR_TEKNIS, INDIKATOR_SOSIAL):
+        nilai = [avg_dict[indikator + 'TOTAL'] for indikator in daftar_indikator]
+        tabel.append(pd.DataFrame({
+            "Indikator": [NAMA_INDIKATOR[indikator] for indikator in daftar_indikator],
+            "Nilai Rata-Rata": nilai,
+            "Kategori": kategorikan(nilai)[0].astype(object)
+        }))
+    return tabel[0], tabel[1]
+
+# Fungsi untuk menyusun ringkasan hasil penilaian dari akumulator
+def ringkasan_dari_agregat(agregat, distribusi_demografi):
+    avg_dict = agregat.rata_rata()
+    tabel_teknis, tabel_sosial = buat_tabel_rata_rata(avg_dict)
+    return {
+        'jumlah_responden': agregat.jumlah_responden,
+        'agregat': agregat,
+        'rata_rata': avg_dict,
+        'tabel_teknis': tabel_teknis,
+        'tabel_sosial': tabel_sosial,
+        'distribusi_kategori': dict(agregat.distribusi_kategori),
+        'demografi': distribusi_demografi,
+    }
+
+# Fungsi untuk menghitung seluruh hasil penilaian dari data mentah responden.
+# Dengan progres, responden dinilai per bagian (hitung_semua_responden_bertahap).
+# Matriks skor per pertanyaan ikut disimpan di hasil (skor_item) untuk analisis butir
+@diukur
+def rangkum_penilaian(df, progres=None):
+    if progres is None:
+        skor_item = hitung_skor_item(df)
+        df_hasil = hitung_semua_responden(df, skor_item)
+    else:
+        skor_item = np.empty((len(df), len(KODE_PERTANYAAN)), dtype=np.int8, order='F')
+        df_hasil = hitung_semua_responden_bertahap(df, progres, skor_item=skor_item)
+    if konfigurasi.MESIN_AGREGASI == 'duckdb' and len(df_hasil):
+        # Diimpor di sini karena agregasi_duckdb memakai modul ini
+        from agregasi_duckdb import RelasiPenilaian
+        with RelasiPenilaian(df, df_hasil) as relasi:
+            ringkasan = relasi.ringkasan()
+    else:
+        agregat = AgregatPenilaian().tambah(df_hasil)
+        ringkasan = ringkasan_dari_agregat(agregat, hitung_distribusi_demografi(df))
+    ringkasan['df_hasil'] = df_hasil
+    ringkasan['skor_item'] = skor_item
+    ringkasan['skema'] = df.attrs.get('skema')
+    return ringkasan
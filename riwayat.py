@@ -0,0 +1,238 @@
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from demografi import LABEL_KOSONG
+from instrumentasi import diukur
+from penilaian import KOLOM_NILAI, LABEL_KATEGORI, VERSI_ATURAN
+
+
+# Dimensi demografi yang disimpan per sel agregat (kolom kubus -> kolom tabel)
+DIMENSI_RIWAYAT = {
+    'INSTANSI': 'instansi',
+    'PROVINSI': 'provinsi',
+    'JENIS KELAMIN': 'jenis_kelamin',
+    'UMUR': 'umur',
+    'TINGKAT PENDIDIKAN': 'pendidikan',
+}
+
+# Dimensi yang bisa dipakai untuk memfilter atau memisahkan seri tren (punya indeks)
+DIMENSI_TREN = ['instansi', 'provinsi']
+
+# Kolom jumlah nilai per seratus dan jumlah responden per kategori NKI di tabel agregat
+KOLOM_SEN = {kolom: f"sen_{kolom.lower()}" for kolom in KOLOM_NILAI}
+KOLOM_KATEGORI = {kategori: f"kategori_{kategori.lower().replace(' ', '_')}" for kategori in LABEL_KATEGORI}
+
+# Tabel agregat dan dimensinya: agregat menyimpan semua dimensi demografi, agregat_wilayah
+# hanya dimensi tren sehingga query tren membaca jauh lebih sedikit baris
+TABEL_AGREGAT = {
+    'agregat': list(DIMENSI_RIWAYAT.values()),
+    'agregat_wilayah': DIMENSI_TREN,
+}
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS unggahan (
+    id INTEGER PRIMARY KEY,
+    gelombang TEXT NOT NULL,
+    tanggal TEXT NOT NULL,
+    kunci TEXT NOT NULL,
+    nama_file TEXT,
+    versi_aturan TEXT NOT NULL,
+    jumlah_responden INTEGER NOT NULL,
+    disimpan TEXT NOT NULL,
+    UNIQUE (gelombang, kunci)
+);
+""" + "".join(f"""
+CREATE TABLE IF NOT EXISTS {tabel} (
+    unggahan_id INTEGER NOT NULL REFERENCES unggahan (id),
+    gelombang TEXT NOT NULL,
+    {", ".join(f"{kolom} TEXT NOT NULL" for kolom in dimensi)},
+    jumlah INTEGER NOT NULL,
+    {", ".join(f"{kolom} INTEGER NOT NULL DEFAULT 0" for kolom in KOLOM_KATEGORI.values())}
+);
+CREATE INDEX IF NOT EXISTS idx_{tabel}_instansi ON {tabel} (instansi, gelombang);
+CREATE INDEX IF NOT EXISTS idx_{tabel}_provinsi ON {tabel} (provinsi, gelombang);
+CREATE INDEX IF NOT EXISTS idx_{tabel}_gelombang ON {tabel} (gelombang);
+CREATE INDEX IF NOT EXISTS idx_{tabel}_unggahan ON {tabel} (unggahan_id);
+""" for tabel, dimensi in TABEL_AGREGAT.items())
+
+
+class _Transaksi:
+    """Blok with untuk satu koneksi SQLite: commit/rollback lalu koneksi ditutup."""
+
+    def __init__(self, koneksi):
+        self.koneksi = koneksi
+
+    def __enter__(self):
+        return self.koneksi
+
+    def __exit__(self, jenis_error, error, traceback):
+        with closing(self.koneksi):
+            if jenis_error is None:
+                self.koneksi.commit()
+            else:
+                self.koneksi.rollback()
+        return False
+
+
+# Fungsi untuk memeriksa nama dimensi sebelum dipakai di SQL
+def _dimensi(nama):
+    if nama not in DIMENSI_TREN:
+        raise ValueError(f"Dimensi tren harus salah satu dari {DIMENSI_TREN}, bukan '{nama}'")
+    return nama
+
+# Fungsi untuk meringkas sel kubus ke dimensi DIMENSI_RIWAYAT. Dimensi kubus lain (misalnya
+# file sumber) dijumlahkan, dimensi yang tidak ada di data diisi LABEL_KOSONG
+def agregat_sel(kubus):
+    sel = {}
+    for kolom_kubus, kolom in DIMENSI_RIWAYAT.items():
+        if kolom_kubus in kubus.dimensi:
+            label = np.array(kubus.label[kolom_kubus], dtype=object)
+            sel[kolom] = label[kubus.kode_sel[:, kubus.dimensi.index(kolom_kubus)]]
+        else:
+            sel[kolom] = np.full(len(kubus), LABEL_KOSONG, dtype=object)
+    sel = pd.DataFrame(sel)
+    sel['jumlah'] = kubus.jumlah_responden
+    sel[list(KOLOM_KATEGORI.values())] = kubus.jumlah_kategori
+    sel[list(KOLOM_SEN.values())] = kubus.jumlah_sen
+    return sel.groupby(list(DIMENSI_RIWAYAT.values()), sort=False, as_index=False).sum()
+
+
+class RiwayatPenilaian:
+    """Riwayat hasil penilaian per gelombang survei dalam satu file SQLite.
+
+    Setiap unggahan yang disimpan diberi label gelombang dan tanggal. Nilainya disimpan
+    sebagai agregat per kombinasi demografi (jumlah responden, jumlah nilai per seratus
+    dan jumlah per kategori NKI) dan per instansi-provinsi, sehingga tren per gelombang
+    untuk instansi atau provinsi mana pun cukup menjumlahkan baris agregat tanpa membaca
+    ulang file lama.
+    Kolom nilai indikator ditambahkan otomatis jika buku aturan memuat indikator baru.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self._koneksi() as koneksi:
+            koneksi.execute("PRAGMA journal_mode=WAL")
+            koneksi.executescript(SKEMA)
+            # Nilai indikator yang belum ada pada gelombang lama bernilai NULL
+            for tabel in TABEL_AGREGAT:
+                ada = {baris[1] for baris in koneksi.execute(f"PRAGMA table_info({tabel})")}
+                for kolom in KOLOM_SEN.values():
+                    if kolom not in ada:
+                        koneksi.execute(f"ALTER TABLE {tabel} ADD COLUMN {kolom} INTEGER")
+
+    # Koneksi baru per pemanggilan (aman dipakai dari banyak thread). Blok with
+    # menutup koneksi dan melakukan commit, atau rollback jika terjadi error
+    def _koneksi(self):
+        koneksi = sqlite3.connect(self.path, timeout=30)
+        return _Transaksi(koneksi)
+
+    # Fungsi untuk menyimpan agregat satu unggahan (kubus demografi) ke satu gelombang.
+    # Menyimpan ulang isi file yang sama ke gelombang yang sama mengganti data sebelumnya.
+    # Hasilnya jumlah baris agregat yang disimpan
+    @diukur
+    def simpan(self, gelombang, kubus, kunci, nama_file=None, tanggal=None):
+        sel = agregat_sel(kubus)
+        daftar_sel = {
+            'agregat': sel,
+            'agregat_wilayah': sel.drop(columns=[kolom for kolom in DIMENSI_RIWAYAT.values()
+                                                 if kolom not in DIMENSI_TREN])
+                                  .groupby(DIMENSI_TREN, sort=False, as_index=False).sum(),
+        }
+        tanggal = (tanggal or date.today()).isoformat()
+        disimpan = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        with self._koneksi() as koneksi:
+            lama = koneksi.execute("SELECT id FROM unggahan WHERE gelombang = ? AND kunci = ?",
+                                   (gelombang, kunci)).fetchone()
+            if lama is not None:
+                self._hapus(koneksi, lama[0])
+            id_unggahan = koneksi.execute(
+                "INSERT INTO unggahan (gelombang, tanggal, kunci, nama_file, versi_aturan, jumlah_responden, "
+                "disimpan) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (gelombang, tanggal, kunci, nama_file, VERSI_ATURAN, int(sel['jumlah'].sum()), disimpan)).lastrowid
+            for tabel, isi in daftar_sel.items():
+                kolom = ['unggahan_id', 'gelombang'] + list(isi.columns)
+                koneksi.executemany(
+                    f"INSERT INTO {tabel} ({', '.join(kolom)}) VALUES ({', '.join('?' * len(kolom))})",
+                    ((id_unggahan, gelombang) + baris for baris in isi.itertuples(index=False, name=None)))
+        return len(sel)
+
+    # Fungsi untuk menghapus satu unggahan beserta agregatnya
+    def hapus(self, id_unggahan):
+        with self._koneksi() as koneksi:
+            self._hapus(koneksi, id_unggahan)
+
+    def _hapus(self, koneksi, id_unggahan):
+        for tabel in TABEL_AGREGAT:
+            koneksi.execute(f"DELETE FROM {tabel} WHERE unggahan_id = ?", (id_unggahan,))
+        koneksi.execute("DELETE FROM unggahan WHERE id = ?", (id_unggahan,))
+
+    # Fungsi untuk membaca daftar unggahan yang tersimpan (urut tanggal gelombang).
+    # kunci (opsional) membatasi ke unggahan isi file tertentu
+    def daftar_unggahan(self, kunci=None):
+        sql = ("SELECT id, gelombang, tanggal, nama_file, jumlah_responden, versi_aturan, disimpan "
+               "FROM unggahan")
+        parameter = ()
+        if kunci is not None:
+            sql += " WHERE kunci = ?"
+            parameter = (kunci,)
+        with self._koneksi() as koneksi:
+            return pd.read_sql_query(sql + " ORDER BY tanggal, gelombang, id", koneksi, params=parameter)
+
+    # Fungsi untuk mengambil semua nilai satu dimensi (untuk pilihan filter)
+    def label(self, dimensi):
+        with self._koneksi() as koneksi:
+            return [baris[0] for baris in koneksi.execute(
+                f"SELECT DISTINCT {_dimensi(dimensi)} FROM agregat_wilayah ORDER BY 1")]
+
+    # Fungsi untuk menghitung tren per gelombang dari tabel agregat_wilayah. filter_dimensi berisi
+    # {dimensi: daftar nilai} (instansi/provinsi), per (opsional) memisahkan seri per nilai
+    # dimensi. Nilai dari buku aturan berbeda tidak bisa dibandingkan, jadi hanya unggahan
+    # dengan versi_aturan tersebut yang dipakai (bawaan: buku aturan sekarang); None memakai
+    # semua versi dengan baris terpisah per versi_aturan. Hasilnya DataFrame per gelombang
+    # (dan per nilai dimensi): tanggal, jumlah responden, rata-rata setiap kolom KOLOM_NILAI
+    # dan jumlah per kategori NKI
+    @diukur
+    def tren(self, filter_dimensi=None, per=None, versi_aturan=VERSI_ATURAN):
+        kelompok = ['a.gelombang'] + ([f"a.{_dimensi(per)}"] if per else [])
+        syarat, parameter = [], []
+        if versi_aturan is None:
+            kelompok.append('u.versi_aturan')
+        else:
+            syarat.append("u.versi_aturan = ?")
+            parameter.append(versi_aturan)
+        for dimensi, pilihan in (filter_dimensi or {}).items():
+            if pilihan:
+                syarat.append(f"a.{_dimensi(dimensi)} IN ({', '.join('?' * len(pilihan))})")
+                parameter += list(pilihan)
+
+        # Jumlah nilai dibagi jumlah responden yang punya nilai itu (indikator baru NULL di
+        # gelombang lama), sama seperti rata-rata AgregatPenilaian
+        kolom = [f"{k} AS {k.split('.')[-1]}" for k in kelompok] + [
+            "MIN(u.tanggal) AS tanggal",
+            "SUM(a.jumlah) AS jumlah_responden",
+        ]
+        for nilai, kolom_sen in KOLOM_SEN.items():
+            kolom.append(f"SUM(a.{kolom_sen}) AS \"sen {nilai}\"")
+            kolom.append(f"SUM(CASE WHEN a.{kolom_sen} IS NULL THEN 0 ELSE a.jumlah END) AS \"n {nilai}\"")
+        kolom += [f"SUM(a.{kolom_kategori}) AS \"{kategori}\"" for kategori, kolom_kategori in KOLOM_KATEGORI.items()]
+
+        sql = (f"SELECT {', '.join(kolom)} FROM agregat_wilayah a JOIN unggahan u ON u.id = a.unggahan_id"
+               + (f" WHERE {' AND '.join(syarat)}" if syarat else "")
+               + f" GROUP BY {', '.join(kelompok)}")
+        with self._koneksi() as koneksi:
+            tabel = pd.read_sql_query(sql, koneksi, params=parameter)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rata_rata = {nilai: tabel[f"sen {nilai}"].to_numpy(dtype=np.float64)
+                         / (100 * tabel[f"n {nilai}"].to_numpy(dtype=np.float64)) for nilai in KOLOM_NILAI}
+        tabel = pd.concat([tabel[[k.split('.')[-1] for k in kelompok] + ['tanggal', 'jumlah_responden']], pd.DataFrame(rata_rata),
+                           tabel[LABEL_KATEGORI]], axis=1)
+        # Gelombang diurutkan menurut tanggal paling awal unggahannya
+        urutan = tabel.groupby('gelombang')['tanggal'].transform('min')
+        kolom_urut = ['_urutan', 'gelombang'] + ([per] if per else []) + (['versi_aturan'] if versi_aturan is None else [])
+        return (tabel.assign(_urutan=urutan).sort_values(kolom_urut)
+                .drop(columns='_urutan').reset_index(drop=True))
@@ -0,0 +1,306 @@
+import difflib
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# Batas kemiripan header untuk pencocokan fuzzy (0-1) dan panjang minimal teks yang
+# boleh dicocokkan secara fuzzy (kode pendek seperti SK1/SK2 terlalu mirip satu sama lain)
+BATAS_MIRIP = 0.9
+PANJANG_MIN_MIRIP = 12
+
+# Kolom jawaban dianggap tergeser jika kurang dari batas ini jawabannya dikenali
+BATAS_JAWABAN_DIKENALI = 0.5
+
+# Jumlah jawaban terisi minimal pada satu kolom agar tingkat dikenali dianggap cukup bukti
+# kolom tergeser. Di bawah batas ini (file kecil, kolom yang jarang diisi) jawaban yang
+# tidak dikenali hanya diperingatkan dan dinilai 0 seperti biasa
+MIN_JAWABAN_TERISI = 30
+
+# Banyaknya baris pertama file yang dipakai untuk mencocokkan kolom lewat isi jawaban
+BARIS_SAMPEL = 1000
+
+# Nomor atau kode pertanyaan di awal header ("12. ...", "SK1 - ...") yang ditambahkan
+# sebagian ekspor formulir
+POLA_NOMOR = re.compile(r'^(?:\d+|[A-Z]{2}\d+) (?=\S)')
+
+
+# Fungsi untuk menyamakan penulisan header: huruf besar, tanda baca jadi spasi
+def normalisasi_teks(teks):
+    return ' '.join(re.sub(r'[^0-9A-Z]+', ' ', str(teks).upper()).split())
+
+# Fungsi untuk membuang nomor/kode pertanyaan di awal header yang sudah dinormalisasi
+def _tanpa_nomor(teks):
+    return POLA_NOMOR.sub('', teks)
+
+# Fungsi untuk menyamakan penulisan jawaban saat memeriksa isi kolom: spasi berlebih
+# dibuang dan huruf besar/kecil disamakan. Hanya dipakai untuk mengenali kolom, penilaian
+# tetap memakai teks opsi yang sama persis
+def normalisasi_jawaban(teks):
+    return ' '.join(str(teks).split()).casefold()
+
+# Fungsi untuk menjumlahkan banyaknya jawaban per teks jawaban yang sudah dinormalisasi
+# dari pasangan (teks, jumlah)
+def _jumlah_jawaban(pasangan):
+    jumlah = {}
+    for nilai, n in pasangan:
+        kunci = normalisasi_jawaban(nilai)
+        jumlah[kunci] = jumlah.get(kunci, 0) + int(n)
+    return jumlah
+
+
+class HasilSkema:
+    """Hasil pencocokan header file dengan pertanyaan buku aturan.
+
+    indeks berisi posisi kolom untuk setiap kode pertanyaan, cara berisi cara
+    pencocokannya (tepat, normal, mirip, isi jawaban atau posisi untuk file tanpa baris).
+    """
+
+    def __init__(self):
+        self.indeks = {}
+        self.cara = {}
+        self.ambigu = {}
+        self.hilang = []
+        self.tidak_dikenali = {}
+        self.kolom_lain = []
+        self.peringatan = []
+
+    @property
+    def valid(self):
+        return not self.hilang and not self.ambigu and not self.tidak_dikenali
+
+    def pesan_error(self):
+        bagian = []
+        if self.hilang:
+            bagian.append(f"pertanyaan tanpa kolom: {', '.join(self.hilang)}")
+        for kode, kandidat in self.ambigu.items():
+            bagian.append(f"{kode} cocok dengan lebih dari satu kolom ({', '.join(map(str, kandidat))})")
+        for kode, (header, tingkat) in self.tidak_dikenali.items():
+            bagian.append(f"{kode} cocok dengan header '{header}' tetapi hanya {tingkat:.0%} jawabannya "
+                          f"sesuai opsi buku aturan")
+        return "Kolom jawaban tidak sesuai template; " + "; ".join(bagian)
+
+    def laporan(self):
+        return {
+            'cara': dict(self.cara),
+            'kolom_lain': list(self.kolom_lain),
+            'peringatan': list(self.peringatan),
+        }
+
+# Fungsi untuk mencocokkan header dengan kunci-kunci pertanyaan, hasilnya (cara, posisi kandidat)
+def _cocokkan(header, header_normal, kunci, terpakai):
+    kandidat = [p for p, h in enumerate(header) if p not in terpakai and str(h).strip() in kunci]
+    if kandidat:
+        return 'tepat', kandidat
+
+    kunci_normal = {normalisasi_teks(k) for k in kunci}
+    kandidat = [p for p, h in enumerate(header_normal)
+                if p not in terpakai and (h in kunci_normal or _tanpa_nomor(h) in kunci_normal)]
+    if kandidat:
+        return 'normal', kandidat
+
+    kunci_panjang = [k for k in kunci_normal if len(k) >= PANJANG_MIN_MIRIP]
+    if not kunci_panjang:
+        return None, []
+    skor = {}
+    for p, h in enumerate(header_normal):
+        if p in terpakai or len(h) < PANJANG_MIN_MIRIP:
+            continue
+        rasio = max(difflib.SequenceMatcher(None, _tanpa_nomor(h), k).ratio() for k in kunci_panjang)
+        if rasio >= BATAS_MIRIP:
+            skor[p] = rasio
+    if not skor:
+        return None, []
+    terbaik = max(skor.values())
+    return 'mirip', [p for p, r in skor.items() if terbaik - r < 0.02]
+
+# Fungsi untuk menghitung tingkat jawaban dikenali setiap pertanyaan pada setiap kolom
+# sampel. Hasilnya (matriks pertanyaan x posisi berisi bagian jawaban terisi yang sesuai
+# opsi atau NaN jika kolom kosong seluruhnya pada sampel, jumlah jawaban terisi per posisi)
+def tingkat_dikenali(sampel, daftar_posisi, daftar_indeks_opsi):
+    opsi_normal = [{normalisasi_jawaban(opsi) for opsi in indeks_opsi} for indeks_opsi in daftar_indeks_opsi]
+    tingkat = np.full((len(daftar_indeks_opsi), len(daftar_posisi)), np.nan)
+    terisi = np.zeros(len(daftar_posisi), dtype=np.int64)
+    for j, posisi in enumerate(daftar_posisi):
+        jumlah = _jumlah_jawaban(sampel.iloc[:, posisi].value_counts().items())
+        terisi[j] = sum(jumlah.values())
+        if not terisi[j]:
+            continue
+        for i, opsi in enumerate(opsi_normal):
+            tingkat[i, j] = sum(jumlah.get(teks, 0) for teks in opsi) / terisi[j]
+    return tingkat, terisi
+
+# Fungsi untuk menghitung skor setiap pasangan (pertanyaan, kolom) untuk _sejajarkan_isi:
+# tingkat dikenali jika mencapai batas, 0 jika kolom belum cukup bukti (jawaban terisi
+# kurang dari MIN_JAWABAN_TERISI, atau kolom kosong pada sampel yang kecil) dan -inf
+# jika kolom jelas bukan kolom pertanyaan itu
+def _skor_pasangan(tingkat, terisi, jumlah_baris):
+    kurang_bukti = (terisi < MIN_JAWABAN_TERISI) & ((terisi > 0) | (jumlah_baris < MIN_JAWABAN_TERISI))
+    with np.errstate(invalid='ignore'):
+        return np.where(tingkat >= BATAS_JAWABAN_DIKENALI, tingkat,
+                        np.where(kurang_bukti[None, :], 0.0, -np.inf))
+
+# Fungsi untuk mencocokkan pertanyaan (urut posisi template) dengan kolom yang tersisa
+# (urut posisi di file) lewat isi jawaban. Urutan pertanyaan di file dianggap sama
+# dengan template, sehingga kolom tambahan atau kolom yang hilang di antaranya tidak
+# menggeser pertanyaan lain; dipilih pasangan dengan jumlah tingkat dikenali terbesar
+# (pemrograman dinamis) dari _skor_pasangan. Kolom yang kosong pada sampel yang cukup
+# besar tidak dipakai, karena kolom pertanyaan yang hilang dari file juga terlihat kosong.
+# Hasilnya {indeks pertanyaan: posisi kolom} atau None jika tidak ada pasangan yang mungkin
+def _sejajarkan_isi(skor, posisi_template, daftar_posisi):
+    n, m = skor.shape
+    skor = skor.copy()
+    # Kolom di posisi template sedikit diutamakan jika tingkat dikenalinya sama
+    skor[np.asarray(posisi_template)[:, None] == np.asarray(daftar_posisi)[None, :]] += 1e-6
+
+    # terbaik[i, j] = jumlah skor terbesar untuk i pertanyaan pertama memakai j kolom pertama
+    terbaik = np.full((n + 1, m + 1), -np.inf)
+    terbaik[0, :] = 0
+    for i in range(1, n + 1):
+        for j in range(i, m + 1):
+            terbaik[i, j] = max(terbaik[i, j - 1], terbaik[i - 1, j - 1] + skor[i - 1, j - 1])
+    if not np.isfinite(terbaik[n, m]):
+        return None
+
+    pasangan, j = {}, m
+    for i in range(n, 0, -1):
+        while terbaik[i, j] == terbaik[i, j - 1]:
+            j -= 1
+        pasangan[i - 1] = daftar_posisi[j - 1]
+        j -= 1
+    return pasangan
+
+# Fungsi untuk menentukan kolom setiap pertanyaan berdasarkan header file dan contoh
+# isinya (sampel: DataFrame beberapa baris pertama dengan urutan kolom sama seperti header).
+# Urutan pencocokan: teks header sama persis dengan kode/judul/alias pertanyaan, sama
+# setelah dinormalisasi, mirip (fuzzy), lalu isi jawaban pada sampel. Kolom yang cocok
+# lewat header tetapi jawabannya tidak dikenali (dengan cukup jawaban terisi), atau
+# pertanyaan yang tidak menemukan kolom yang mungkin, membuat hasil tidak valid. Kolom
+# dengan sedikit jawaban terisi tidak pernah membuat hasil tidak valid. Posisi kolom template hanya
+# dipakai untuk file tanpa baris data; tanpa sampel, pertanyaan yang headernya tidak
+# dikenali dianggap tidak punya kolom
+def resolusi_skema(header, buku, kolom_tetap=(), sampel=None):
+    header = list(header)
+    header_normal = [normalisasi_teks(h) for h in header]
+    hasil = HasilSkema()
+    terpakai = set(kolom_tetap)
+    if sampel is not None:
+        sampel = sampel.head(BARIS_SAMPEL)
+    ada_isi = sampel is not None and len(sampel) > 0
+
+    # Tahap 1: pencocokan berdasarkan teks header
+    for i, kode in enumerate(buku.kode_pertanyaan):
+        cara, kandidat = _cocokkan(header, header_normal, buku.header_pertanyaan[i], terpakai)
+        if len(kandidat) == 1:
+            hasil.indeks[kode] = kandidat[0]
+            hasil.cara[kode] = cara
+            terpakai.add(kandidat[0])
+        elif len(kandidat) > 1:
+            hasil.ambigu[kode] = [header[p] for p in kandidat]
+
+    # Kolom yang cocok lewat header tetap harus berisi jawaban yang dikenali buku aturan
+    if ada_isi and hasil.indeks:
+        daftar_kode = list(hasil.indeks)
+        urutan = [buku.kode_pertanyaan.index(kode) for kode in daftar_kode]
+        tingkat, terisi = tingkat_dikenali(sampel, [hasil.indeks[kode] for kode in daftar_kode],
+                                           [buku.indeks_opsi[i] for i in urutan])
+        for k, kode in enumerate(daftar_kode):
+            # Jawaban yang sedikit diperingatkan oleh periksa_jawaban setelah data dibaca
+            if tingkat[k, k] < BATAS_JAWABAN_DIKENALI and terisi[k] >= MIN_JAWABAN_TERISI:
+                hasil.tidak_dikenali[kode] = (header[hasil.indeks[kode]], tingkat[k, k])
+
+    # Tahap 2: pertanyaan yang belum cocok dicari lewat isi jawaban pada kolom yang tersisa
+    sisa = sorted((i for i, kode in enumerate(buku.kode_pertanyaan)
+                   if kode not in hasil.indeks and kode not in hasil.ambigu), key=lambda i: buku.kolom[i])
+    if sisa and ada_isi:
+        daftar_posisi = [p for p in range(len(header)) if p not in terpakai]
+        tingkat, terisi = tingkat_dikenali(sampel, daftar_posisi, [buku.indeks_opsi[i] for i in sisa])
+        skor = _skor_pasangan(tingkat, terisi, len(sampel))
+        pasangan = _sejajarkan_isi(skor, [buku.kolom[i] for i in sisa], daftar_posisi)
+        if pasangan is None:
+            # Laporkan pertanyaan yang tidak punya kolom yang mungkin sama sekali (jika ada)
+            tanpa_kolom = [i for k, i in enumerate(sisa) if not np.isfinite(skor[k]).any()]
+            hasil.hilang += [buku.kode_pertanyaan[i] for i in sorted(tanpa_kolom or sisa)]
+        else:
+            kurang_bukti = []
+            for k, i in enumerate(sisa):
+                hasil.indeks[buku.kode_pertanyaan[i]] = pasangan[k]
+                hasil.cara[buku.kode_pertanyaan[i]] = 'isi'
+                terpakai.add(pasangan[k])
+                if skor[k, daftar_posisi.index(pasangan[k])] == 0:
+                    kurang_bukti.append(buku.kode_pertanyaan[i])
+            if kurang_bukti:
+                hasil.peringatan.append(f"Kolom {', '.join(kurang_bukti)} ditentukan dari urutan kolom karena "
+                                        f"jawabannya terlalu sedikit atau tidak dikenali; periksa hasilnya")
+    elif sisa and sampel is None:
+        hasil.hilang += [buku.kode_pertanyaan[i] for i in sorted(sisa)]
+    elif sisa:
+        # File tanpa baris data: tidak ada jawaban yang bisa salah dinilai
+        for i in sorted(sisa):
+            posisi = buku.kolom[i]
+            if posisi < len(header) and posisi not in terpakai:
+                hasil.indeks[buku.kode_pertanyaan[i]] = posisi
+                hasil.cara[buku.kode_pertanyaan[i]] = 'posisi'
+                terpakai.add(posisi)
+            else:
+                hasil.hilang.append(buku.kode_pertanyaan[i])
+
+    # Kolom yang berada di luar posisi template berarti kolom file tergeser; laporkan
+    # agar pengguna tahu file berbeda dari template
+    tergeser = [kode for kode, posisi in hasil.indeks.items()
+                if hasil.cara[kode] != 'posisi' and posisi != buku.kolom[buku.kode_pertanyaan.index(kode)]]
+    if tergeser:
+        hasil.peringatan.append(f"{len(tergeser)} kolom jawaban berada di posisi berbeda dari template "
+                                f"dan dicocokkan lewat header atau isi jawaban ({', '.join(tergeser)})")
+    mirip = [kode for kode, cara in hasil.cara.items() if cara == 'mirip']
+    if mirip:
+        hasil.peringatan.append(f"Header kolom {', '.join(mirip)} hanya mirip dengan judul pertanyaan")
+    lewat_isi = [kode for kode, cara in hasil.cara.items() if cara == 'isi']
+    if lewat_isi:
+        hasil.peringatan.append(f"Header kolom {', '.join(lewat_isi)} tidak dikenali, kolomnya ditentukan "
+                                f"dari isi jawaban")
+
+    hasil.kolom_lain = [header[p] for p in range(len(header)) if p not in terpakai]
+    return hasil
+
+# Fungsi untuk memeriksa jawaban setiap kolom hasil ingest: kolom yang sebagian besar
+# jawabannya tidak dikenali buku aturan kemungkinan besar salah kolom (tergeser). Hanya
+# kolom dengan minimal MIN_JAWABAN_TERISI jawaban terisi yang dianggap error, kolom
+# lainnya cukup diperingatkan. Hasilnya (daftar pesan error, daftar peringatan)
+def periksa_jawaban(df, buku):
+    tersangka, sedikit = [], []
+    for kode, indeks_opsi in zip(buku.kode_pertanyaan, buku.indeks_opsi):
+        if kode not in df.columns:
+            continue
+        kolom = df[kode]
+        if isinstance(kolom.dtype, pd.CategoricalDtype):
+            kode_kategori = kolom.cat.codes.to_numpy()
+            jumlah = np.bincount(kode_kategori[kode_kategori >= 0], minlength=len(kolom.cat.categories))
+            jumlah = _jumlah_jawaban(zip(kolom.cat.categories, jumlah))
+        else:
+            jumlah = _jumlah_jawaban(kolom.value_counts().items())
+        terisi = sum(jumlah.values())
+        dikenali = sum(jumlah.get(normalisasi_jawaban(opsi), 0) for opsi in indeks_opsi)
+        if terisi and dikenali / terisi < BATAS_JAWABAN_DIKENALI:
+            teks = f"{kode} ({dikenali / terisi:.0%} dari {terisi})"
+            (tersangka if terisi >= MIN_JAWABAN_TERISI else sedikit).append(teks)
+    masalah = [f"Sebagian besar jawaban pada kolom {', '.join(tersangka)} tidak sesuai opsi buku aturan, "
+               f"periksa apakah kolomnya tergeser"] if tersangka else []
+    peringatan = [f"Jawaban pada kolom {', '.join(sedikit)} sebagian besar tidak sesuai opsi buku aturan "
+                  f"dan dinilai 0"] if sedikit else []
+    return masalah, peringatan
+
+# Indeks kolom jawaban untuk data mentah (tanpa ingest). Hasilnya disimpan di attrs
+# DataFrame per header agar pemanggilan per baris tidak mengulang pencocokan
+def indeks_kolom_jawaban(df, buku):
+    header = tuple(df.columns)
+    tersimpan = df.attrs.get('indeks_jawaban')
+    if tersimpan is not None and tersimpan[0] == header and tersimpan[1] == buku.digest:
+        return tersimpan[2]
+    hasil = resolusi_skema(header, buku, kolom_tetap=(0,), sampel=df)
+    if not hasil.valid:
+        raise ValueError(hasil.pesan_error())
+    indeks = [hasil.indeks[kode] for kode in buku.kode_pertanyaan]
+    df.attrs['indeks_jawaban'] = (header, buku.digest, indeks)
+    return indeks
@@ -0,0 +1,41 @@
+import konfigurasi
+from demografi import gabung_distribusi, hitung_distribusi_demografi
+from ingest import baca_survei_bertahap
+from instrumentasi import diukur
+from kubus import bangun_kubus, gabung_kubus
+from penilaian import AgregatPenilaian, hitung_semua_responden, ringkasan_dari_agregat
+
+
+# Fungsi untuk menilai file survei per bagian (chunk) tanpa memuat seluruh data.
+# Hasilnya sama dengan rangkum_penilaian, kecuali tidak ada df_hasil per responden. Kubus
+# demografi dibangun per bagian lalu digabung (gabung_kubus) agar filter demografi dan
+# riwayat tetap bisa dipakai.
+# progres (opsional) dipanggil dengan jumlah baris yang sudah dinilai setiap satu bagian selesai
+@diukur
+def rangkum_penilaian_bertahap(sumber, nama_file=None, ukuran_chunk=None, progres=None):
+    ukuran_chunk = ukuran_chunk or konfigurasi.UKURAN_CHUNK
+    agregat = AgregatPenilaian()
+    distribusi_demografi = {}
+    laporan_skema = None
+    kubus = None
+    jumlah_baris = 0
+    for bagian in baca_survei_bertahap(sumber, nama_file, ukuran_chunk):
+        # Laporan skema sama untuk semua bagian, kecuali peringatan pemeriksaan jawaban
+        if laporan_skema is None:
+            laporan_skema = bagian.attrs['skema']
+        else:
+            laporan_skema['peringatan'] += [p for p in bagian.attrs['skema']['peringatan']
+                                            if p not in laporan_skema['peringatan']]
+        df_hasil = hitung_semua_responden(bagian)
+        agregat.tambah(df_hasil)
+        kubus_bagian = bangun_kubus(bagian, df_hasil)
+        kubus = kubus_bagian if kubus is None else gabung_kubus([kubus, kubus_bagian])
+        distribusi_demografi = gabung_distribusi(distribusi_demografi,
+                                                 hitung_distribusi_demografi(bagian))
+        jumlah_baris += len(bagian)
+        if progres is not None:
+            progres(jumlah_baris)
+    ringkasan = ringkasan_dari_agregat(agregat, distribusi_demografi)
+    ringkasan['skema'] = laporan_skema
+    ringkasan['kubus'] = kubus
+    return ringkasan
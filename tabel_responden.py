@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from instrumentasi import diukur
+from penilaian import kategorikan, nilai_persis
+
+
+KOLOM_NO = "No."
+KOLOM_NAMA = "Nama Responden"
+KOLOM_INSTANSI = "Asal Instansi"
+KOLOM_NKI = "Nilai Kesadaran Keamanan Siber Individu (NKI)"
+KOLOM_KATEGORI = "Kategori NKI"
+
+# Kolom yang bisa dipakai untuk mengurutkan tabel
+KOLOM_URUT = [KOLOM_NO, KOLOM_NAMA, KOLOM_INSTANSI, KOLOM_NKI]
+
+# Fungsi untuk mengambil kolom data responden sebagai array Arrow (kategori menjadi dictionary)
+def _kolom_arrow(data, nama):
+    if nama not in data.columns:
+        return pa.nulls(len(data), pa.string())
+    kolom = data[nama]
+    if isinstance(kolom.dtype, pd.CategoricalDtype):
+        return pa.DictionaryArray.from_arrays(
+            pa.array(kolom.cat.codes.to_numpy(), mask=kolom.isna().to_numpy()),
+            pa.array(kolom.cat.categories.astype(str)))
+    return pa.array(kolom.astype('string'), type=pa.string())
+
+# Fungsi untuk menyusun tabel responden sebagai tabel Arrow, seluruhnya per kolom
+@diukur
+def bangun_tabel_responden(data, df_hasil):
+    nki = nilai_persis(df_hasil['NKI'])
+    kategori = kategorikan(nki)[0]
+    return pa.table({
+        KOLOM_NO: pa.array(np.arange(1, len(nki) + 1, dtype=np.int64)),
+        KOLOM_NAMA: _kolom_arrow(data, 'NAMA'),
+        KOLOM_INSTANSI: _kolom_arrow(data, 'INSTANSI'),
+        KOLOM_NKI: pa.array(nki),
+        KOLOM_KATEGORI: pa.DictionaryArray.from_arrays(
+            pa.array(kategori.codes.astype(np.int8)), pa.array(list(kategori.categories))),
+    })
+
+# Fungsi untuk mengambil satu halaman tabel setelah difilter dan diurutkan di server.
+# Hasilnya (DataFrame halaman, jumlah baris setelah filter)
+def halaman_tabel(tabel, halaman=1, ukuran_halaman=50, urut=KOLOM_NO, menurun=False,
+                  cari=None, daftar_kategori=None):
+    if cari:
+        cocok = pc.or_kleene(
+            pc.match_substring(tabel[KOLOM_NAMA].cast(pa.string()), cari, ignore_case=True),
+            pc.match_substring(tabel[KOLOM_INSTANSI].cast(pa.string()), cari, ignore_case=True))
+        tabel = tabel.filter(pc.fill_null(cocok, False))
+    if daftar_kategori:
+        tabel = tabel.filter(pc.is_in(tabel[KOLOM_KATEGORI].cast(pa.string()),
+                                      value_set=pa.array(list(daftar_kategori), pa.string())))
+    if urut != KOLOM_NO or menurun:
+        urutan = 'descending' if menurun else 'ascending'
+        kunci_urut = [(urut, urutan)] + ([(KOLOM_NO, 'ascending')] if urut != KOLOM_NO else [])
+        # Kolom dictionary diurutkan berdasarkan teksnya
+        if pa.types.is_dictionary(tabel.schema.field(urut).type):
+            nilai_urut = tabel[urut].cast(pa.string())
+            indeks = pc.sort_indices(pa.table({urut: nilai_urut, KOLOM_NO: tabel[KOLOM_NO]}),
+                                     sort_keys=kunci_urut)
+        else:
+            indeks = pc.sort_indices(tabel, sort_keys=kunci_urut)
+    else:
+        indeks = None
+
+    jumlah = tabel.num_rows
+    awal = max(0, (halaman - 1) * ukuran_halaman)
+    if indeks is not None:
+        bagian = tabel.take(indeks.slice(awal, ukuran_halaman))
+    else:
+        bagian = tabel.slice(awal, ukuran_halaman)
+    return bagian.to_pandas(), jumlah
@@ -0,0 +1,248 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import konfigurasi
+from ingest import baca_survei
+from inkremental import rangkum_dengan_status
+from instrumentasi import ukur_tahap
+from kubus import bangun_kubus
+from penilaian import rangkum_penilaian
+from streaming import rangkum_penilaian_bertahap
+from tabel_responden import bangun_tabel_responden
+
+
+# Status tugas
+MENUNGGU = 'menunggu'
+BERJALAN = 'berjalan'
+SELESAI = 'selesai'
+GAGAL = 'gagal'
+DIBATALKAN = 'dibatalkan'
+STATUS_AKTIF = (MENUNGGU, BERJALAN)
+
+# Status tugas yang sudah selesai disimpan selama batas ini (detik) lalu dihapus
+UMUR_MAKS_STATUS = 24 * 3600
+
+
+# Fungsi untuk memeriksa apakah proses dengan pid tertentu masih berjalan
+def _proses_hidup(pid):
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class TugasDibatalkan(Exception):
+    """Dilempar di dalam tugas saat pembatalan diminta, di antara tahap atau bagian data."""
+
+
+class AntreanTugas:
+    """Antrean tugas baca dan penilaian file unggahan yang dijalankan di thread worker.
+
+    Status setiap tugas (tahap, jumlah baris selesai, pesan error) disimpan sebagai file
+    JSON di direktori tugas, sehingga bisa dipantau dari rerun dan sesi mana pun. Hasil
+    tugas yang selesai disimpan ke CacheHasil dengan kunci yang sama seperti penilaian
+    langsung di dashboard. Status penilaian inkremental disimpan di penyimpanan_status
+    (bawaan: cache yang sama). Setiap tugas mencatat pid proses pemiliknya; tugas yang
+    belum selesai saat proses pemiliknya berhenti dijalankan ulang saat antrean dibuat
+    kembali, tugas milik proses yang masih hidup dibiarkan.
+    """
+
+    def __init__(self, cache, direktori, jumlah_worker=1, penyimpanan_status=None):
+        self.cache = cache
+        self.penyimpanan_status = cache if penyimpanan_status is None else penyimpanan_status
+        self.direktori = direktori
+        self._pool = ThreadPoolExecutor(max_workers=max(1, jumlah_worker), thread_name_prefix="tugas")
+        self._lock = threading.RLock()
+        os.makedirs(direktori, exist_ok=True)
+        self._pulihkan()
+
+    # Fungsi untuk mengirim file ke antrean. Tugas aktif untuk isi file yang sama (kunci
+    # cache sama) dipakai ulang. Hasilnya status tugas
+    def kirim(self, nama_file, isi_file, kunci, nama=None, streaming=False):
+        with self._lock:
+            tugas = self.cari(kunci)
+            if tugas is not None and tugas['status'] in STATUS_AKTIF:
+                return tugas
+            id_tugas = uuid.uuid4().hex[:12]
+            with open(self._path(id_tugas, ".masukan"), "wb") as f:
+                f.write(isi_file)
+            sekarang = time.time()
+            tugas = {
+                'id': id_tugas,
+                'nama_file': nama_file,
+                'nama': nama or nama_file,
+                'kunci': kunci,
+                'streaming': streaming,
+                'status': MENUNGGU,
+                'tahap': None,
+                'baris': 0,
+                'total_baris': None,
+                'pesan': None,
+                'dibuat': sekarang,
+                'diperbarui': sekarang,
+                'pemilik': os.getpid(),
+            }
+            self._tulis(tugas)
+        self._pool.submit(self._jalankan, id_tugas)
+        return tugas
+
+    # Fungsi untuk membaca status satu tugas (None jika tidak ada)
+    def status(self, id_tugas):
+        try:
+            with open(self._path(id_tugas, ".json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    # Fungsi untuk mencari tugas terbaru untuk isi file dengan kunci cache tertentu
+    def cari(self, kunci):
+        daftar = [tugas for tugas in self.daftar() if tugas['kunci'] == kunci]
+        return max(daftar, key=lambda tugas: tugas['dibuat']) if daftar else None
+
+    # Fungsi untuk membaca status semua tugas yang tersimpan
+    def daftar(self):
+        daftar = []
+        for nama in os.listdir(self.direktori):
+            if nama.endswith(".json"):
+                tugas = self.status(nama[:-len(".json")])
+                if tugas is not None:
+                    daftar.append(tugas)
+        return daftar
+
+    # Fungsi untuk meminta pembatalan tugas. Tugas yang masih menunggu langsung dibatalkan,
+    # tugas yang berjalan berhenti di pemeriksaan berikutnya (antar tahap atau bagian data)
+    def batalkan(self, id_tugas):
+        with self._lock:
+            tugas = self.status(id_tugas)
+            if tugas is None or tugas['status'] not in STATUS_AKTIF:
+                return
+            open(self._path(id_tugas, ".batal"), "w").close()
+            if tugas['status'] == MENUNGGU:
+                self._selesaikan(id_tugas, DIBATALKAN)
+
+    def _path(self, id_tugas, akhiran):
+        return os.path.join(self.direktori, id_tugas + akhiran)
+
+    def _tulis(self, tugas):
+        # Tulis ke file sementara lalu ganti nama agar pembaca tidak melihat file setengah jadi
+        fd, path_sementara = tempfile.mkstemp(dir=self.direktori, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(tugas, f, ensure_ascii=False)
+        os.replace(path_sementara, self._path(tugas['id'], ".json"))
+
+    def _perbarui(self, id_tugas, **isian):
+        with self._lock:
+            tugas = self.status(id_tugas)
+            tugas.update(isian, diperbarui=time.time())
+            self._tulis(tugas)
+            return tugas
+
+    # Fungsi untuk menutup tugas dengan status akhir dan menghapus file masukannya
+    def _selesaikan(self, id_tugas, status, pesan=None):
+        self._perbarui(id_tugas, status=status, pesan=pesan)
+        for akhiran in (".masukan", ".batal"):
+            try:
+                os.remove(self._path(id_tugas, akhiran))
+            except FileNotFoundError:
+                pass
+
+    def _periksa_batal(self, id_tugas):
+        if os.path.exists(self._path(id_tugas, ".batal")):
+            raise TugasDibatalkan()
+
+    # Fungsi yang dijalankan di thread worker: baca, nilai, siapkan tampilan, simpan ke cache
+    def _jalankan(self, id_tugas):
+        with self._lock:
+            tugas = self.status(id_tugas)
+            # Tugas yang sudah diambil alih proses lain tidak dijalankan di sini
+            if tugas is None or tugas['status'] != MENUNGGU or tugas.get('pemilik') != os.getpid():
+                return
+            tugas = self._perbarui(id_tugas, status=BERJALAN, tahap="membaca file")
+
+        def progres(baris):
+            self._periksa_batal(id_tugas)
+            self._perbarui(id_tugas, baris=baris)
+
+        try:
+            self._periksa_batal(id_tugas)
+            with ukur_tahap("tugas", keterangan=tugas['nama_file']) as tahap:
+                self._proses(tugas, progres)
+                tahap.baris = self.status(id_tugas)['baris']
+        except TugasDibatalkan:
+            self._selesaikan(id_tugas, DIBATALKAN)
+        except Exception as e:
+            self._selesaikan(id_tugas, GAGAL, f"{type(e).__name__}: {e}")
+        else:
+            self._selesaikan(id_tugas, SELESAI)
+
+    def _proses(self, tugas, progres):
+        id_tugas, kunci = tugas['id'], tugas['kunci']
+        path = self._path(id_tugas, ".masukan")
+
+        # File besar dibaca dan dinilai per bagian, tanpa data per responden
+        if tugas['streaming']:
+            self._perbarui(id_tugas, tahap="membaca dan menilai per bagian")
+            hasil = rangkum_penilaian_bertahap(path, tugas['nama_file'], progres=progres)
+            self._periksa_batal(id_tugas)
+            self.cache.simpan(f"{kunci}/hasil", hasil)
+            self._pastikan_tersimpan(kunci, [f"{kunci}/hasil"])
+            return
+
+        df = baca_survei(path, tugas['nama_file'])
+        self._periksa_batal(id_tugas)
+        self._perbarui(id_tugas, tahap="menilai responden", total_baris=len(df))
+        if konfigurasi.MODE_INKREMENTAL:
+            hasil = rangkum_dengan_status(self.penyimpanan_status, tugas['nama'], df, progres)
+        else:
+            hasil = rangkum_penilaian(df, progres)
+        self._periksa_batal(id_tugas)
+
+        # Tabel responden dan kubus filter disiapkan di sini agar tampilan pertama cepat.
+        # Keduanya disimpan lebih dulu: jika cache penuh, keduanya yang dikeluarkan (bisa
+        # dibangun ulang oleh tampilan), bukan data dan hasil
+        self._perbarui(id_tugas, tahap="menyiapkan tabel dan filter", baris=len(df))
+        self.cache.simpan(f"{kunci}/tabel", bangun_tabel_responden(df, hasil['df_hasil']))
+        self.cache.simpan(f"{kunci}/kubus", bangun_kubus(df, hasil['df_hasil']))
+        self._periksa_batal(id_tugas)
+        self.cache.simpan(f"{kunci}/data", df)
+        self.cache.simpan(f"{kunci}/hasil", hasil)
+        self._pastikan_tersimpan(kunci, [f"{kunci}/data", f"{kunci}/hasil"])
+
+    # Fungsi untuk memastikan isi yang dibutuhkan dashboard benar-benar ada di cache setelah
+    # tugas selesai. Jika batas memori cache lebih kecil dari data dan hasil satu file,
+    # tugas dianggap gagal; tanpa pemeriksaan ini dashboard akan mengirim ulang file terus
+    def _pastikan_tersimpan(self, kunci, daftar_kunci):
+        hilang = [k.rsplit('/', 1)[1] for k in daftar_kunci if k not in self.cache]
+        if hilang:
+            raise RuntimeError(f"{' dan '.join(hilang)} tidak muat di cache "
+                               f"(batas {self.cache.batas_memori // 2**20} MB); naikkan "
+                               f"DASHBOARD_CACHE_MB atau atur DASHBOARD_CACHE_DIR")
+
+    # Fungsi untuk menjalankan ulang tugas yang terputus (proses pemiliknya berhenti) dan
+    # menghapus status tugas lama yang sudah selesai. Tugas milik proses yang masih hidup
+    # (server lain, atau antrean lama di proses ini) tetap dikerjakan pemiliknya
+    def _pulihkan(self):
+        sekarang = time.time()
+        for tugas in self.daftar():
+            id_tugas = tugas['id']
+            if tugas['status'] in STATUS_AKTIF:
+                if _proses_hidup(tugas.get('pemilik')):
+                    continue
+                if os.path.exists(self._path(id_tugas, ".batal")):
+                    self._selesaikan(id_tugas, DIBATALKAN)
+                elif os.path.exists(self._path(id_tugas, ".masukan")):
+                    self._perbarui(id_tugas, status=MENUNGGU, tahap=None, baris=0, pemilik=os.getpid())
+                    self._pool.submit(self._jalankan, id_tugas)
+                else:
+                    self._selesaikan(id_tugas, GAGAL, "File unggahan tidak ditemukan")
+            elif sekarang - tugas['diperbarui'] > UMUR_MAKS_STATUS:
+                os.remove(self._path(id_tugas, ".json"))